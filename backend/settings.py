@@ -25,6 +25,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack.
+    'main_app.middleware.PerformanceMiddleware',
+    # Outside everything that produces or inspects the body.
+    'main_app.middleware.CompressionMiddleware',
+    'main_app.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -37,8 +42,20 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        # Builds a TokenUser from the signed claims instead of loading the user
+        # row; views that need the full row use main_app.authentication.get_full_user.
+        # Token refresh and the staff-only views set JWTAuthentication, which loads it.
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
+    ),
+    # Same bytes as DRF's JSONRenderer, encoded with orjson when it is installed.
+    'DEFAULT_RENDERER_CLASSES': (
+        'main_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    # Reverse proxies in front of the app. Client addresses (throttling) come from
+    # REMOTE_ADDR when 0, else from X-Forwarded-For as appended by these proxies;
+    # unset, DRF would trust whatever X-Forwarded-For the client sends.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '0')),
 }
 
 SIMPLE_JWT = {
@@ -58,6 +75,37 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Seconds a User row fetched by get_full_user() stays cached.
+FULL_USER_CACHE_TIMEOUT = 30
+
+# Request instrumentation (main_app.middleware.PerformanceMiddleware).
+PERF_SERVER_TIMING = os.environ.get("PERF_SERVER_TIMING", "1") == "1"
+PERF_SLOW_TRACES = int(os.environ.get("PERF_SLOW_TRACES", "20"))
+# When set, /metrics/ requires "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN") or None
+
+# main_app.middleware.CompressionMiddleware: codings in preference order ("br" and
+# "zstd" need the brotli / zstandard packages), bodies below COMPRESSION_MIN_BYTES
+# are sent as is, and per-coding levels (gzip 1-9, br 0-11, zstd 1-22).
+COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Token-bucket rates for main_app.throttling, "N/period": bursts of N, refilled
+# N per period. Applied per route in main_app/urls.py.
+THROTTLE_RATES = {
+    "login-ip": "20/min",
+    "login-username": "5/min",
+    "signup-ip": "20/hour",
+}
+# Cache alias holding the buckets so all workers share them. When unset each
+# process keeps its own buckets.
+THROTTLE_CACHE_ALIAS = os.environ.get("THROTTLE_CACHE_ALIAS") or None
+
+# Cache alias shared by all workers for the agency/service catalog. When unset
+# each process keeps its own copy, invalidated only by its own signals.
+CATALOG_CACHE_ALIAS = os.environ.get("CATALOG_CACHE_ALIAS") or None
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -88,6 +136,53 @@ DATABASES = {
     }
 }
 
+# Read replicas, one alias per host in DATABASE_REPLICA_HOSTS. Views with
+# use_read_replica = True read from them on GET; a client that writes is pinned
+# to the primary for REPLICA_PIN_SECONDS (main_app.routers). To try it with two
+# SQLite files, point "default" and a "replica" alias at separate files and copy
+# the first over the second to "replicate".
+for index, host in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",")), 1):
+    DATABASES[f"replica{index}"] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["main_app.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = 5
+# Cache alias holding the pins; use a shared cache when running several workers.
+REPLICA_PIN_CACHE_ALIAS = os.environ.get("REPLICA_PIN_CACHE_ALIAS", "default")
+
+# Password hashing. The profile's first hasher makes new hashes; the others
+# still verify old ones, which are rehashed under the profile in the
+# background on the user's next login (main_app.backends.ModelBackend).
+# "argon2" needs the argon2-cffi package. Compare them with
+# `manage.py benchmark_hashers`.
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": [
+        "main_app.hashers.PBKDF2PasswordHasher",
+        "main_app.hashers.ScryptPasswordHasher",
+        "main_app.hashers.Argon2PasswordHasher",
+    ],
+    "scrypt": [
+        "main_app.hashers.ScryptPasswordHasher",
+        "main_app.hashers.PBKDF2PasswordHasher",
+        "main_app.hashers.Argon2PasswordHasher",
+    ],
+    "argon2": [
+        "main_app.hashers.Argon2PasswordHasher",
+        "main_app.hashers.ScryptPasswordHasher",
+        "main_app.hashers.PBKDF2PasswordHasher",
+    ],
+}
+PASSWORD_HASHER_PROFILE = os.environ.get("PASSWORD_HASHER_PROFILE", "scrypt")
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+PASSWORD_HASHER_PARAMS = {
+    "pbkdf2": {"iterations": 1_000_000},
+    # 32 MiB and about a quarter of the CPU time of the PBKDF2 setting above.
+    "scrypt": {"work_factor": 2**15, "block_size": 8, "parallelism": 1},
+    "argon2": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+}
+AUTHENTICATION_BACKENDS = ["main_app.backends.ModelBackend"]
+# Threads upgrading outdated password hashes after login.
+PASSWORD_REHASH_WORKERS = 1
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import GovernmentAgency, Service, CreditCard, ServiceRequest, Appointment, TrafficFine
+from .models import GovernmentAgency, Service, CreditCard, ServiceRequest, ServiceStatusRule, Appointment, AppointmentSlot, TrafficFine
 
 @admin.register(GovernmentAgency)
 class GovernmentAgencyAdmin(admin.ModelAdmin):
@@ -13,8 +13,19 @@ class ServiceAdmin(admin.ModelAdmin):
     list_filter = ("agency",)
     search_fields = ("name", "agency__name")
     ordering = ("id",)
+    list_select_related = ("agency",)
 
-admin.site.register(CreditCard)
+@admin.register(ServiceStatusRule)
+class ServiceStatusRuleAdmin(admin.ModelAdmin):
+    list_display = ("id", "service", "agency", "name_contains", "initial_status", "priority")
+    list_editable = ("initial_status", "priority")
+    list_filter = ("initial_status",)
+    ordering = ("-priority", "id")
+    list_select_related = ("service", "agency")
+
+@admin.register(CreditCard)
+class CreditCardAdmin(admin.ModelAdmin):
+    list_select_related = ("user",)
 
 @admin.register(ServiceRequest)
 class ServiceRequestAdmin(admin.ModelAdmin):
@@ -22,18 +33,29 @@ class ServiceRequestAdmin(admin.ModelAdmin):
     list_filter = ("status",)
     search_fields = ("service__name", "user__username")
     ordering = ("-created_at",)
+    list_select_related = ("service", "user")
+
+@admin.register(AppointmentSlot)
+class AppointmentSlotAdmin(admin.ModelAdmin):
+    list_display = ("id", "service", "location", "starts_at", "ends_at", "booked", "capacity")
+    list_filter = ("location",)
+    search_fields = ("service__name", "location")
+    ordering = ("starts_at",)
+    list_select_related = ("service",)
+    date_hierarchy = "starts_at"
 
 @admin.register(Appointment)
 class AppointmentAdmin(admin.ModelAdmin):
-    list_display = ("id", "service", "user", "date", "time", "location", "created_at")
+    list_display = ("id", "service", "user", "date", "time", "location", "slot", "created_at")
     list_filter = ("date",)
     search_fields = ("service__name", "user__username")
     ordering = ("-created_at",)
+    list_select_related = ("service", "user", "slot__service")
 
 
 
 from django.contrib import admin
-from .models import TrafficFine
+from .models import IdempotencyKey, TrafficFine
 
 @admin.register(TrafficFine)
 class TrafficFineAdmin(admin.ModelAdmin):
@@ -41,4 +63,13 @@ class TrafficFineAdmin(admin.ModelAdmin):
     list_filter = ("status", "issued_at", "violation_type")
     search_fields = ("fine_number", "user__username", "user__email", "violation_type")
     readonly_fields = ("created_at", "updated_at")
+    list_select_related = ("user",)
     date_hierarchy = "issued_at"
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("key", "user", "status_code", "created_at")
+    search_fields = ("key", "user__username")
+    readonly_fields = ("created_at",)
+    list_select_related = ("user",)
@@ -0,0 +1,140 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from .catalog_cache import acatalog_response, acurrent_version
+from .conditional import ListValidators
+from .fast_serializers import project
+from .fieldsets import cache_suffix, parse_fieldsets
+from .models import GovernmentAgency, Service
+from .pagination import KeysetPagination
+from .query_plan import plan_queryset
+from .renderers import FastJSONRenderer
+from .serializers import (
+    GovernmentAgencySerializer,
+    ServiceRequestSerializer,
+    ServiceSerializer,
+    TrafficFineSerializer,
+)
+from .views import MyFinesQueryMixin, ServiceRequestQueryMixin
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        FastJSONRenderer().render(data), status=status_code, content_type="application/json", headers=headers
+    )
+
+
+class AsyncAPIView(View):
+    """Minimal async counterpart of ``APIView`` for read-only JSON endpoints.
+
+    Authenticates from the JWT claims like the sync views and requires an
+    authenticated user. Subclasses implement ``async def get``.
+    """
+
+    authentication_class = JWTStatelessUserAuthentication
+
+    async def authenticate(self, request):
+        result = await sync_to_async(self.authentication_class().authenticate)(request)
+        return result[0] if result else None
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+        except APIException as exc:
+            return json_response({"detail": exc.detail}, status_code=exc.status_code,
+                                 headers={"WWW-Authenticate": 'Bearer realm="api"'})
+        if user is None:
+            return json_response(
+                {"detail": "Authentication credentials were not provided."},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": 'Bearer realm="api"'},
+            )
+        request.user = user
+        self.request = Request(request)
+        self.request.user = user
+        try:
+            return await super().dispatch(self.request, *args, **kwargs)
+        except APIException as exc:
+            return json_response({"detail": exc.detail}, status_code=exc.status_code)
+
+
+class AsyncAgencyList(AsyncAPIView):
+    async def get(self, request):
+        async def render():
+            qs = project(GovernmentAgency.objects.all(), GovernmentAgencySerializer)
+            agencies = [agency async for agency in qs]
+            return FastJSONRenderer().render(GovernmentAgencySerializer(agencies, many=True).data)
+
+        return await acatalog_response(request, "agencies", render)
+
+
+class AsyncServiceList(AsyncAPIView):
+    async def get(self, request):
+        fields = parse_fieldsets(request, ServiceSerializer)
+
+        async def render():
+            qs = plan_queryset(Service.objects.all().order_by("id"), ServiceSerializer, fields)
+            qs = project(qs, ServiceSerializer, fields=fields)
+            services = [service async for service in qs]
+            return FastJSONRenderer().render(ServiceSerializer(services, many=True, fields=fields).data)
+
+        name = f"services:{cache_suffix(fields)}" if fields else "services"
+        return await acatalog_response(request, name, render)
+
+
+class AsyncServiceDetail(AsyncAPIView):
+    async def get(self, request, pk):
+        async def render():
+            qs = plan_queryset(Service.objects.all(), ServiceSerializer)
+            service = await qs.filter(pk=pk).afirst()
+            if service is None:
+                # Raised before anything is cached, so misses are not stored.
+                raise NotFound("No Service matches the given query.")
+            return FastJSONRenderer().render(ServiceSerializer(service).data)
+
+        return await acatalog_response(request, f"service:{pk}", render)
+
+
+class AsyncPaginatedListView(AsyncAPIView):
+    serializer_class = None
+
+    def wrap(self, data, paginator):
+        return data
+
+    async def validator_parts(self):
+        """Extra inputs to the list's ETag besides its rows."""
+        return ("application/json",)
+
+    async def get(self, request):
+        fields = parse_fieldsets(request, self.serializer_class)
+        validators = await ListValidators.afor_queryset(
+            request, self.get_queryset(), await self.validator_parts(), self.send_last_modified
+        )
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        paginator = KeysetPagination(ordering=self.pagination_ordering)
+        queryset = project(self.get_queryset(fields), self.serializer_class, self.pagination_ordering, fields)
+        page_qs = paginator.get_page_queryset(queryset, request)
+        page = paginator.finish_page([obj async for obj in page_qs])
+        data = self.serializer_class(page, many=True, fields=fields).data
+        return validators.apply(json_response(self.wrap(data, paginator), headers=paginator.get_headers()))
+
+
+class AsyncServiceRequestList(ServiceRequestQueryMixin, AsyncPaginatedListView):
+    serializer_class = ServiceRequestSerializer
+
+    async def validator_parts(self):
+        return (await acurrent_version(), "application/json")
+
+
+class AsyncMyFinesView(MyFinesQueryMixin, AsyncPaginatedListView):
+    serializer_class = TrafficFineSerializer
+
+    def wrap(self, data, paginator):
+        return {"fines": data, "next": paginator.get_next_link()}
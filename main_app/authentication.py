@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+# Claims copied into every token so the stateless authentication class can build
+# a ``TokenUser`` without loading the user row.
+USER_CLAIMS = ("username", "is_staff")
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the ``USER_CLAIMS``."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def issue_tokens(user):
+    refresh = ClaimsRefreshToken.for_user(user)
+    return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+def _cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def get_full_user(user):
+    """Return the ``User`` row behind ``user`` (a ``TokenUser`` or a ``User``).
+
+    Rows are cached for ``FULL_USER_CACHE_TIMEOUT`` seconds and dropped whenever
+    the user is saved or deleted. Anything that checks or changes credentials
+    should read the row directly instead. Raises ``AuthenticationFailed`` when
+    the user has been deleted or deactivated since the token was issued.
+    """
+    if isinstance(user, User):
+        full_user = user
+    else:
+        key = _cache_key(user.pk)
+        full_user = cache.get(key)
+        if full_user is None:
+            try:
+                full_user = User.objects.get(pk=user.pk)
+            except User.DoesNotExist:
+                raise AuthenticationFailed("User not found.", code="user_not_found")
+            cache.set(key, full_user, getattr(settings, "FULL_USER_CACHE_TIMEOUT", 30))
+    if not full_user.is_active:
+        raise AuthenticationFailed("User is inactive.", code="user_inactive")
+    return full_user
+
+
+def forget_user(user_id):
+    cache.delete(_cache_key(user_id))
@@ -0,0 +1,71 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import backends, get_user_model, hashers
+from django.db import connections
+
+from .authentication import forget_user
+from .hashers import needs_rehash
+
+logger = logging.getLogger(__name__)
+
+UserModel = get_user_model()
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "PASSWORD_REHASH_WORKERS", 1), thread_name_prefix="rehash"
+        )
+    return _executor
+
+
+def rehash(user_id, old_encoded, password):
+    """Store ``password`` under the preferred hasher, unless it changed meanwhile."""
+    updated = UserModel._default_manager.filter(pk=user_id, password=old_encoded).update(
+        password=hashers.make_password(password)
+    )
+    if updated:
+        forget_user(user_id)
+    return bool(updated)
+
+
+def _rehash_in_background(user_id, old_encoded, password):
+    try:
+        rehash(user_id, old_encoded, password)
+    except Exception:
+        logger.exception("Rehashing the password of user %s failed", user_id)
+    finally:
+        connections.close_all()
+
+
+class ModelBackend(backends.ModelBackend):
+    """Django's ``ModelBackend``, with outdated hashes upgraded off the request thread.
+
+    The stock backend re-encodes the password inline when the stored hash was
+    made by another hasher or with other parameters, doubling the hashing cost
+    of that login. Here the login returns as soon as the password is verified
+    and the new hash is written by a background thread. The thread only holds
+    the plaintext in memory; it is never queued anywhere persistent.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as known ones.
+            UserModel().set_password(password)
+            return
+        if not hashers.check_password(password, user.password) or not self.user_can_authenticate(user):
+            return
+        if needs_rehash(user.password):
+            get_executor().submit(_rehash_in_background, user.pk, user.password, password)
+        return user
@@ -0,0 +1,105 @@
+import json
+import statistics
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from .authentication import issue_tokens
+from .models import ServiceRequest
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(timings_ms, queries, sizes):
+    return {
+        "samples": len(timings_ms),
+        "mean_ms": round(statistics.fmean(timings_ms), 3),
+        "p50_ms": round(percentile(timings_ms, 50), 3),
+        "p90_ms": round(percentile(timings_ms, 90), 3),
+        "p99_ms": round(percentile(timings_ms, 99), 3),
+        "queries": max(queries) if queries else None,
+        "bytes": max(sizes),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def new_report(**meta):
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **meta,
+        "routes": {},
+    }
+
+
+def write_report(path, report):
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+
+
+def load_report(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def compare(baseline, current):
+    """Yield ``(route, metric, before, after)`` for metrics present in both reports."""
+    for route, after in current["routes"].items():
+        before = baseline["routes"].get(route)
+        if not before:
+            continue
+        for metric in ("p50_ms", "p99_ms", "queries", "bytes"):
+            if before.get(metric) is not None and after.get(metric) is not None:
+                yield route, metric, before[metric], after[metric]
+
+
+def pick_user(username=None):
+    """The named user, or the owner of the newest service request."""
+    User = get_user_model()
+    if username:
+        user = User.objects.filter(username=username).first()
+    else:
+        user_id = ServiceRequest.objects.order_by("-id").values_list("user_id", flat=True).first()
+        user = User.objects.filter(pk=user_id).first() if user_id else User.objects.order_by("-id").first()
+    if user is None:
+        raise CommandError("No user to benchmark as; run seed_data first.")
+    return user
+
+
+def auth_headers(user):
+    return {"Authorization": f"Bearer {issue_tokens(user)['access']}"}
+
+
+@contextmanager
+def client_environment():
+    """Let the Django test clients run outside the test runner (e.g. the "testserver" host)."""
+    try:
+        setup_test_environment()
+    except RuntimeError:
+        # Already set up, e.g. when run from the test suite.
+        yield
+        return
+    try:
+        yield
+    finally:
+        teardown_test_environment()
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Appointment, AppointmentSlot
+
+DEFAULT_SLOT_LIMIT = 10
+MAX_SLOT_LIMIT = 100
+# Appointments carry only a start time; each is taken to last this long.
+APPOINTMENT_MINUTES = 30
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+class SlotStarted(SlotUnavailable):
+    pass
+
+
+class AppointmentConflict(Exception):
+    def __init__(self, appointment_id):
+        super().__init__(appointment_id)
+        self.appointment_id = appointment_id
+
+
+def overlapping(user_id, date, time):
+    """The user's appointments starting less than ``APPOINTMENT_MINUTES`` from ``date time``.
+
+    Expressed as ranges on ``(date, time)`` so the ``appointment_user_date_time``
+    index answers it without reading the user's other appointments.
+    """
+    start = datetime.combine(date, time)
+    low, high = start - timedelta(minutes=APPOINTMENT_MINUTES), start + timedelta(minutes=APPOINTMENT_MINUTES)
+    if low.date() == high.date():
+        window = Q(date=low.date(), time__gt=low.time(), time__lt=high.time())
+    else:
+        # The window crosses midnight.
+        window = Q(date=low.date(), time__gt=low.time()) | Q(date=high.date(), time__lt=high.time())
+    return Appointment.objects.filter(window, user_id=user_id)
+
+
+def _check_conflicts(user_id, date, time):
+    # Lock the user's row so two concurrent bookings for the same user are
+    # checked one after the other.
+    list(get_user_model().objects.select_for_update().filter(pk=user_id).values_list("pk"))
+    conflict = overlapping(user_id, date, time).values_list("id", flat=True).first()
+    if conflict is not None:
+        raise AppointmentConflict(conflict)
+
+
+def create_appointment(user_id, service, date, time, location):
+    """Create an appointment outside any slot, refusing overlaps with the user's others."""
+    with transaction.atomic():
+        _check_conflicts(user_id, date, time)
+        return Appointment.objects.create(service=service, user_id=user_id, date=date, time=time, location=location)
+
+
+def free_slots(service_id, after=None, location=None, limit=DEFAULT_SLOT_LIMIT):
+    """The next ``limit`` slots with room for ``service_id`` starting at or after ``after``.
+
+    Served by the partial ``appointmentslot_open`` index, so full slots are never
+    scanned.
+    """
+    slots = AppointmentSlot.objects.filter(
+        service_id=service_id, starts_at__gte=after or timezone.now(), booked__lt=F("capacity")
+    )
+    if location:
+        slots = slots.filter(location=location)
+    return slots.order_by("starts_at", "id")[:limit]
+
+
+def book(user, slot_id):
+    """Take one place in the slot and create the user's appointment.
+
+    The place is taken with a conditional UPDATE, which only locks the slot's
+    row and cannot push ``booked`` past ``capacity`` however many requests race
+    for the last place. A slot that has already started raises ``SlotStarted``.
+    An overlap with another of the user's appointments raises
+    ``AppointmentConflict`` and gives the place back.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        taken = AppointmentSlot.objects.filter(
+            pk=slot_id, starts_at__gte=now, booked__lt=F("capacity")
+        ).update(booked=F("booked") + 1)
+        if not taken:
+            starts_at = AppointmentSlot.objects.filter(pk=slot_id).values_list("starts_at", flat=True).first()
+            if starts_at is not None and starts_at < now:
+                raise SlotStarted(slot_id)
+            raise SlotUnavailable(slot_id)
+        slot = AppointmentSlot.objects.select_related("service__agency").get(pk=slot_id)
+        starts_at = timezone.localtime(slot.starts_at)
+        _check_conflicts(user.pk, starts_at.date(), starts_at.time())
+        return Appointment.objects.create(
+            service=slot.service, slot=slot, user_id=user.pk,
+            date=starts_at.date(), time=starts_at.time(), location=slot.location,
+        )
+
+
+def cancel(appointment):
+    """Delete the appointment and give its place back to the slot."""
+    with transaction.atomic():
+        deleted, _ = Appointment.objects.filter(pk=appointment.pk).delete()
+        if deleted and appointment.slot_id:
+            AppointmentSlot.objects.filter(pk=appointment.slot_id, booked__gt=0).update(booked=F("booked") - 1)
+    return bool(deleted)
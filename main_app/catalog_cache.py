@@ -0,0 +1,146 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+VERSION_KEY = "catalog:version"
+
+# Rendered catalog responses for the current version, keyed by name.
+_lock = threading.Lock()
+_local_version = 1
+_rendered = {}
+_rendered_version = None
+
+
+def _shared_cache():
+    alias = getattr(settings, "CATALOG_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def _fresh_version():
+    # Never reuse a number that may already have cached bytes behind it, even if
+    # the shared cache lost the version key.
+    return time.time_ns()
+
+
+def current_version():
+    cache = _shared_cache()
+    if cache is None:
+        return _local_version
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    global _local_version
+    cache = _shared_cache()
+    if cache is None:
+        with _lock:
+            _local_version += 1
+        return
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _fresh_version(), timeout=None)
+
+
+def clear():
+    global _rendered, _rendered_version
+    with _lock:
+        _rendered = {}
+        _rendered_version = None
+    bump_version()
+
+
+async def acurrent_version():
+    cache = _shared_cache()
+    if cache is None:
+        return _local_version
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, _fresh_version(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def _local_entry(name, version):
+    global _rendered, _rendered_version
+    with _lock:
+        if _rendered_version != version:
+            _rendered, _rendered_version = {}, version
+        return _rendered.get(name)
+
+
+def _remember(name, version, entry):
+    with _lock:
+        if _rendered_version == version:
+            _rendered[name] = entry
+
+
+def _entry(body):
+    return (body, '"%s"' % hashlib.md5(body).hexdigest())
+
+
+def get_or_render(name, render):
+    """Return ``(body, etag)`` for the catalog entry ``name``.
+
+    ``render`` is only called when neither this process nor the shared cache has
+    the entry for the current catalog version, and must return JSON bytes.
+    """
+    version = current_version()
+    entry = _local_entry(name, version)
+    if entry is not None:
+        return entry
+
+    cache = _shared_cache()
+    key = f"catalog:{version}:{name}"
+    entry = cache.get(key) if cache is not None else None
+    if entry is None:
+        entry = _entry(render())
+        if cache is not None:
+            cache.set(key, entry)
+    _remember(name, version, entry)
+    return entry
+
+
+async def aget_or_render(name, arender):
+    """Async twin of ``get_or_render``; ``arender`` is a coroutine function."""
+    version = await acurrent_version()
+    entry = _local_entry(name, version)
+    if entry is not None:
+        return entry
+
+    cache = _shared_cache()
+    key = f"catalog:{version}:{name}"
+    entry = await cache.aget(key) if cache is not None else None
+    if entry is None:
+        entry = _entry(await arender())
+        if cache is not None:
+            await cache.aset(key, entry)
+    _remember(name, version, entry)
+    return entry
+
+
+def catalog_response(request, name, render):
+    return _conditional_response(request, *get_or_render(name, render))
+
+
+async def acatalog_response(request, name, arender):
+    return _conditional_response(request, *await aget_or_render(name, arender))
+
+
+def _conditional_response(request, body, etag):
+    if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+    if "*" in if_none_match or etag in [tag.removeprefix("W/") for tag in if_none_match]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,83 @@
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # optional: "br" is only offered when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: "zstd" is only offered when installed
+    zstandard = None
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+
+def _gzip(data, level):
+    # mtime=0 keeps the output (and anything derived from it) deterministic.
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _zstd(data, level):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+# Content-Encoding token -> compress(data, level), for the codecs available here.
+CODECS = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _brotli
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an ``Accept-Encoding`` header to its q-value."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def preferences():
+    """Available codings in server preference order (``COMPRESSION_ENCODINGS``)."""
+    configured = getattr(settings, "COMPRESSION_ENCODINGS", ["zstd", "br", "gzip"])
+    return [coding for coding in configured if coding in CODECS]
+
+
+def negotiate(header):
+    """Pick the coding to use for a request's ``Accept-Encoding``, or None.
+
+    The client's q-values decide; among equal q-values the server's preference
+    order wins. ``*`` covers codings the client did not list.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in preferences():
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(coding, data):
+    levels = {**DEFAULT_LEVELS, **getattr(settings, "COMPRESSION_LEVELS", {})}
+    return CODECS[coding](data, levels[coding])
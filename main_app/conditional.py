@@ -0,0 +1,46 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ListValidators:
+    """Weak ETag (and optionally Last-Modified) for a per-user list endpoint.
+
+    Both come from one ``COUNT(*), MAX(updated_at)`` over the list's filtered
+    queryset instead of the rendered body, so an unchanged list is answered
+    with a 304 before the page is fetched or serialized. The count catches
+    deletions, which leave ``MAX(updated_at)`` alone; writes must keep
+    ``updated_at`` current (``auto_now`` does not apply to ``QuerySet.update``).
+    """
+
+    def __init__(self, request, count, last_updated, extra=(), last_modified=True):
+        parts = (request.user.id, request.get_full_path(), count, last_updated and last_updated.isoformat(), *extra)
+        self.etag = 'W/"%s"' % hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+        # Deletions and changes outside the rows do not move MAX(updated_at), so lists
+        # that can have either only send the ETag.
+        self.last_modified = int(last_updated.timestamp()) if last_modified and last_updated else None
+
+    @classmethod
+    def for_queryset(cls, request, queryset, extra=(), last_modified=True):
+        stats = queryset.order_by().aggregate(count=Count("pk"), last_updated=Max("updated_at"))
+        return cls(request, stats["count"], stats["last_updated"], extra, last_modified)
+
+    @classmethod
+    async def afor_queryset(cls, request, queryset, extra=(), last_modified=True):
+        stats = await queryset.order_by().aaggregate(count=Count("pk"), last_updated=Max("updated_at"))
+        return cls(request, stats["count"], stats["last_updated"], extra, last_modified)
+
+    def not_modified(self, request):
+        """The 304 (or 412) response when the request's preconditions say so, else None."""
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        return self.apply(response) if response is not None else None
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(self.last_modified)
+        # Per-user data: the browser may keep it but must revalidate; shared caches must not.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,97 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from .models import ServiceRequest, TrafficFine
+
+CHUNK_SIZE = 2000
+
+# kind -> (model, ordering, columns). A column is a model field name or an
+# (alias, lookup) pair that flattens a joined field into the row.
+EXPORTS = {
+    "service-requests": (
+        ServiceRequest,
+        ("-created_at", "-id"),
+        [
+            "id",
+            "created_at",
+            "status",
+            "service_id",
+            ("service_name", "service__name"),
+            ("agency_name", "service__agency__name"),
+            "payload",
+        ],
+    ),
+    "traffic-fines": (
+        TrafficFine,
+        ("-issued_at", "-created_at", "-id"),
+        [
+            "id",
+            "fine_number",
+            "amount",
+            "violation_type",
+            "issued_at",
+            "due_date",
+            "status",
+            "notes",
+            "created_at",
+            "updated_at",
+        ],
+    ),
+}
+
+
+def column_names(kind):
+    return [column if isinstance(column, str) else column[0] for column in EXPORTS[kind][2]]
+
+
+def export_rows(kind, user):
+    """Iterate the user's history as plain dicts, fetched CHUNK_SIZE rows at a time."""
+    model, ordering, columns = EXPORTS[kind]
+    fields = [column for column in columns if isinstance(column, str)]
+    aliases = {column[0]: F(column[1]) for column in columns if not isinstance(column, str)}
+    return (
+        model.objects.filter(user_id=user.pk)
+        .order_by(*ordering)
+        .values(*fields, **aliases)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def _chunked(lines):
+    # Fewer, larger writes to the socket than one per row.
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return _chunked(encoder.encode(row) + "\n" for row in rows)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(kind, rows):
+    columns = column_names(kind)
+    writer = csv.writer(_Echo())
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    def lines():
+        yield writer.writerow(columns)
+        for row in rows:
+            if "payload" in row:
+                row["payload"] = encoder.encode(row["payload"])
+            yield writer.writerow([row[column] for column in columns])
+
+    return _chunked(lines())
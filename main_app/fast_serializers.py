@@ -0,0 +1,228 @@
+import decimal
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from django.db.models.query import ModelIterable
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+class Unsupported(Exception):
+    """The serializer uses something the fast path cannot reproduce exactly."""
+
+
+def _identity(value):
+    return value
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+class _Column:
+    """An encoder that depends on per-render state, bound once per render via ``bind()``."""
+
+    def __init__(self, field):
+        self.field = field
+
+
+class _DateTimeColumn(_Column):
+    def bind(self):
+        field = self.field
+        # enforce_timezone() looks the current timezone up for every value.
+        tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        enforce_timezone = field.enforce_timezone
+
+        def encode(value):
+            if tz is not None and value.tzinfo is not None:
+                try:
+                    value = value.astimezone(tz)
+                except OverflowError:
+                    value = enforce_timezone(value)  # raises DRF's error
+            else:
+                value = enforce_timezone(value)
+            value = value.isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+
+        return encode
+
+
+class _DecimalColumn(_Column):
+    def bind(self):
+        field = self.field
+        if field.decimal_places is None:
+            return lambda value: format(value, "f")
+        # DecimalField.quantize() copies the active context for every value.
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        exponent = decimal.Decimal(".1") ** field.decimal_places
+        rounding = field.rounding
+        return lambda value: format(value.quantize(exponent, rounding=rounding, context=context), "f")
+
+
+def _datetime_encoder(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT).lower() != ISO_8601:
+        raise Unsupported
+    return _DateTimeColumn(field)
+
+
+def _date_encoder(field, setting):
+    if getattr(field, "format", setting).lower() != ISO_8601:
+        raise Unsupported
+    return _isoformat
+
+
+def _decimal_encoder(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output:
+        return field.to_representation
+    return _DecimalColumn(field)
+
+
+def _encoder(field):
+    """The per-column function producing what ``field.to_representation`` would."""
+    # Exact classes only: subclasses may override to_representation.
+    kind = type(field)
+    if kind in (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.JSONField):
+        if kind is serializers.JSONField and field.binary:
+            return field.to_representation
+        return _identity
+    if kind is serializers.ChoiceField and all(isinstance(key, str) for key in field.choices):
+        return _identity
+    if kind is serializers.DateTimeField:
+        return _datetime_encoder(field)
+    if kind is serializers.DateField:
+        return _date_encoder(field, api_settings.DATE_FORMAT)
+    if kind is serializers.TimeField:
+        return _date_encoder(field, api_settings.TIME_FORMAT)
+    if kind is serializers.DecimalField:
+        return _decimal_encoder(field)
+    return field.to_representation
+
+
+def _columns(serializer, model, prefix=""):
+    """``(output key, values() lookup, encoder or nested columns)`` per readable field.
+
+    A nested serializer's lookup is its foreign key, so a NULL key renders as None.
+    """
+    columns = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == "*" or "." in source or isinstance(field, serializers.ListSerializer):
+            raise Unsupported
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            raise Unsupported  # properties, methods
+        lookup = prefix + source
+        if isinstance(field, serializers.BaseSerializer):
+            if not (model_field.many_to_one or model_field.one_to_one) or model_field.auto_created:
+                raise Unsupported
+            columns.append((name, lookup, _columns(field, model_field.related_model, lookup + "__")))
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                raise Unsupported
+            columns.append((name, lookup, _identity))
+        elif model_field.is_relation or isinstance(field, serializers.RelatedField):
+            raise Unsupported
+        else:
+            columns.append((name, lookup, _encoder(field)))
+    return columns
+
+
+def _lookups(columns):
+    for _, lookup, spec in columns:
+        yield lookup
+        if isinstance(spec, list):
+            yield from _lookups(spec)
+
+
+def _builder(columns):
+    """Return a function turning a ``values()`` row into the serializer's output dict."""
+    bound = []
+    for name, lookup, spec in columns:
+        if isinstance(spec, list):
+            bound.append((name, lookup, None, _builder(spec)))
+        else:
+            bound.append((name, lookup, spec.bind() if isinstance(spec, _Column) else spec, None))
+
+    def build(row):
+        out = {}
+        for name, lookup, encode, nested in bound:
+            value = row[lookup]
+            if value is None:
+                out[name] = None
+            elif nested is not None:
+                out[name] = nested(row)
+            else:
+                out[name] = encode(value)
+        return out
+
+    return build
+
+
+class Plan:
+    """A serializer compiled to a ``values()`` projection and a row -> dict function."""
+
+    def __init__(self, serializer_class, fields=None):
+        model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+        if model is None:
+            raise Unsupported
+        self.model = model
+        serializer = serializer_class() if fields is None else serializer_class(fields=fields)
+        self.columns = _columns(serializer, model)
+        self.lookups = list(dict.fromkeys(_lookups(self.columns)))
+
+    def project(self, queryset, ordering=()):
+        """``queryset`` as dict rows holding the serializer's columns (plus ``ordering``'s)."""
+        extra = [self.model._meta.get_field(name.lstrip("-")).attname for name in ordering]
+        # Related rows come in through the joins; prefetches would expect instances.
+        return queryset.prefetch_related(None).values(*dict.fromkeys([*self.lookups, *extra]))
+
+    def render(self, rows):
+        build = _builder(self.columns)
+        return [build(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def compile_plan(serializer_class, fields=None):
+    """The serializer's ``Plan``, or None when its output cannot be reproduced exactly.
+
+    ``fields`` is a sparse fieldset spec (main_app.fieldsets), so narrow
+    requests select only their columns and joins.
+    """
+    try:
+        return Plan(serializer_class, fields)
+    except Unsupported:
+        return None
+
+
+def project(queryset, serializer_class, ordering=(), fields=None):
+    """Project ``queryset`` for ``serializer_class``'s fast path, or return it unchanged."""
+    plan = compile_plan(serializer_class, fields)
+    return plan.project(queryset, ordering) if plan is not None else queryset
+
+
+class FastListSerializer(serializers.ListSerializer):
+    """``many=True`` serializer that renders querysets and ``values()`` rows via ``Plan``.
+
+    Model instances (and anything else) go through DRF as usual, so it is a
+    drop-in ``list_serializer_class`` for read-only output.
+    """
+
+    def to_representation(self, data):
+        plan = compile_plan(type(self.child), getattr(self.child, "sparse_fields", None))
+        if plan is not None:
+            if isinstance(data, QuerySet) and data._iterable_class is ModelIterable:
+                data = plan.project(data)
+            rows = list(data)
+            if not rows or isinstance(rows[0], dict):
+                return plan.render(rows)
+            data = rows
+        return super().to_representation(data)
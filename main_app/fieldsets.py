@@ -0,0 +1,113 @@
+from functools import lru_cache
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+@lru_cache(maxsize=None)
+def _readable(serializer_class):
+    """``{name: nested serializer class or None}`` for the fields the serializer outputs."""
+    return {
+        name: type(field) if isinstance(field, serializers.BaseSerializer) else None
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    }
+
+
+def _paths(value):
+    return [tuple(part.split(".")) for part in value.split(",") if part.strip()]
+
+
+def _spec(serializer_class, paths, expand, prefix=()):
+    readable = _readable(serializer_class)
+    wanted = {}
+    for path in paths:
+        name = path[0].strip()
+        if name not in readable:
+            raise ValidationError({FIELDS_PARAM: f"Unknown field: {'.'.join(prefix + (name,))}."})
+        wanted.setdefault(name, []).append(path[1:])
+
+    spec = []
+    for name, nested in readable.items():  # keep the serializer's order
+        if name not in wanted:
+            continue
+        subpaths = [path for path in wanted[name] if path]
+        if nested is None:
+            if subpaths:
+                raise ValidationError({FIELDS_PARAM: f"{'.'.join(prefix + (name,))} has no subfields."})
+            spec.append((name, None))
+        elif subpaths or prefix + (name,) in expand:
+            if not issubclass(nested, SparseFieldsMixin):
+                raise ValidationError({EXPAND_PARAM: f"{'.'.join(prefix + (name,))} cannot be narrowed."})
+            subpaths = subpaths or [(sub,) for sub in _readable(nested)]
+            spec.append((name, _spec(nested, subpaths, expand, prefix + (name,))))
+        else:
+            spec.append((name, None))  # collapsed to the related id
+    return tuple(spec)
+
+
+def _check_expand(serializer_class, path):
+    current = serializer_class
+    for depth, name in enumerate(path):
+        nested = _readable(current).get(name)
+        if nested is None:
+            raise ValidationError({EXPAND_PARAM: f"Not an expandable relation: {'.'.join(path[: depth + 1])}."})
+        current = nested
+
+
+def parse_fieldsets(request, serializer_class):
+    """The ``fields=`` spec for ``serializer_class`` asked for by ``?fields=`` / ``?expand=``.
+
+    ``?fields=id,status,service.name`` picks fields, dotted paths reaching into
+    nested objects. Once either parameter is given, nested objects that are not
+    reached into render as their id unless listed in ``?expand=`` (e.g.
+    ``?expand=service,service.agency``). Returns None, the full default
+    output, when neither is given.
+    """
+    fields = request.query_params.get(FIELDS_PARAM, "")
+    expand = request.query_params.get(EXPAND_PARAM, "")
+    if not fields.strip() and not expand.strip():
+        return None
+    expand = {tuple(name.strip() for name in path) for path in _paths(expand)}
+    for path in expand:
+        _check_expand(serializer_class, path)
+    paths = _paths(fields) or [(name,) for name in _readable(serializer_class)]
+    return _spec(serializer_class, paths, expand)
+
+
+def cache_suffix(spec):
+    """A short, stable string naming ``spec`` (for cache keys)."""
+    if spec is None:
+        return ""
+    return ",".join(name if sub is None else f"{name}({cache_suffix(sub)})" for name, sub in spec)
+
+
+class SparseFieldsMixin:
+    """Let a serializer render only part of its fields.
+
+    Takes ``fields=``, a spec from ``parse_fieldsets``: ``(name, sub)`` pairs
+    where ``sub`` is None for a plain field or a collapsed relation (rendered
+    as its primary key) and a nested spec for an expanded one.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        self.sparse_fields = fields
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.sparse_fields is None:
+            return fields
+        pruned = {}
+        for name, sub in self.sparse_fields:
+            field = fields[name]
+            if isinstance(field, serializers.BaseSerializer):
+                if sub is None:
+                    field = serializers.PrimaryKeyRelatedField(read_only=True, source=field.source)
+                else:
+                    field = type(field)(*field._args, **{**field._kwargs, "fields": sub})
+            pruned[name] = field
+        return pruned
@@ -0,0 +1,194 @@
+import csv
+import json
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .models import TrafficFine
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+# Errors kept for the report; the rest are only counted.
+MAX_ERRORS = 50
+# Usernames remembered between batches before the cache is dropped.
+USER_CACHE_SIZE = 100_000
+FINE_NUMBER_LENGTH = TrafficFine._meta.get_field("fine_number").max_length
+
+# Fields the feed may change on a fine it has sent before. ``status`` is left
+# out so a fine paid here is not set back to PENDING by a resend.
+UPDATE_FIELDS = ["user", "amount", "violation_type", "issued_at", "due_date", "notes", "updated_at"]
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line number, dict)`` from a text stream of CSV or NDJSON fines."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def _date(row, field):
+    value = row.get(field)
+    if value in (None, ""):
+        return None
+    try:
+        parsed = parse_date(str(value))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise InvalidRow(f"{field} is not a date: {value!r}")
+    return parsed
+
+
+def parse_row(row):
+    """The ``(username, field values)`` of one feed row, or ``InvalidRow``."""
+    if not isinstance(row, dict):
+        raise InvalidRow("not an object")
+    fine_number = str(row.get("fine_number") or "").strip()
+    username = str(row.get("username") or "").strip()
+    if not fine_number:
+        raise InvalidRow("fine_number is required")
+    if len(fine_number) > FINE_NUMBER_LENGTH:
+        # The upsert key: truncating could merge two distinct fines.
+        raise InvalidRow(f"fine_number longer than {FINE_NUMBER_LENGTH} characters")
+    if not username:
+        raise InvalidRow("username is required")
+    try:
+        amount = Decimal(str(row.get("amount"))).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise InvalidRow(f"amount is not a number: {row.get('amount')!r}")
+    if not amount.is_finite() or amount < 0 or amount.adjusted() >= 8:
+        raise InvalidRow(f"amount out of range: {row.get('amount')!r}")
+    status = str(row.get("status") or TrafficFine.PENDING).strip().upper()
+    if status not in dict(TrafficFine.STATUS_CHOICES):
+        raise InvalidRow(f"unknown status: {row.get('status')!r}")
+    return username, {
+        "fine_number": fine_number,
+        "amount": amount,
+        "violation_type": str(row.get("violation_type") or "")[:120],
+        "issued_at": _date(row, "issued_at"),
+        "due_date": _date(row, "due_date"),
+        "status": status,
+        "notes": str(row.get("notes") or ""),
+    }
+
+
+class Report:
+    def __init__(self):
+        self.read = 0
+        self.upserted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.batches = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def reject(self, line, message):
+        self.rejected += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    @property
+    def rows_per_second(self):
+        return round(self.read / self.seconds) if self.seconds else 0
+
+    def as_dict(self):
+        return {
+            "read": self.read,
+            "upserted": self.upserted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": self.rows_per_second,
+            "errors": self.errors,
+        }
+
+
+class FineIngester:
+    """Upsert fines from a stream of rows, ``batch_size`` rows per transaction.
+
+    Each batch resolves its usernames with one query and writes with one
+    ``INSERT ... ON CONFLICT (fine_number) DO UPDATE``. A fine number repeated
+    within a batch keeps its last row, since one statement cannot update the
+    same row twice.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, on_batch=None):
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.report = Report()
+        self.user_ids = {}
+
+    def resolve_users(self, usernames):
+        missing = [name for name in usernames if name not in self.user_ids]
+        if missing:
+            if len(self.user_ids) + len(missing) > USER_CACHE_SIZE:
+                self.user_ids.clear()
+            found = dict(User.objects.filter(username__in=missing).values_list("username", "id"))
+            for name in missing:
+                self.user_ids[name] = found.get(name)
+        return {name: self.user_ids[name] for name in usernames}
+
+    def flush(self, batch):
+        if not batch:
+            return
+        user_ids = self.resolve_users({username for _, username, _ in batch.values()})
+        fines = []
+        for line, username, values in batch.values():
+            user_id = user_ids[username]
+            if user_id is None:
+                self.report.reject(line, f"unknown username: {username!r}")
+                continue
+            fines.append(TrafficFine(user_id=user_id, **values))
+        with transaction.atomic():
+            TrafficFine.objects.bulk_create(
+                fines, update_conflicts=True, unique_fields=["fine_number"], update_fields=UPDATE_FIELDS
+            )
+        self.report.upserted += len(fines)
+        self.report.batches += 1
+        if self.on_batch:
+            self.on_batch(self.report)
+
+    def ingest(self, rows):
+        batch = {}  # fine number -> (line, username, values)
+        for line, row in rows:
+            self.report.read += 1
+            try:
+                username, values = parse_row(row)
+            except InvalidRow as exc:
+                self.report.reject(line, str(exc))
+                continue
+            if values["fine_number"] in batch:
+                self.report.duplicates += 1
+            batch[values["fine_number"]] = (line, username, values)
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = {}
+        self.flush(batch)
+        self.report.seconds = time.perf_counter() - self.report.started
+        return self.report
+
+
+def ingest(stream, fmt, batch_size=BATCH_SIZE, on_batch=None):
+    return FineIngester(batch_size, on_batch).ingest(read_rows(stream, fmt))
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _param(algorithm, name, default):
+    return getattr(settings, "PASSWORD_HASHER_PARAMS", {}).get(algorithm, {}).get(name, default)
+
+
+# Each hasher keeps Django's algorithm name, so hashes made by the stock hasher
+# verify with the tuned one and vice versa. Parameters are read from
+# PASSWORD_HASHER_PARAMS on every use; a stored hash with other parameters is
+# reported by must_update() and upgraded on the user's next login.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _param("pbkdf2", "iterations", hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return _param("scrypt", "work_factor", hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return _param("scrypt", "block_size", hashers.ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return _param("scrypt", "parallelism", hashers.ScryptPasswordHasher.parallelism)
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * N * r bytes; OpenSSL refuses more than 32 MiB
+        # unless told otherwise.
+        return 2 * 128 * self.work_factor * self.block_size
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the optional ``argon2-cffi`` package."""
+
+    @property
+    def time_cost(self):
+        return _param("argon2", "time_cost", hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _param("argon2", "memory_cost", hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _param("argon2", "parallelism", hashers.Argon2PasswordHasher.parallelism)
+
+
+def needs_rehash(encoded):
+    """True if ``encoded`` is not what the preferred hasher would produce today."""
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def describe(hasher):
+    """The cost parameters of ``hasher``, for reports."""
+    names = {
+        "pbkdf2_sha256": ("iterations",),
+        "scrypt": ("work_factor", "block_size", "parallelism"),
+        "argon2": ("time_cost", "memory_cost", "parallelism"),
+    }.get(hasher.algorithm, ())
+    return {name: getattr(hasher, name) for name in names}
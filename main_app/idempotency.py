@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+def fingerprint(request, data):
+    raw = json.dumps(
+        [request.method, request.path, {name: data.get(name) for name in data}],
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return Response(
+            {"detail": f"{HEADER} was already used with a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(stored.response, status=stored.status_code, headers={"Idempotent-Replayed": "true"})
+
+
+def respond_once(request, data, handler):
+    """Run ``handler()`` at most once per ``Idempotency-Key`` header value.
+
+    Without the header this is just ``handler()``. With it, a stored response is
+    replayed without calling the handler; otherwise the handler's writes and the
+    stored 2xx response commit together, so a concurrent retry that loses the
+    race on the unique key is rolled back and replays the winner's response.
+    """
+    key = request.headers.get(HEADER)
+    if key is None:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {"detail": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    request_hash = fingerprint(request, data)
+    user_id = request.user.id
+    stored = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+    if stored is not None:
+        return _replay(stored, request_hash)
+
+    try:
+        with transaction.atomic():
+            response = handler()
+            if status.is_success(response.status_code):
+                IdempotencyKey.objects.create(
+                    user_id=user_id, key=key, request_hash=request_hash,
+                    status_code=response.status_code, response=response.data,
+                )
+    except IntegrityError:
+        stored = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+        if stored is None:
+            raise
+        return _replay(stored, request_hash)
+    return response
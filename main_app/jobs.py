@@ -0,0 +1,138 @@
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a RUNNING job whose worker died is handed out again.
+LEASE_SECONDS = 300
+# Retry n waits BACKOFF_BASE * 2**(n-1) seconds (plus jitter), at most BACKOFF_MAX.
+BACKOFF_BASE = 5
+BACKOFF_MAX = 3600
+
+# Job kind -> function taking the Job and returning a JSON-serializable result.
+HANDLERS = {}
+
+
+def handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def enqueue(kind, user=None, run_at=None, **args):
+    """Queue ``kind`` to run with ``args``; committed with the caller's transaction."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return Job.objects.create(
+        kind=kind, user_id=user.pk if user is not None else None, args=args, run_at=run_at or timezone.now()
+    )
+
+
+def pending(kind, user=None, **args):
+    """The queued or running ``kind`` job for ``user`` with ``args``, or None."""
+    lookups = {f"args__{name}": value for name, value in args.items()}
+    return (
+        Job.objects.filter(
+            kind=kind, user_id=user.pk if user is not None else None, status__in=[Job.QUEUED, Job.RUNNING], **lookups
+        )
+        .order_by("-id")
+        .first()
+    )
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(1, 1.25))
+
+
+def claim(worker, limit=1):
+    """Mark up to ``limit`` due jobs as running for ``worker`` and return them.
+
+    The claim is a single ``UPDATE ... WHERE id IN (SELECT ... LIMIT n)``. Where
+    the database supports it the subquery is ``FOR UPDATE SKIP LOCKED``, so
+    concurrent workers pass over each other's rows instead of queueing on them;
+    on SQLite the UPDATE takes the write lock up front instead.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by("run_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        claimed = Job.objects.filter(pk__in=due.values("id")[:limit]).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1, updated_at=now
+        )
+    if not claimed:
+        return []
+    return list(Job.objects.filter(status=Job.RUNNING, locked_by=worker, locked_at=now).order_by("run_at", "id"))
+
+
+def requeue_stale(lease_seconds=LEASE_SECONDS):
+    """Hand RUNNING jobs whose lease ran out back to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=lease_seconds)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.QUEUED, locked_by="", locked_at=None, updated_at=timezone.now()
+    )
+
+
+def run(job):
+    """Run a claimed job and record the outcome: done, retry later, or failed."""
+    try:
+        with transaction.atomic():
+            result = HANDLERS[job.kind](job)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.DONE, result=result, locked_by="", locked_at=None, updated_at=timezone.now()
+            )
+        job.status, job.result = Job.DONE, result
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Job %s (%s) failed on attempt %s", job.pk, job.kind, job.attempts, exc_info=True)
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+        else:
+            job.status, job.run_at = Job.QUEUED, now + backoff(job.attempts)
+        Job.objects.filter(pk=job.pk).update(
+            status=job.status, run_at=job.run_at, last_error=error, locked_by="", locked_at=None, updated_at=now
+        )
+        job.last_error = error
+    return job
+
+
+def work(worker=None, batch_size=10, poll_interval=1.0, once=False, should_stop=lambda: False):
+    """Claim and run jobs until ``should_stop()``; with ``once``, until the queue is drained.
+
+    Returns the number of jobs run.
+    """
+    worker = worker or worker_name()
+    done = 0
+    last_reap = 0.0
+    while not should_stop():
+        if time.monotonic() - last_reap > LEASE_SECONDS / 4:
+            requeue_stale()
+            last_reap = time.monotonic()
+        jobs = claim(worker, batch_size)
+        for job in jobs:
+            run(job)
+        done += len(jobs)
+        if not jobs:
+            if once:
+                break
+            time.sleep(poll_interval)
+    return done
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from main_app import benchmarking
+from main_app.models import Service
+
+# Sync route name -> its async twin; both are driven with the same request mix.
+ROUTE_PAIRS = {
+    "agency-list": "async-agency-list",
+    "service-list": "async-service-list",
+    "service-detail": "async-service-detail",
+    "service-request-list": "async-service-request-list",
+    "my-fines": "async-my-fines",
+}
+
+
+def route_kwargs(name):
+    if name.endswith("service-detail"):
+        return {"pk": Service.objects.order_by("id").values_list("id", flat=True).first()}
+    return {}
+
+
+class Command(BaseCommand):
+    help = "Compare throughput of the sync WSGI read views with their async ASGI twins under concurrent load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="User to authenticate as (default: owner of the newest request).")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per route and mode.")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--routes", help="Comma-separated sync URL names to run (default: all paired routes).")
+        parser.add_argument("--output", help="Write the JSON report here.")
+
+    def handle(self, *args, **options):
+        names = options["routes"].split(",") if options["routes"] else list(ROUTE_PAIRS)
+        unknown = set(names) - set(ROUTE_PAIRS)
+        if unknown:
+            raise CommandError(f"No async twin for: {', '.join(sorted(unknown))}")
+        if "service-detail" in names and not Service.objects.exists():
+            names.remove("service-detail")
+
+        user = benchmarking.pick_user(options["username"])
+        headers = benchmarking.auth_headers(user)
+        total, concurrency = options["requests"], options["concurrency"]
+        report = benchmarking.new_report(requests=total, concurrency=concurrency, user=user.username)
+
+        with benchmarking.client_environment():
+            for name in names:
+                for mode, route in (("wsgi", name), ("asgi", ROUTE_PAIRS[name])):
+                    path = reverse(route, kwargs=route_kwargs(route))
+                    if mode == "wsgi":
+                        result = self.run_sync(path, headers, total, concurrency)
+                    else:
+                        result = async_to_sync(self.run_async)(path, headers, total, concurrency)
+                    report["routes"][f"{name}:{mode}"] = {"path": path, **result}
+                    self.stdout.write(
+                        f"{name:<22} {mode} {result['requests_per_s']:>9.1f} req/s "
+                        f"p50={result['p50_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms errors={result['errors']}"
+                    )
+
+        if options["output"]:
+            benchmarking.write_report(options["output"], report)
+
+    def summarize(self, timings, sizes, statuses, elapsed):
+        return {
+            **benchmarking.summarize(timings, [], sizes),
+            "requests_per_s": round(len(timings) / max(elapsed, 1e-9), 1),
+            "errors": sum(1 for code in statuses if code >= 400),
+        }
+
+    def run_sync(self, path, headers, total, concurrency):
+        def call(_):
+            started = time.perf_counter()
+            response = Client(raise_request_exception=False).get(path, headers=headers)
+            return (time.perf_counter() - started) * 1000, len(response.content), response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(call, range(total)))
+        elapsed = time.perf_counter() - started
+        timings, sizes, statuses = zip(*results)
+        return self.summarize(timings, sizes, statuses, elapsed)
+
+    async def run_async(self, path, headers, total, concurrency):
+        client = AsyncClient(raise_request_exception=False)
+        gate = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with gate:
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                return (time.perf_counter() - started) * 1000, len(response.content), response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(call() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        timings, sizes, statuses = zip(*results)
+        return self.summarize(timings, sizes, statuses, elapsed)
@@ -0,0 +1,48 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from main_app.models import TrafficFine
+from main_app.payments import LEDGER_BATCH_SIZE, pay_fines
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Pay batches of synthetic traffic fines and report queries and time per batch size. Nothing is kept."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1,100,10000", help="Comma-separated fine counts.")
+        parser.add_argument("--batch-size", type=int, default=LEDGER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        self.stdout.write(f"{'fines':>8} {'queries':>8} {'inserts':>8} {'other':>6} {'ms':>9}")
+        for size in sizes:
+            queries, inserts, elapsed = self.run_once(size, options["batch_size"])
+            self.stdout.write(
+                f"{size:>8} {queries:>8} {inserts:>8} {queries - inserts:>6} {elapsed * 1000:>9.1f}"
+            )
+
+    def run_once(self, size, batch_size):
+        with transaction.atomic():
+            user = User.objects.create_user(username=f"bench-fines-{time.time_ns()}")
+            TrafficFine.objects.bulk_create(
+                [
+                    TrafficFine(user=user, fine_number=f"BENCH-{user.pk}-{i}", amount=Decimal("150.00"))
+                    for i in range(size)
+                ],
+                batch_size=batch_size,
+            )
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                pay_fines(user, batch_size=batch_size)
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        inserts = sum(1 for query in ctx.captured_queries if query["sql"].startswith("INSERT"))
+        return len(ctx.captured_queries), inserts, elapsed
@@ -0,0 +1,43 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from main_app.hashers import describe
+
+
+class Command(BaseCommand):
+    help = "Time one password check per PASSWORD_HASHER_PROFILES entry and report logins/sec per core."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", help="Comma-separated profile names (default: all).")
+        parser.add_argument("--iterations", type=int, default=10)
+
+    def handle(self, *args, **options):
+        profiles = settings.PASSWORD_HASHER_PROFILES
+        names = options["profiles"].split(",") if options["profiles"] else list(profiles)
+        unknown = set(names) - set(profiles)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{'profile':<10} {'algorithm':<14} {'p50 ms':>9} {'logins/s/core':>14}  parameters")
+        for name in names:
+            hasher = import_string(profiles[name][0])()
+            try:
+                encoded = hasher.encode("benchmark-password", hasher.salt())
+            except ValueError as exc:
+                # e.g. argon2-cffi is not installed
+                self.stdout.write(f"{name:<10} {hasher.algorithm:<14} skipped: {exc}")
+                continue
+            timings = []
+            for _ in range(options["iterations"]):
+                started = time.perf_counter()
+                hasher.verify("benchmark-password", encoded)
+                timings.append(time.perf_counter() - started)
+            current = " (current)" if name == settings.PASSWORD_HASHER_PROFILE else ""
+            self.stdout.write(
+                f"{name:<10} {hasher.algorithm:<14} {statistics.median(timings) * 1000:>9.1f} "
+                f"{1 / statistics.mean(timings):>14.1f}  {describe(hasher)}{current}"
+            )
@@ -0,0 +1,162 @@
+import time
+import uuid
+from contextlib import nullcontext
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from main_app import benchmarking
+from main_app.models import Appointment, AppointmentSlot, Job, Service, ServiceRequest
+from main_app.urls import urlpatterns
+
+# How to call each route; anything not listed is a plain authenticated GET.
+# Non-GET routes run inside a rolled-back transaction so the database is unchanged.
+ROUTE_CALLS = {
+    "service-request-pay": ("post", lambda ctx: {}),
+    "signup": ("post", lambda ctx: {
+        "username": f"bench-{uuid.uuid4().hex[:12]}", "email": "bench@example.com", "password": ctx["password"],
+    }),
+    "login": ("post", lambda ctx: {"username": ctx["user"].username, "password": ctx["password"]}),
+    "change-password": ("post", lambda ctx: {"old_password": ctx["password"], "new_password": ctx["password"]}),
+    "pay-fines": ("post", lambda ctx: {"pay_all": True}),
+    "slot-book": ("post", lambda ctx: {}),
+}
+
+# Query strings for routes that need them.
+QUERY_STRINGS = {
+    "service-search": "?q=service",
+}
+
+
+def latest_request_pk(user):
+    return ServiceRequest.objects.filter(user=user).order_by("-created_at", "-id").values_list("id", flat=True).first()
+
+
+# URL kwargs for routes with path parameters; a None value skips the route.
+URL_KWARGS = {
+    "service-detail": lambda user: {"pk": Service.objects.order_by("id").values_list("id", flat=True).first()},
+    "async-service-detail": lambda user: {"pk": Service.objects.order_by("id").values_list("id", flat=True).first()},
+    "service-request-detail": lambda user: {"pk": latest_request_pk(user)},
+    "service-request-pay": lambda user: {"pk": latest_request_pk(user)},
+    "history-export": lambda user: {"kind": "service-requests"},
+    "service-slots": lambda user: {"pk": Service.objects.order_by("id").values_list("id", flat=True).first()},
+    "slot-book": lambda user: {"pk": AppointmentSlot.objects.filter(
+        starts_at__gte=timezone.now(), booked__lt=F("capacity")
+    ).order_by("starts_at", "id").values_list("id", flat=True).first()},
+    "appointment-detail": lambda user: {"pk": Appointment.objects.filter(user=user).order_by("-id").values_list("id", flat=True).first()},
+    "job-detail": lambda user: {"pk": Job.objects.filter(user=user).order_by("-id").values_list("id", flat=True).first()},
+}
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class Command(BaseCommand):
+    help = "Drive every route in main_app.urls and record latency percentiles, queries and bytes per response."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="User to authenticate as (default: owner of the newest request).")
+        parser.add_argument("--password", default="seedpass123")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--routes", help="Comma-separated URL names to run (default: all).")
+        parser.add_argument("--asgi", action="store_true", help="Use the ASGI handler (GET routes only, no query counts).")
+        parser.add_argument("--output", help="Write the JSON report here.")
+        parser.add_argument("--compare", help="A previous JSON report to diff against.")
+
+    def plan(self, user, only):
+        ctx = {"user": user, "password": self.password}
+        for pattern in urlpatterns:
+            name = pattern.name
+            if only and name not in only:
+                continue
+            method, data = ROUTE_CALLS.get(name, ("get", None))
+            if self.asgi and method != "get":
+                continue
+            kwargs = {}
+            if pattern.pattern.converters:
+                kwargs = URL_KWARGS[name](user) if name in URL_KWARGS else {}
+                if set(kwargs) != set(pattern.pattern.converters) or None in kwargs.values():
+                    self.stderr.write(f"skipping {name}: no object to request")
+                    continue
+            path = reverse(name, kwargs=kwargs) + QUERY_STRINGS.get(name, "")
+            yield name, method, path, (lambda data=data: data(ctx) if data else None)
+
+    def handle(self, *args, **options):
+        self.password = options["password"]
+        self.asgi = options["asgi"]
+        user = benchmarking.pick_user(options["username"])
+        only = set(options["routes"].split(",")) if options["routes"] else None
+        headers = benchmarking.auth_headers(user)
+
+        report = benchmarking.new_report(mode="asgi" if self.asgi else "wsgi", iterations=options["iterations"], user=user.username)
+        # Every iteration logs in as the same user from the same address; the
+        # login throttle would turn most of them into 429s.
+        with benchmarking.client_environment(), override_settings(THROTTLE_RATES={}):
+            for name, method, path, data in self.plan(user, only):
+                if self.asgi:
+                    result = async_to_sync(self.run_async)(method, path, data, headers, options["iterations"])
+                else:
+                    result = self.run_sync(method, path, data, headers, options["iterations"])
+                report["routes"][name] = {"method": method.upper(), "path": path, **result}
+                self.stdout.write(
+                    f"{name:<28} {result['status']:>3} p50={result['p50_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+                    f"queries={result['queries']} bytes={result['bytes']}"
+                )
+
+        if options["output"]:
+            benchmarking.write_report(options["output"], report)
+        if options["compare"]:
+            for route, metric, before, after in benchmarking.compare(benchmarking.load_report(options["compare"]), report):
+                if before != after:
+                    self.stdout.write(f"{route:<28} {metric:<8} {before} -> {after}")
+
+    def run_sync(self, method, path, data, headers, iterations):
+        client = Client(raise_request_exception=False)
+        timings, queries, sizes, status = [], [], [], None
+        for _ in range(iterations):
+            counter = QueryCounter()
+            with transaction.atomic() if method != "get" else nullcontext():
+                started = time.perf_counter()
+                with connection.execute_wrapper(counter):
+                    if method == "get":
+                        response = client.get(path, headers=headers)
+                    else:
+                        response = getattr(client, method)(path, data(), content_type="application/json", headers=headers)
+                    size = response_size(response)
+                timings.append((time.perf_counter() - started) * 1000)
+                if method != "get":
+                    transaction.set_rollback(True)
+            queries.append(counter.count)
+            sizes.append(size)
+            status = response.status_code
+        return {"status": status, **benchmarking.summarize(timings, queries, sizes)}
+
+    async def run_async(self, method, path, data, headers, iterations):
+        client = AsyncClient(raise_request_exception=False)
+        timings, queries, sizes, status = [], [], [], None
+        # Views run on a sync_to_async thread with its own connection object, so
+        # query counts are only recorded in WSGI mode.
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+            sizes.append(len(response.content) if not response.streaming else 0)
+            status = response.status_code
+        return {"status": status, **benchmarking.summarize(timings, queries, sizes)}
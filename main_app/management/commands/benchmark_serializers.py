@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from main_app.fast_serializers import compile_plan
+from main_app.models import Service, ServiceRequest, TrafficFine
+from main_app.query_plan import plan_queryset
+from main_app.renderers import FastJSONRenderer
+from main_app.serializers import ServiceRequestSerializer, ServiceSerializer, TrafficFineSerializer
+
+TARGETS = {
+    "services": (Service, ServiceSerializer),
+    "service-requests": (ServiceRequest, ServiceRequestSerializer),
+    "fines": (TrafficFine, TrafficFineSerializer),
+}
+
+
+def drf_render(queryset, serializer_class):
+    """The stock path: model instances through DRF fields, then JSONRenderer."""
+    data = serializers.ListSerializer(list(queryset), child=serializer_class()).data
+    return JSONRenderer().render(data)
+
+
+def fast_render(queryset, serializer_class):
+    """``values()`` rows through the compiled plan, then FastJSONRenderer."""
+    return FastJSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and fast-path list serialization (query + encode) and check the bytes match."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--targets", help=f"Comma-separated targets (default: all of {', '.join(TARGETS)}).")
+        parser.add_argument("--rows", type=int, default=500, help="Rows per list.")
+        parser.add_argument("--iterations", type=int, default=10)
+
+    def handle(self, *args, **options):
+        names = options["targets"].split(",") if options["targets"] else list(TARGETS)
+        unknown = set(names) - set(TARGETS)
+        if unknown:
+            raise CommandError(f"Unknown target(s): {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{'target':<18} {'rows':>6} {'drf ms':>9} {'fast ms':>9} {'speedup':>8} {'bytes':>10}")
+        for name in names:
+            model, serializer_class = TARGETS[name]
+            if compile_plan(serializer_class) is None:
+                raise CommandError(f"{serializer_class.__name__} has no fast path.")
+            queryset = plan_queryset(model.objects.order_by("-id"), serializer_class)[: options["rows"]]
+            rows = queryset.count()
+            if not rows:
+                self.stdout.write(f"{name:<18} {0:>6} skipped: no rows (run seed_data)")
+                continue
+
+            expected, actual = drf_render(queryset, serializer_class), fast_render(queryset, serializer_class)
+            if actual != expected:
+                raise CommandError(f"{name}: fast path output differs from DRF's.")
+
+            timings = {"drf": [], "fast": []}
+            for _ in range(options["iterations"]):
+                for label, render in (("drf", drf_render), ("fast", fast_render)):
+                    started = time.perf_counter()
+                    render(queryset, serializer_class)
+                    timings[label].append(time.perf_counter() - started)
+            drf, fast = statistics.median(timings["drf"]), statistics.median(timings["fast"])
+            self.stdout.write(
+                f"{name:<18} {rows:>6} {drf * 1000:>9.2f} {fast * 1000:>9.2f} "
+                f"{drf / fast:>7.1f}x {len(expected):>10}"
+            )
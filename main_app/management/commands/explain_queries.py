@@ -0,0 +1,74 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from main_app.pagination import KeysetPagination
+from main_app.views import MyBankAccountView, MyFinesView, ServiceRequestList
+
+User = get_user_model()
+
+# (url name, view) for every per-user endpoint whose queryset should hit an index.
+VIEWS = [
+    ("service-request-list", ServiceRequestList),
+    ("my-fines", MyFinesView),
+    ("my-bank-account", MyBankAccountView),
+]
+
+INDEX_MARKERS = re.compile(
+    r"Index Scan|Index Only Scan|Bitmap Index Scan|USING (COVERING )?INDEX|USING INTEGER PRIMARY KEY"
+)
+FULL_SCAN = re.compile(r"Seq Scan on (\w+)|\bSCAN (?:TABLE )?(\w+)\b(?! USING)")
+
+
+def view_queryset(view_class, user):
+    """Build the queryset ``view_class`` would run for ``user``'s first page."""
+    request = Request(APIRequestFactory().get("/"))
+    request.user = user
+    view = view_class()
+    view.request = request
+    queryset = view.get_queryset()
+    ordering = getattr(view_class, "pagination_ordering", None)
+    if ordering:
+        return KeysetPagination(ordering=ordering).get_page_queryset(queryset, request)
+    return queryset[:1]
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on each per-user view queryset and report whether it is served by an index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to build the querysets for (default: the user with the most requests).")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plans.")
+        parser.add_argument("--strict", action="store_true", help="Exit with an error if any query does a full table scan.")
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {username!r}.")
+        user = User.objects.annotate(requests=Count("servicerequest")).order_by("-requests", "-id").first()
+        if user is None:
+            raise CommandError("The database has no users; seed it first.")
+        return user
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        failures = []
+        for name, view_class in VIEWS:
+            plan = view_queryset(view_class, user).explain()
+            scanned = [a or b for a, b in FULL_SCAN.findall(plan)]
+            ok = bool(INDEX_MARKERS.search(plan)) and not scanned
+            if not ok:
+                failures.append(name)
+            label = "index" if ok else f"FULL SCAN ({', '.join(scanned) or 'no index used'})"
+            self.stdout.write(f"{name:<24} {label}")
+            if options["verbose_plans"] or not ok:
+                self.stdout.write("    " + plan.replace("\n", "\n    "))
+
+        if failures and options["strict"]:
+            raise CommandError(f"Queries without an index scan: {', '.join(failures)}")
@@ -0,0 +1,50 @@
+import gzip
+import sys
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main_app.fine_ingest import BATCH_SIZE, ingest
+
+
+class Command(BaseCommand):
+    help = "Upsert traffic fines from a CSV or NDJSON file (optionally gzipped; '-' reads stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or self.guess_format(path)
+
+        def progress(report):
+            self.stderr.write(f"{report.read} read, {report.upserted} upserted, {report.rejected} rejected")
+
+        try:
+            with self.open(path) as stream:
+                report = ingest(stream, fmt, options["batch_size"], on_batch=progress if options["verbosity"] > 1 else None)
+        except OSError as exc:
+            raise CommandError(exc)
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            f"{report.read} rows read, {report.upserted} upserted, {report.duplicates} duplicates, "
+            f"{report.rejected} rejected in {report.seconds:.1f}s ({report.rows_per_second} rows/s)"
+        )
+
+    def open(self, path):
+        if path == "-":
+            return nullcontext(sys.stdin)
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+        return open(path, encoding="utf-8-sig", newline="")
+
+    def guess_format(self, path):
+        name = path.removesuffix(".gz")
+        if name.endswith(".csv"):
+            return "csv"
+        if name.endswith((".ndjson", ".jsonl")):
+            return "ndjson"
+        raise CommandError("Pass --format; it cannot be guessed from the file name.")
@@ -0,0 +1,55 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from main_app import jobs
+
+
+class Command(BaseCommand):
+    help = "Run background job workers. Throughput scales with --processes (or more hosts running this command)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=10, help="Jobs claimed per poll.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due.")
+
+    def handle(self, *args, **options):
+        work_options = {
+            "batch_size": options["batch_size"],
+            "poll_interval": options["poll_interval"],
+            "once": options["once"],
+        }
+        if options["processes"] <= 1:
+            done = self.work(work_options)
+            self.stdout.write(f"Ran {done} job(s).")
+            return
+
+        # Children must open their own database connections, not share ours.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=self.work, args=(work_options,), daemon=True)
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            # The workers got the SIGINT too and stop after their current job.
+            for worker in workers:
+                worker.join()
+
+    def work(self, work_options):
+        stopping = []
+        # Finish the current job before exiting on SIGTERM or Ctrl-C.
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.append(True))
+        try:
+            return jobs.work(should_stop=lambda: bool(stopping), **work_options)
+        finally:
+            connections.close_all()
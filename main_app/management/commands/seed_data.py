@@ -0,0 +1,178 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from main_app import catalog_cache
+from main_app.models import AppointmentSlot, GovernmentAgency, Service, ServiceRequest, TrafficFine
+
+User = get_user_model()
+
+REQUEST_STATUSES = [ServiceRequest.PENDING, ServiceRequest.PROCESSING, ServiceRequest.APPROVED, ServiceRequest.REJECTED]
+VIOLATIONS = ["Speeding", "Red light", "Illegal parking", "Seat belt", "Mobile phone use"]
+LOCATIONS = ["Riyadh Main Branch", "Jeddah Branch", "Dammam Branch", "Online"]
+SLOT_MINUTES = 30
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def explicit_timestamps(model, field_name):
+    """Let bulk_create keep the ``auto_now_add`` values we generate."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, services, service requests and traffic fines in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--agencies", type=int, default=20)
+        parser.add_argument("--services", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=50000)
+        parser.add_argument("--fines", type=int, default=10000)
+        parser.add_argument("--slots", type=int, default=5000, help="Future appointment slots, spread over the services.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--days", type=int, default=3 * 365, help="Spread timestamps over this many past days.")
+        parser.add_argument("--password", default="seedpass123", help="Password given to every seeded user.")
+        parser.add_argument("--prefix", default=None, help="Prefix for unique names (default: a per-run token).")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible data.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.days = options["days"]
+        self.prefix = options["prefix"] or f"seed{int(time.time())}"
+        self.now = timezone.now()
+
+        user_ids = self.seed_users(options["users"], options["password"])
+        service_ids = self.seed_catalog(options["agencies"], options["services"])
+        if options["requests"] and user_ids and service_ids:
+            self.seed_requests(options["requests"], user_ids, service_ids)
+        if options["fines"] and user_ids:
+            self.seed_fines(options["fines"], user_ids)
+        if options["slots"] and service_ids:
+            self.seed_slots(options["slots"], service_ids)
+        # bulk_create sends no post_save signals.
+        catalog_cache.bump_version()
+
+    def insert(self, label, model, objects, total, keep_ids=True):
+        started = time.perf_counter()
+        ids, done = [], 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                created = model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if keep_ids:
+                ids.extend(obj.pk for obj in created)
+            done += len(batch)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"\r{label}: {done}/{total} ({done / max(elapsed, 1e-9):,.0f} rows/s)", ending="")
+            self.stdout.flush()
+        self.stdout.write("")
+        return ids
+
+    def seed_users(self, count, password):
+        # Hash once: every seeded user shares the same password.
+        encoded = make_password(password)
+        users = (
+            User(username=f"{self.prefix}-user-{i}", email=f"{self.prefix}-user-{i}@example.com", password=encoded)
+            for i in range(count)
+        )
+        return self.insert("users", User, users, count)
+
+    def seed_catalog(self, agencies, services):
+        agency_ids = self.insert(
+            "agencies",
+            GovernmentAgency,
+            (GovernmentAgency(name=f"{self.prefix} Agency {i}", description="Seeded agency") for i in range(agencies)),
+            agencies,
+        )
+        if not agency_ids:
+            return []
+        return self.insert(
+            "services",
+            Service,
+            (
+                Service(
+                    agency_id=self.rng.choice(agency_ids),
+                    name=f"{self.prefix} Service {i}",
+                    description="Seeded service",
+                    fee=Decimal(self.rng.randrange(0, 100000)) / 100,
+                )
+                for i in range(services)
+            ),
+            services,
+        )
+
+    def random_moment(self):
+        return self.now - timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def seed_requests(self, count, user_ids, service_ids):
+        requests = (
+            ServiceRequest(
+                user_id=self.rng.choice(user_ids),
+                service_id=self.rng.choice(service_ids),
+                status=self.rng.choice(REQUEST_STATUSES),
+                created_at=self.random_moment(),
+                payload={"seeded": True},
+            )
+            for _ in range(count)
+        )
+        with explicit_timestamps(ServiceRequest, "created_at"):
+            self.insert("service requests", ServiceRequest, requests, count, keep_ids=False)
+
+    def seed_fines(self, count, user_ids):
+        today = date.today()
+
+        def generate():
+            for i in range(count):
+                issued_at = None if self.rng.random() < 0.1 else today - timedelta(days=self.rng.randrange(self.days))
+                yield TrafficFine(
+                    user_id=self.rng.choice(user_ids),
+                    fine_number=f"{self.prefix}-F-{i}",
+                    amount=Decimal(self.rng.randrange(10000, 300000)) / 100,
+                    violation_type=self.rng.choice(VIOLATIONS),
+                    issued_at=issued_at,
+                    due_date=issued_at and issued_at + timedelta(days=30),
+                    status=TrafficFine.PAID if self.rng.random() < 0.2 else TrafficFine.PENDING,
+                    created_at=self.random_moment(),
+                )
+
+        with explicit_timestamps(TrafficFine, "created_at"):
+            self.insert("traffic fines", TrafficFine, generate(), count, keep_ids=False)
+
+    def seed_slots(self, count, service_ids):
+        start = self.now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+        def generate():
+            for i in range(count):
+                # Consecutive windows per service, so (service, location, start) stays unique.
+                starts_at = start + timedelta(minutes=SLOT_MINUTES * (i // len(service_ids)))
+                capacity = self.rng.randrange(1, 11)
+                yield AppointmentSlot(
+                    service_id=service_ids[i % len(service_ids)],
+                    location=self.rng.choice(LOCATIONS),
+                    starts_at=starts_at,
+                    ends_at=starts_at + timedelta(minutes=SLOT_MINUTES),
+                    capacity=capacity,
+                    booked=self.rng.randrange(0, capacity + 1),
+                )
+
+        self.insert("appointment slots", AppointmentSlot, generate(), count, keep_ids=False)
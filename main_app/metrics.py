@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import threading
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "http_requests_total": ("counter", "Requests served, by route, method and status.", None),
+    "http_request_duration_seconds": (
+        "histogram", "Wall time spent in the view and middleware.",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    "http_request_db_seconds": (
+        "histogram", "Time spent waiting on the database.",
+        (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    ),
+    "http_request_queries": ("histogram", "Database queries per request.", (0, 1, 2, 3, 5, 10, 20, 50, 100)),
+    "http_request_duplicate_queries": (
+        "histogram", "Queries per request repeating an earlier query with the same parameters.", (0, 1, 2, 5, 10, 50),
+    ),
+    "http_response_size_bytes": (
+        "histogram", "Response body size (not recorded for streaming responses).",
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    ),
+}
+
+
+def register(name, kind, help_text, buckets=None):
+    """Declare a metric so other modules can record it."""
+    METRICS.setdefault(name, (kind, help_text, buckets))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Registry:
+    """Process-local metrics and slow-request traces.
+
+    Each worker process keeps its own numbers, so scrape every worker (or put
+    them behind a sticky target per process).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+            self._traces = []
+            self._tiebreak = itertools.count()
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = self._values[key] = Histogram(METRICS[name][2])
+            histogram.observe(value)
+
+    def offer_trace(self, duration, limit, build):
+        """Keep the trace from ``build()`` if ``duration`` is among the ``limit`` slowest seen."""
+        if limit <= 0:
+            return
+        with self._lock:
+            if len(self._traces) >= limit and duration <= self._traces[0][0]:
+                return
+        trace = build()
+        with self._lock:
+            entry = (duration, next(self._tiebreak), trace)
+            if len(self._traces) < limit:
+                heapq.heappush(self._traces, entry)
+            elif duration > self._traces[0][0]:
+                heapq.heapreplace(self._traces, entry)
+
+    def slow_traces(self):
+        with self._lock:
+            return [trace for _, _, trace in sorted(self._traces, reverse=True)]
+
+    def render(self):
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            values = sorted(self._values.items())
+            lines = []
+            for name, group in itertools.groupby(values, key=lambda item: item[0][0]):
+                kind, help_text, _ = METRICS[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (_, labels), value in group:
+                    if kind != "histogram":
+                        lines.append(f"{name}{_labels(labels)} {value}")
+                        continue
+                    for bound, count in zip(value.buckets, value.counts):
+                        lines.append(f"{name}_bucket{_labels(labels, le=bound)} {count}")
+                    lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {value.count}')
+                    lines.append(f"{name}_sum{_labels(labels)} {value.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
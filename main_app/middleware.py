@@ -0,0 +1,226 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics, routers
+from .metrics import registry
+
+metrics.register("http_compressed_responses_total", "counter", "Responses compressed, by Content-Encoding.")
+metrics.register(
+    "http_compression_saved_bytes_total", "counter", "Response bytes saved by compression, by Content-Encoding."
+)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` collecting ``(sql, params, seconds)`` for each query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - started))
+
+    def install(self, stack):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+
+    @property
+    def seconds(self):
+        return sum(seconds for _, _, seconds in self.queries)
+
+    @property
+    def duplicates(self):
+        return len(self.queries) - len({(sql, repr(params)) for sql, params, _ in self.queries})
+
+
+class PerformanceMiddleware:
+    """Record wall time, DB time, query counts and response size for every request.
+
+    Numbers go to ``main_app.metrics.registry`` labelled with the URL name, are
+    echoed in a ``Server-Timing`` header when ``PERF_SERVER_TIMING`` is set, and
+    the ``PERF_SLOW_TRACES`` slowest requests keep their full query list.
+
+    Database numbers are only available on the sync path: async views run their
+    queries on another thread's connection.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            recorder.install(stack)
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, recorder)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, None)
+        return response
+
+    def record(self, request, response, elapsed, recorder):
+        match = request.resolver_match
+        route = match.view_name if match else "<unmatched>"
+        labels = (("route", route), ("method", request.method))
+
+        registry.inc("http_requests_total", (*labels, ("status", response.status_code)))
+        registry.observe("http_request_duration_seconds", labels, elapsed)
+        if not response.streaming:
+            registry.observe("http_response_size_bytes", labels, len(response.content))
+        timing = [f"app;dur={elapsed * 1000:.1f}"]
+        if recorder is not None:
+            db_seconds, duplicates = recorder.seconds, recorder.duplicates
+            registry.observe("http_request_db_seconds", labels, db_seconds)
+            registry.observe("http_request_queries", labels, len(recorder.queries))
+            registry.observe("http_request_duplicate_queries", labels, duplicates)
+            timing.append(
+                f'db;dur={db_seconds * 1000:.1f};desc="{len(recorder.queries)} queries, {duplicates} duplicates"'
+            )
+            registry.offer_trace(
+                elapsed,
+                getattr(settings, "PERF_SLOW_TRACES", 20),
+                lambda: {
+                    "route": route,
+                    "method": request.method,
+                    "path": request.get_full_path(),
+                    "status": response.status_code,
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "db_ms": round(db_seconds * 1000, 3),
+                    "duplicates": duplicates,
+                    "queries": [
+                        {"sql": sql, "ms": round(seconds * 1000, 3)} for sql, _, seconds in recorder.queries
+                    ],
+                },
+            )
+        if getattr(settings, "PERF_SERVER_TIMING", False):
+            response["Server-Timing"] = ", ".join(timing)
+
+
+class ReplicaRoutingMiddleware:
+    """Let views with ``use_read_replica = True`` read from ``DATABASE_REPLICAS``.
+
+    Only GET and HEAD requests qualify, and only while the client (identified by
+    its credentials) is not pinned: a request that writes pins its client to the
+    primary for ``REPLICA_PIN_SECONDS`` so the next reads see the write despite
+    replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+    read_methods = ("GET", "HEAD")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = routers.activate(routers.client_key(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        self.finish(state)
+        return response
+
+    async def __acall__(self, request):
+        state, token = routers.activate(routers.client_key(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        self.finish(state)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = routers._state.get()
+        view_class = getattr(view_func, "view_class", None)
+        if (
+            state is not None
+            and request.method in self.read_methods
+            and getattr(view_class, "use_read_replica", False)
+            and routers.replicas()
+            and not routers.is_pinned(state.client)
+        ):
+            state.replica_allowed = True
+
+    def finish(self, state):
+        if state.wrote and state.client is not None:
+            routers.pin(state.client)
+
+
+class CompressionMiddleware:
+    """Compress response bodies with the best ``Accept-Encoding`` the client and server share.
+
+    gzip is always available; brotli ("br") and zstd are used when their modules
+    are installed. Only non-streaming responses of ``COMPRESSION_MIN_BYTES`` or
+    more with a text-like content type are compressed, and only when that makes
+    them smaller. Strong ETags are weakened, as the bytes no longer match them.
+    """
+
+    sync_capable = True
+    async_capable = True
+    content_types = ("text/", "application/json", "application/javascript", "application/xml")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < getattr(settings, "COMPRESSION_MIN_BYTES", 1024)
+            or not response.get("Content-Type", "").startswith(self.content_types)
+        ):
+            return response
+        # The body depends on Accept-Encoding from here on, even when left as is.
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = compression.negotiate(request.headers.get("Accept-Encoding", ""))
+        if coding is None:
+            return response
+        original = len(response.content)
+        compressed = compression.compress(coding, response.content)
+        if len(compressed) >= original:
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = coding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        labels = (("encoding", coding),)
+        registry.inc("http_compressed_responses_total", labels)
+        registry.inc("http_compression_saved_bytes_total", labels, original - len(compressed))
+        return response
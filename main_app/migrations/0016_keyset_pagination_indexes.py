@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0015_creditcard_delete_bankaccount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='servicerequest_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='trafficfine',
+            index=models.Index(fields=['user', '-issued_at', '-created_at', '-id'], name='trafficfine_user_issued'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0017_alter_servicerequest_service'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creditcard',
+            index=models.Index(fields=['user', 'id'], name='creditcard_user_id'),
+        ),
+        migrations.AddIndex(
+            model_name='trafficfine',
+            index=models.Index(condition=models.Q(('status', 'PAID'), _negated=True), fields=['user', '-issued_at', '-created_at', '-id'], name='trafficfine_user_unpaid'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The keyword checks ServiceRequestList.post used before the rule table existed.
+DEFAULT_RULES = [
+    (20, "UPCOMING", ["Appointment", "Vaccination", "Hospital"]),
+    (10, "APPROVED", ["Fee", "Passport", "License", "National ID"]),
+]
+
+
+def seed_rules(apps, schema_editor):
+    ServiceStatusRule = apps.get_model("main_app", "ServiceStatusRule")
+    ServiceStatusRule.objects.bulk_create(
+        ServiceStatusRule(name_contains=word, initial_status=initial_status, priority=priority)
+        for priority, initial_status, words in DEFAULT_RULES
+        for word in words
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0019_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='servicerequest',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('UPCOMING', 'Upcoming')], default='PENDING', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ServiceStatusRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name_contains', models.CharField(blank=True, max_length=120)),
+                ('initial_status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('UPCOMING', 'Upcoming')], max_length=20)),
+                ('priority', models.IntegerField(default=0)),
+                ('agency', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_rules', to='main_app.governmentagency')),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_rules', to='main_app.service')),
+            ],
+            options={
+                'ordering': ['-priority', 'id'],
+            },
+        ),
+        migrations.RunPython(seed_rules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0021_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=150)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('capacity', models.PositiveIntegerField(default=1)),
+                ('booked', models.PositiveIntegerField(default=0)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='main_app.service')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='appointment',
+            name='slot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='appointments', to='main_app.appointmentslot'),
+        ),
+        migrations.AddIndex(
+            model_name='appointmentslot',
+            index=models.Index(condition=models.Q(('booked__lt', models.F('capacity'))), fields=['service', 'starts_at', 'id'], name='appointmentslot_open'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointmentslot',
+            constraint=models.CheckConstraint(condition=models.Q(('booked__lte', models.F('capacity'))), name='appointmentslot_within_capacity'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointmentslot',
+            constraint=models.CheckConstraint(condition=models.Q(('ends_at__gt', models.F('starts_at'))), name='appointmentslot_ends_after_start'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointmentslot',
+            constraint=models.UniqueConstraint(fields=('service', 'location', 'starts_at'), name='appointmentslot_unique_start'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0023_appointment_user_date_time'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicerequest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['user', 'updated_at'], name='servicerequest_user_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='trafficfine',
+            index=models.Index(condition=models.Q(('status', 'PAID'), _negated=True), fields=['user', 'updated_at'], name='trafficfine_unpaid_updated'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:18
+
+import main_app.payload_keys
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0024_servicerequest_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(main_app.payload_keys.PayloadText('fine_number'), condition=models.Q(('service__isnull', True)), name='sr_fine_payment_fine_number'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0025_servicerequest_payload_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='trafficfine',
+            name='trafficfine_user_issued',
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import F, Q
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .payload_keys import payload_indexes
 
 User = get_user_model()
 
@@ -26,31 +30,124 @@ class ServiceRequest(models.Model):
     PROCESSING = "PROCESSING"
     APPROVED = "APPROVED"
     REJECTED = "REJECTED"
+    UPCOMING = "UPCOMING"
     STATUS_CHOICES = [
         (PENDING, "Pending"),
         (PROCESSING, "Processing"),
         (APPROVED, "Approved"),
         (REJECTED, "Rejected"),
+        (UPCOMING, "Upcoming"),
     ]
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="requests")
+    # Null for ledger entries that record a traffic fine payment.
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="requests", null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Not touched by QuerySet.update(); pass updated_at=timezone.now() there.
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
     payload = models.JSONField(default=dict, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="servicerequest_user_created"),
+            # Covers the COUNT/MAX(updated_at) behind the list's ETag (main_app.conditional).
+            models.Index(fields=["user", "updated_at"], name="servicerequest_user_updated"),
+            # ?payload.<key>= lookups, one per key in payload_keys.INDEXED_PAYLOAD_KEYS.
+            *payload_indexes(),
+        ]
+
     def __str__(self):
+        if self.service_id is None:
+            return f"Request #{self.id} - Traffic fine payment"
         return f"Request #{self.id} - {self.service.name}"
 
 
+class ServiceStatusRule(models.Model):
+    """Initial status for new requests to matching services.
+
+    A rule matches a service when every criterion it sets (service, agency,
+    substring of the service name) holds. The highest-priority match wins and
+    services with no match start as PENDING.
+    """
+
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, null=True, blank=True, related_name="status_rules")
+    agency = models.ForeignKey(
+        GovernmentAgency, on_delete=models.CASCADE, null=True, blank=True, related_name="status_rules"
+    )
+    name_contains = models.CharField(max_length=120, blank=True)
+    initial_status = models.CharField(max_length=20, choices=ServiceRequest.STATUS_CHOICES)
+    priority = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-priority", "id"]
+
+    def __str__(self):
+        if self.service_id or self.agency_id:
+            target = self.service or self.agency
+        else:
+            target = f'name contains "{self.name_contains}"' if self.name_contains else "all services"
+        return f"{target} -> {self.initial_status}"
+
+    def matches(self, service):
+        return (
+            (self.service_id is None or self.service_id == service.pk)
+            and (self.agency_id is None or self.agency_id == service.agency_id)
+            and self.name_contains in service.name
+        )
+
+
+class AppointmentSlot(models.Model):
+    """A bookable window for a service at one location, with room for ``capacity`` appointments."""
+
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="slots")
+    location = models.CharField(max_length=150)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    capacity = models.PositiveIntegerField(default=1)
+    booked = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=Q(booked__lte=F("capacity")), name="appointmentslot_within_capacity"),
+            models.CheckConstraint(condition=Q(ends_at__gt=F("starts_at")), name="appointmentslot_ends_after_start"),
+            models.UniqueConstraint(fields=["service", "location", "starts_at"], name="appointmentslot_unique_start"),
+        ]
+        indexes = [
+            # Availability search: only slots with room are indexed.
+            models.Index(
+                fields=["service", "starts_at", "id"],
+                condition=Q(booked__lt=F("capacity")),
+                name="appointmentslot_open",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.service} @ {self.location} {self.starts_at:%Y-%m-%d %H:%M} ({self.booked}/{self.capacity})"
+
+    @property
+    def available(self):
+        return self.capacity - self.booked
+
+
 class Appointment(models.Model):
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="appointments")
+    # Null for appointments made before slots existed.
+    slot = models.ForeignKey(
+        AppointmentSlot, on_delete=models.PROTECT, null=True, blank=True, related_name="appointments"
+    )
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="appointments")
     date = models.DateField()
     time = models.TimeField()
     location = models.CharField(max_length=150)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Date-range listings, calendar buckets and overlap checks.
+            models.Index(fields=["user", "date", "time"], name="appointment_user_date_time"),
+        ]
+
     def __str__(self):
         return f"{self.service.name} - {self.date} {self.time}"
 
@@ -64,6 +161,12 @@ class CreditCard(models.Model):
     expiration_date = models.CharField(max_length=4)
     security_code = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            # MyBankAccountView reads the user's first card by id.
+            models.Index(fields=["user", "id"], name="creditcard_user_id"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.display_name}"
 
@@ -89,8 +192,79 @@ class TrafficFine(models.Model):
 
     class Meta:
         ordering = ["-issued_at", "-created_at"]
+        indexes = [
+            # Every per-user fines query excludes PAID, so only unpaid rows are indexed;
+            # the user foreign key keeps its own index for deletes.
+            models.Index(
+                fields=["user", "-issued_at", "-created_at", "-id"],
+                condition=~Q(status="PAID"),
+                name="trafficfine_user_unpaid",
+            ),
+            models.Index(
+                fields=["user", "updated_at"], condition=~Q(status="PAID"), name="trafficfine_unpaid_updated"
+            ),
+        ]
         verbose_name = "Traffic Fine"
         verbose_name_plural = "Traffic Fines"
 
     def __str__(self):
         return f"{self.fine_number} — {self.user.username} — {self.amount}"
+
+
+class IdempotencyKey(models.Model):
+    """The stored response for a client-supplied ``Idempotency-Key``."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    # SHA-256 of the request body, so a reused key with a different body is rejected.
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="idempotencykey_user_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.status_code})"
+
+
+class Job(models.Model):
+    """A unit of background work, run by the ``run_worker`` command."""
+
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=60)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="jobs")
+    args = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # Not picked up before this time; pushed back after each failed attempt.
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Workers scan queued jobs in run_at order.
+            models.Index(fields=["run_at", "id"], condition=Q(status="QUEUED"), name="job_queued_run_at"),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.id} {self.kind} ({self.status})"
@@ -0,0 +1,155 @@
+import base64
+import binascii
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination:
+    """Cursor pagination over a fixed, unique ordering such as ``("-created_at", "-id")``.
+
+    Each page is fetched with a ``WHERE (ordering) < (cursor)`` predicate instead of an
+    OFFSET, so with a matching index page N costs the same as page 1. NULL sorts as the
+    largest value (PostgreSQL's default, so plain b-tree indexes match), which lets
+    nullable columns such as ``TrafficFine.issued_at`` take part.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.request = None
+        self.model = None
+        self.limit = self.page_size
+        self.next_position = None
+
+    def _fields(self, model):
+        for name in self.ordering:
+            desc = name.startswith("-")
+            field = model._meta.get_field(name.lstrip("-"))
+            yield field, desc
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            position = json.loads(raw)
+            fields = list(self._fields(model))
+            if not isinstance(position, list) or len(position) != len(fields):
+                raise ValueError
+            return [
+                None if value is None else field.to_python(value)
+                for value, (field, _) in zip(position, fields)
+            ]
+        except (binascii.Error, TypeError, ValueError, DjangoValidationError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+    def order_by(self, model):
+        ordering = []
+        for field, desc in self._fields(model):
+            if not field.null:
+                ordering.append(F(field.name).desc() if desc else F(field.name).asc())
+            elif desc:
+                ordering.append(F(field.name).desc(nulls_first=True))
+            else:
+                ordering.append(F(field.name).asc(nulls_last=True))
+        return ordering
+
+    def after(self, model, position):
+        """Build the predicate selecting rows that sort strictly after ``position``."""
+        conditions = []
+        equal = Q()
+        for (field, desc), value in zip(self._fields(model), position):
+            name = field.name
+            if value is None:
+                # NULL is the largest value: every non-NULL row follows it when
+                # descending, none does when ascending.
+                if desc:
+                    conditions.append(equal & Q(**{f"{name}__isnull": False}))
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+            later = Q(**{f"{name}__lt" if desc else f"{name}__gt": value})
+            if field.null and not desc:
+                later |= Q(**{f"{name}__isnull": True})
+            conditions.append(equal & later)
+            equal &= Q(**{name: value})
+        if not conditions:
+            return Q(pk__in=[])
+        return reduce(operator.or_, conditions)
+
+    def get_page_queryset(self, queryset, request):
+        """Return the lazy queryset for the requested page plus one look-ahead row."""
+        self.request = request
+        self.model = model = queryset.model
+        queryset = queryset.order_by(*self.order_by(model))
+        position = self.decode_cursor(request, model)
+        if position is not None:
+            queryset = queryset.filter(self.after(model, position))
+        self.limit = self.get_page_size(request)
+        return queryset[: self.limit + 1]
+
+    def finish_page(self, rows):
+        """Trim the look-ahead row from ``rows`` and remember where the next page starts.
+
+        Rows are model instances or ``values()`` dicts holding the ordering columns.
+        """
+        rows = list(rows)
+        self.next_position = None
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            last = rows[-1]
+            fields = self._fields(self.model or type(last))
+            if isinstance(last, dict):
+                position = [last[field.attname] for field, _ in fields]
+            else:
+                position = [getattr(last, field.attname) for field, _ in fields]
+            self.next_position = [self._encode_value(value) for value in position]
+        return rows
+
+    def paginate_queryset(self, queryset, request):
+        return self.finish_page(self.get_page_queryset(queryset, request))
+
+    def _encode_value(self, value):
+        if value is None or isinstance(value, (int, str)):
+            return value
+        return value.isoformat()
+
+    def get_next_cursor(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_headers(self):
+        link = self.get_next_link()
+        if link is None:
+            return {}
+        return {"Link": f'<{link}>; rel="next"'}
@@ -0,0 +1,86 @@
+import operator
+import re
+from functools import reduce
+
+from django.db.models import F, Func, Index, Q, TextField
+from rest_framework.exceptions import ValidationError
+
+FINE_PAYMENT = "fine-payment"
+SERVICE = "service"
+
+# ServiceRequest rows of each type. Fine payments are the ledger entries written
+# by main_app.payments, which have no service.
+REQUEST_TYPES = {
+    FINE_PAYMENT: Q(service__isnull=True),
+    SERVICE: Q(service__isnull=False),
+}
+
+# Payload keys that ?payload.<key>= filters on, per request type. Each one is
+# indexed (see payload_indexes()), so adding a key needs a migration. Values are
+# compared as text.
+INDEXED_PAYLOAD_KEYS = {
+    FINE_PAYMENT: ["fine_number"],
+}
+
+PARAM_PREFIX = "payload."
+_KEY = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class PayloadText(Func):
+    """``ServiceRequest.payload[key]`` as text.
+
+    The key is written into the SQL as a literal rather than passed as a
+    parameter (as ``KT()`` does), so that queries repeat the exact expression
+    of the index built on it: ``payload ->> 'key'`` on PostgreSQL,
+    ``JSON_EXTRACT(payload, '$.key')`` on SQLite.
+    """
+
+    output_field = TextField()
+
+    def __init__(self, key, **extra):
+        if not _KEY.fullmatch(key):
+            raise ValueError(f"Invalid payload key: {key!r}")
+        self.key = key
+        super().__init__(F("payload"), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        template = f"JSON_EXTRACT(%(expressions)s, '$.{self.key}')"
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        template = f"(%(expressions)s ->> '{self.key}')"
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+
+def payload_indexes():
+    """One partial expression index per declared (request type, key)."""
+    return [
+        Index(PayloadText(key), condition=REQUEST_TYPES[kind], name=f"sr_{kind.replace('-', '_')}_{key}")
+        for kind, keys in INDEXED_PAYLOAD_KEYS.items()
+        for key in keys
+    ]
+
+
+def payload_filter(key, value):
+    """``Q`` matching requests whose payload ``key`` equals ``value``, or None if ``key`` is not indexed.
+
+    Needs ``PayloadText(key)`` aliased as ``payload_<key>``. The request-type
+    condition is included so the partial index applies.
+    """
+    kinds = [kind for kind, keys in INDEXED_PAYLOAD_KEYS.items() if key in keys]
+    if not kinds:
+        return None
+    return reduce(operator.or_, (REQUEST_TYPES[kind] for kind in kinds)) & Q(**{f"payload_{key}": value})
+
+
+def filter_payload(queryset, params):
+    """Apply the ``payload.<key>=value`` entries of ``params`` to a ServiceRequest queryset."""
+    for param, value in params.items():
+        if not param.startswith(PARAM_PREFIX):
+            continue
+        key = param[len(PARAM_PREFIX):]
+        condition = payload_filter(key, value)
+        if condition is None:
+            raise ValidationError({param: "Not a filterable payload key."})
+        queryset = queryset.alias(**{f"payload_{key}": PayloadText(key)}).filter(condition)
+    return queryset
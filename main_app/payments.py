@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ServiceRequest, TrafficFine
+
+# Rows per INSERT when writing fine payments to the request ledger.
+LEDGER_BATCH_SIZE = 1000
+
+
+def pay_fines(user, fine_ids=None, batch_size=LEDGER_BATCH_SIZE):
+    """Mark the user's unpaid fines (all of them, or only ``fine_ids``) as paid.
+
+    The fines are locked and read once, flipped in a single UPDATE and logged to
+    the user's requests with batched INSERTs, so apart from the INSERT batches the
+    number of queries does not depend on how many fines are paid. Returns the
+    fines that were paid.
+    """
+    with transaction.atomic():
+        fines_qs = TrafficFine.objects.filter(user_id=user.pk).exclude(status=TrafficFine.PAID)
+        if fine_ids is not None:
+            fines_qs = fines_qs.filter(id__in=fine_ids)
+        fines = list(
+            fines_qs.select_for_update().only("id", "fine_number", "amount", "violation_type")
+        )
+        if not fines:
+            return []
+
+        TrafficFine.objects.filter(pk__in=[fine.pk for fine in fines]).update(
+            status=TrafficFine.PAID, updated_at=timezone.now()
+        )
+        ServiceRequest.objects.bulk_create(
+            [
+                ServiceRequest(
+                    user_id=user.pk,
+                    service=None,
+                    payload={
+                        "fine_number": fine.fine_number,
+                        "amount": str(fine.amount),
+                        "violation_type": fine.violation_type,
+                    },
+                    status=ServiceRequest.APPROVED,
+                )
+                for fine in fines
+            ],
+            batch_size=batch_size,
+        )
+    return fines
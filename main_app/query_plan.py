@@ -0,0 +1,81 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from .fast_serializers import compile_plan
+
+
+def _relation_paths(serializer, model, prefix=""):
+    select, prefetch = [], []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        bits = field.source.split(".")
+        current, path, many = model, prefix, False
+        for bit in bits:
+            try:
+                model_field = current._meta.get_field(bit)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            path = f"{path}__{bit}" if path else bit
+            many = many or model_field.many_to_many or model_field.one_to_many
+            current = model_field.related_model
+
+            is_leaf = bit == bits[-1]
+            if is_leaf and isinstance(field, serializers.PrimaryKeyRelatedField) and not many:
+                # Served from the local "<name>_id" column, no join needed.
+                break
+            (prefetch if many else select).append(path)
+
+        if current is model or path == prefix:
+            continue
+
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(child, serializers.BaseSerializer) and len(bits) == 1:
+            nested_select, nested_prefetch = _relation_paths(child, current, path)
+            if many:
+                prefetch.extend(nested_select + nested_prefetch)
+            else:
+                select.extend(nested_select)
+                prefetch.extend(nested_prefetch)
+
+    return select, prefetch
+
+
+@lru_cache(maxsize=None)
+def relations_for(serializer_class, fields=None):
+    """Return the (select_related, prefetch_related) paths a serializer reads.
+
+    ``fields`` is a sparse fieldset spec (main_app.fieldsets); relations it
+    leaves out or collapses to ids are not joined.
+    """
+    model = serializer_class.Meta.model
+    serializer = serializer_class() if fields is None else serializer_class(fields=fields)
+    select, prefetch = _relation_paths(serializer, model)
+    # Only keep the deepest select paths; "a__b" already joins "a".
+    select = [p for p in dict.fromkeys(select) if not any(o.startswith(p + "__") for o in select)]
+    prefetch = list(dict.fromkeys(prefetch))
+    return tuple(select), tuple(prefetch)
+
+
+def plan_queryset(queryset, serializer_class, fields=None):
+    """Attach the joins/prefetches needed to serialize ``queryset`` without N+1 queries.
+
+    With a sparse ``fields`` spec the columns are narrowed with ``only()`` too,
+    so large columns such as ``ServiceRequest.payload`` are not read unless asked for.
+    """
+    select, prefetch = relations_for(serializer_class, fields)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if fields is not None:
+        plan = compile_plan(serializer_class, fields)
+        if plan is not None:
+            queryset = queryset.only(*plan.lookups)
+    return queryset
@@ -0,0 +1,40 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional: without it FastJSONRenderer is plain JSONRenderer
+    orjson = None
+
+# Floats outside [1e-4, 1e16) are written "1e16" by orjson but "1e+16" by the
+# json module; any such digit-e-digit run sends the response down the stdlib path.
+_EXPONENT = re.compile(rb"\d[eE][-+]?\d")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` using orjson when installed, producing the same bytes.
+
+    Falls back to the stdlib encoder for indented, non-compact or ASCII-only
+    output, for values orjson rejects (integers over 64 bits, non-string keys)
+    and whenever the output might contain a float in exponent notation. The
+    one difference left: NaN and infinity render as null instead of raising.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer: U+2028/U+2029 are valid JSON but not valid JavaScript.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -0,0 +1,89 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_DB = "default"
+
+# Per-request routing state, set by ReplicaRoutingMiddleware. Outside a request
+# (commands, workers, the shell) everything goes to the primary.
+_state = ContextVar("replica_routing", default=None)
+
+
+class RoutingState:
+    def __init__(self, client):
+        self.client = client
+        # Set when the view opted in with ``use_read_replica`` and the client is not pinned.
+        self.replica_allowed = False
+        self.wrote = False
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def client_key(request):
+    """Who a pin applies to: the bearer token (or session) the request came with."""
+    credential = request.headers.get("Authorization") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return "replica-pin:" + hashlib.sha256(credential.encode()).hexdigest()[:32]
+
+
+def _pin_cache():
+    return caches[getattr(settings, "REPLICA_PIN_CACHE_ALIAS", "default")]
+
+
+def pin(client):
+    """Send ``client``'s reads to the primary for ``REPLICA_PIN_SECONDS``."""
+    _pin_cache().set(client, 1, getattr(settings, "REPLICA_PIN_SECONDS", 5))
+
+
+def is_pinned(client):
+    return client is not None and _pin_cache().get(client) is not None
+
+
+def activate(client):
+    state = RoutingState(client)
+    return state, _state.set(state)
+
+
+def deactivate(token):
+    _state.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads to a replica only inside requests that allow it; writes always go to the primary.
+
+    A write during the request (any ``db_for_write``) sends the rest of the
+    request's reads to the primary and, through the middleware, pins the
+    client there for a short while so it reads its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_allowed or state.wrote:
+            return None
+        aliases = replicas()
+        return random.choice(aliases) if aliases else None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        databases = {DEFAULT_DB, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        if db in replicas():
+            return False
+        return None
@@ -0,0 +1,198 @@
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.db import transaction
+
+from . import catalog_cache
+from .models import Service
+from .serializers import ServiceSerializer
+
+# Field weights: a hit in the service name outranks one in the agency name,
+# which outranks one in a description.
+WEIGHTS = {"name": 3.0, "agency": 2.0, "description": 1.0, "agency_description": 0.5}
+PREFIX_FACTOR = 0.8
+FUZZY_FACTOR = 0.6
+# Minimum trigram (Jaccard) similarity for a fuzzy token match.
+FUZZY_THRESHOLD = 0.35
+MIN_PREFIX_LENGTH = 2
+
+_ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ARABIC_LETTERS = str.maketrans({
+    "\u0623": "\u0627", "\u0625": "\u0627", "\u0622": "\u0627", "\u0671": "\u0627",  # hamza/madda alef forms -> alef
+    "\u0649": "\u064a",  # alef maksura -> yeh
+    "\u0629": "\u0647",  # teh marbuta -> heh
+    "\u0624": "\u0648", "\u0626": "\u064a",  # hamza on waw/yeh
+})
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Case-fold and strip Arabic diacritics, tatweel and letter variants."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _ARABIC_MARKS.sub("", text).translate(_ARABIC_LETTERS)
+
+
+def tokenize(text):
+    return _TOKEN.findall(normalize(text))
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over services (and their agencies) with trigram fuzzy matching."""
+
+    def __init__(self):
+        self.version = None
+        self.docs = {}  # service id -> serialized service
+        self.doc_tokens = {}  # service id -> {token: weight}
+        self.postings = defaultdict(dict)  # token -> {service id: weight}
+        self.trigram_tokens = defaultdict(set)  # trigram -> tokens
+        self.vocabulary = []  # sorted tokens, for prefix lookups
+
+    def add(self, service):
+        self.remove(service.pk)
+        weights = defaultdict(float)
+        fields = {
+            "name": service.name,
+            "description": service.description,
+            "agency": service.agency.name,
+            "agency_description": service.agency.description,
+        }
+        for field, text in fields.items():
+            for token in tokenize(text):
+                weights[token] = max(weights[token], WEIGHTS[field])
+        for token, weight in weights.items():
+            if token not in self.postings:
+                bisect.insort(self.vocabulary, token)
+                for gram in trigrams(token):
+                    self.trigram_tokens[gram].add(token)
+            self.postings[token][service.pk] = weight
+        self.doc_tokens[service.pk] = dict(weights)
+        self.docs[service.pk] = dict(ServiceSerializer(service).data)
+
+    def remove(self, service_id):
+        for token in self.doc_tokens.pop(service_id, {}):
+            docs = self.postings[token]
+            docs.pop(service_id, None)
+            if not docs:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+                for gram in trigrams(token):
+                    self.trigram_tokens[gram].discard(token)
+        self.docs.pop(service_id, None)
+
+    def expand(self, token):
+        """Index tokens matching ``token``, with a factor for how closely they match."""
+        matches = {}
+        if token in self.postings:
+            matches[token] = 1.0
+        if len(token) >= MIN_PREFIX_LENGTH:
+            start = bisect.bisect_left(self.vocabulary, token)
+            for candidate in self.vocabulary[start:]:
+                if not candidate.startswith(token):
+                    break
+                matches.setdefault(candidate, PREFIX_FACTOR)
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in self.trigram_tokens.get(gram, ()):
+                shared[candidate] += 1
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + len(trigrams(candidate)) - count)
+            if similarity >= FUZZY_THRESHOLD:
+                matches.setdefault(candidate, FUZZY_FACTOR * similarity)
+        return matches
+
+    def search(self, query, limit=20):
+        """Return ``(score, serialized service)`` pairs, best first.
+
+        Services matching more of the query's words rank first; within that,
+        by the summed field weight of the matches.
+        """
+        scores = defaultdict(float)
+        matched_terms = defaultdict(int)
+        for token in dict.fromkeys(tokenize(query)):
+            best = {}
+            for candidate, factor in self.expand(token).items():
+                for service_id, weight in self.postings[candidate].items():
+                    best[service_id] = max(best.get(service_id, 0), weight * factor)
+            for service_id, score in best.items():
+                scores[service_id] += score
+                matched_terms[service_id] += 1
+        ranked = heapq.nsmallest(limit, scores, key=lambda pk: (-matched_terms[pk], -scores[pk], pk))
+        return [(round(scores[pk], 4), self.docs[pk]) for pk in ranked]
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def _build(version):
+    index = SearchIndex()
+    index.version = version
+    for service in Service.objects.select_related("agency").order_by("id"):
+        index.add(service)
+    return index
+
+
+def get_index():
+    """The process's index, rebuilt when the catalog version moved without us.
+
+    Changes saved in this process are applied incrementally once their
+    transaction commits; a version bump from elsewhere (another worker, bulk_create) makes
+    the next search rebuild from the database.
+    """
+    global _index
+    version = catalog_cache.current_version()
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = _build(version)
+        return _index
+
+
+def search(query, limit=20):
+    index = get_index()
+    with _lock:
+        return index.search(query, limit)
+
+
+def _apply(change):
+    with _lock:
+        if _index is None:
+            return
+        change(_index)
+        # The signal handler just bumped the version for this change. If the
+        # index was already behind (another process changed the catalog), leave
+        # it stale so the next search rebuilds it.
+        version = catalog_cache.current_version()
+        if isinstance(_index.version, int) and version == _index.version + 1:
+            _index.version = version
+
+
+def service_saved(service):
+    transaction.on_commit(lambda: _apply(lambda index: index.add(service)))
+
+
+def service_deleted(service_id):
+    transaction.on_commit(lambda: _apply(lambda index: index.remove(service_id)))
+
+
+def agency_saved(agency):
+    def reindex(index):
+        for service in Service.objects.filter(agency=agency).select_related("agency"):
+            index.add(service)
+
+    transaction.on_commit(lambda: _apply(reindex))
+
+
+def clear():
+    global _index
+    with _lock:
+        _index = None
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import GovernmentAgency, Service, ServiceRequest, Appointment, TrafficFine, CreditCard
+from .fast_serializers import FastListSerializer
+from .fieldsets import SparseFieldsMixin
+from .models import GovernmentAgency, Service, ServiceRequest, Appointment, AppointmentSlot, TrafficFine, CreditCard, Job
 
 class CreditCardSerializer(serializers.ModelSerializer):
     # this will allow us to include the photo in the cat without having to query for it! Neat!
@@ -11,24 +13,27 @@ class CreditCardSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class GovernmentAgencySerializer(serializers.ModelSerializer):
+class GovernmentAgencySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = GovernmentAgency
         fields = ["id", "name", "description"]
+        list_serializer_class = FastListSerializer
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     agency = GovernmentAgencySerializer(read_only=True)
 
     class Meta:
         model = Service
         fields = ["id", "name", "description", "fee", "agency"]
+        list_serializer_class = FastListSerializer
 
 
-class ServiceRequestSerializer(serializers.ModelSerializer):
+class ServiceRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     service = ServiceSerializer(read_only=True)
+    # Fetch the agency with the service so the nested output needs no extra query.
     service_id = serializers.PrimaryKeyRelatedField(
-        queryset=Service.objects.all(), source="service", write_only=True
+        queryset=Service.objects.select_related("agency"), source="service", write_only=True
     )
 
     class Meta:
@@ -42,6 +47,17 @@ class ServiceRequestSerializer(serializers.ModelSerializer):
             "service_id",
             "user",
         ]
+        # Set from the authenticated user by the views; validating it would load the row.
+        read_only_fields = ["user"]
+        list_serializer_class = FastListSerializer
+
+
+class AppointmentSlotSerializer(serializers.ModelSerializer):
+    available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = AppointmentSlot
+        fields = ["id", "service", "location", "starts_at", "ends_at", "capacity", "available"]
 
 
 class AppointmentSerializer(serializers.ModelSerializer):
@@ -60,8 +76,12 @@ class AppointmentSerializer(serializers.ModelSerializer):
             "created_at",
             "service",
             "service_id",
+            "slot",
             "user",
         ]
+        # The user comes from the token (no row load); slots are booked through slot-book.
+        read_only_fields = ["slot", "user"]
+        list_serializer_class = FastListSerializer
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -80,7 +100,14 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class TrafficFineSerializer(serializers.ModelSerializer):
+class TrafficFineSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TrafficFine
         fields = ["id", "fine_number", "amount", "violation_type", "issued_at", "due_date", "status", "notes"]
+        list_serializer_class = FastListSerializer
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ["id", "kind", "status", "attempts", "result", "created_at", "updated_at"]
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import authentication, catalog_cache, search
+from .models import GovernmentAgency, Service, ServiceStatusRule
+
+
+@receiver(post_save, sender=GovernmentAgency)
+@receiver(post_delete, sender=GovernmentAgency)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=ServiceStatusRule)
+@receiver(post_delete, sender=ServiceStatusRule)
+def invalidate_catalog(sender, using, **kwargs):
+    # Bumped once the write commits: a bump inside the writer's transaction would
+    # let a concurrent request render the old rows and cache them as the new version.
+    transaction.on_commit(catalog_cache.bump_version, using=using)
+
+
+# Connected after invalidate_catalog, so on commit the version is bumped first.
+@receiver(post_save, sender=Service)
+def index_service(sender, instance, **kwargs):
+    search.service_saved(instance)
+
+
+@receiver(post_delete, sender=Service)
+def unindex_service(sender, instance, **kwargs):
+    search.service_deleted(instance.pk)
+
+
+@receiver(post_save, sender=GovernmentAgency)
+def reindex_agency(sender, instance, **kwargs):
+    search.agency_saved(instance)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    authentication.forget_user(instance.pk)
@@ -0,0 +1,54 @@
+import threading
+
+from . import catalog_cache
+from .models import Service, ServiceRequest, ServiceStatusRule
+
+DEFAULT_STATUS = ServiceRequest.PENDING
+
+# Service id -> initial status, compiled from the rule table for one catalog
+# version. Rule and service changes bump the catalog version (see signals.py).
+_lock = threading.Lock()
+_compiled = None
+
+
+class _Policy:
+    def __init__(self, version):
+        self.version = version
+        self.rules = list(ServiceStatusRule.objects.order_by("-priority", "id"))
+        self.by_service = {
+            service.pk: self.resolve(service)
+            for service in Service.objects.only("id", "name", "agency_id")
+        }
+
+    def resolve(self, service):
+        for rule in self.rules:
+            if rule.matches(service):
+                return rule.initial_status
+        return DEFAULT_STATUS
+
+
+def _policy():
+    global _compiled
+    version = catalog_cache.current_version()
+    policy = _compiled
+    if policy is None or policy.version != version:
+        policy = _Policy(version)
+        with _lock:
+            _compiled = policy
+    return policy
+
+
+def initial_status(service):
+    """Status a new request to ``service`` starts in."""
+    policy = _policy()
+    status = policy.by_service.get(service.pk)
+    if status is None:
+        # Created since the table was compiled without a version bump (bulk_create).
+        status = policy.resolve(service)
+    return status
+
+
+def clear():
+    global _compiled
+    with _lock:
+        _compiled = None
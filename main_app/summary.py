@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Appointment, CreditCard, ServiceRequest, TrafficFine
+from .query_plan import plan_queryset
+from .serializers import AppointmentSerializer
+
+
+def request_counts(user_id):
+    """Request counts per status, zeros included, in one pass over the user's rows."""
+    counts = ServiceRequest.objects.filter(user_id=user_id).aggregate(
+        total=Count("id"),
+        **{value: Count("id", filter=Q(status=value)) for value, _ in ServiceRequest.STATUS_CHOICES},
+    )
+    total = counts.pop("total")
+    return {"total": total, "by_status": counts}
+
+
+def unpaid_fines(user_id):
+    # Served by the partial trafficfine_user_unpaid index.
+    totals = TrafficFine.objects.filter(user_id=user_id).exclude(status=TrafficFine.PAID).aggregate(
+        count=Count("id"), total=Sum("amount")
+    )
+    return {"count": totals["count"], "total": totals["total"] or Decimal("0.00")}
+
+
+def next_appointment(user_id):
+    now = timezone.localtime()
+    upcoming = Appointment.objects.filter(user_id=user_id).filter(
+        Q(date__gt=now.date()) | Q(date=now.date(), time__gte=now.time())
+    )
+    appointment = plan_queryset(upcoming, AppointmentSerializer).order_by("date", "time", "id").first()
+    return AppointmentSerializer(appointment).data if appointment else None
+
+
+def user_summary(user_id):
+    """Everything the home screen shows, in four indexed queries whatever the history size."""
+    return {
+        "requests": request_counts(user_id),
+        "unpaid_fines": unpaid_fines(user_id),
+        "next_appointment": next_appointment(user_id),
+        "has_card": CreditCard.objects.filter(user_id=user_id).exists(),
+    }
@@ -0,0 +1,20 @@
+from django.utils import timezone
+
+from . import jobs
+from .models import ServiceRequest
+from .payments import pay_fines
+
+
+@jobs.handler("pay_fines")
+def pay_fines_job(job):
+    paid = pay_fines(job.user, fine_ids=job.args.get("fine_ids"))
+    return {"paid": [fine.id for fine in paid]}
+
+
+@jobs.handler("pay_service_request")
+def pay_service_request_job(job):
+    # PayServiceRequestView moved the request to PROCESSING when it queued this job.
+    updated = ServiceRequest.objects.filter(
+        pk=job.args["service_request_id"], user_id=job.user_id, status=ServiceRequest.PROCESSING
+    ).update(status=ServiceRequest.APPROVED, updated_at=timezone.now())
+    return {"approved": bool(updated)}
@@ -0,0 +1,24 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountAssertionsMixin:
+    """Assertions for catching N+1 queries in endpoint tests."""
+
+    def count_queries(self, func):
+        with CaptureQueriesContext(connection) as ctx:
+            response = func()
+        return len(ctx.captured_queries), response
+
+    def assertQueryCountIndependentOfRows(self, func, add_rows, grow_by=10):
+        """Call ``func`` before and after ``add_rows(grow_by)`` and fail if the
+        number of queries it issues changed."""
+        before, response = self.count_queries(func)
+        self.assertLess(response.status_code, 400, getattr(response, "data", None))
+        add_rows(grow_by)
+        after, response = self.count_queries(func)
+        self.assertLess(response.status_code, 400, getattr(response, "data", None))
+        self.assertEqual(
+            before, after,
+            f"Query count grew from {before} to {after} after adding {grow_by} rows",
+        )
@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main_app import catalog_cache
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+
+User = get_user_model()
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass123')
+        cls.other = User.objects.create_user(username='otheruser', password='testpass123')
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        cls.service = Service.objects.create(agency=agency, name='Passport Renewal', fee=300)
+        for owner in (cls.user, cls.user, cls.user, cls.other):
+            ServiceRequest.objects.create(user=owner, service=cls.service)
+        for i in range(3):
+            TrafficFine.objects.create(user=cls.user, fine_number=f'F-{i}', amount=Decimal('100.00'))
+        cls.headers = {'Authorization': f'Bearer {RefreshToken.for_user(cls.user).access_token}'}
+
+    def setUp(self):
+        catalog_cache.clear()
+
+    async def get_both(self, name, query='', **kwargs):
+        sync = await self.async_client.get(reverse(name, kwargs=kwargs) + query, headers=self.headers)
+        async_ = await self.async_client.get(reverse(f'async-{name}', kwargs=kwargs) + query, headers=self.headers)
+        return sync, async_
+
+    async def test_catalog_routes_match_sync_views(self):
+        for name, kwargs in [('agency-list', {}), ('service-list', {}), ('service-detail', {'pk': self.service.pk})]:
+            with self.subTest(name=name):
+                sync, async_ = await self.get_both(name, **kwargs)
+                self.assertEqual(async_.status_code, status.HTTP_200_OK)
+                self.assertEqual(async_.content, sync.content)
+                self.assertEqual(async_['ETag'], sync['ETag'])
+
+    async def test_missing_service_is_404(self):
+        response = await self.async_client.get(
+            reverse('async-service-detail', args=[self.service.pk + 100]), headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_paginated_routes_match_sync_views(self):
+        for name in ['service-request-list', 'my-fines']:
+            with self.subTest(name=name):
+                sync, async_ = await self.get_both(name, query='?page_size=2')
+                self.assertEqual(async_.status_code, status.HTTP_200_OK)
+                # Identical apart from the /async prefix in the next-page links.
+                self.assertEqual(async_.content.replace(b'/async/', b'/'), sync.content)
+                self.assertEqual(async_['Link'].replace('/async/', '/'), sync['Link'])
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(reverse('async-my-fines'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(
+            reverse('async-my-fines'), headers={'Authorization': 'Bearer not-a-token'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
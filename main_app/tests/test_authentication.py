@@ -3,10 +3,13 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
 
+from main_app import throttling
+
 User = get_user_model()
 
 class AuthenticationTests(APITestCase):
     def setUp(self):
+        throttling.get_store().clear()
         self.client = APIClient()
         self.test_user = User.objects.create_user(
             username='testuser',
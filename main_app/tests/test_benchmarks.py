@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from main_app import benchmarking, booking, jobs
+from main_app.models import AppointmentSlot, GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.urls import urlpatterns
+
+User = get_user_model()
+
+
+class SeedAndBenchmarkCommandTests(TestCase):
+    def seed(self):
+        call_command(
+            'seed_data', users=3, agencies=2, services=4, requests=30, fines=10, slots=12,
+            batch_size=7, prefix='t', seed=1, stdout=StringIO(),
+        )
+
+    def test_seed_data_creates_requested_volumes(self):
+        self.seed()
+        self.assertEqual(User.objects.filter(username__startswith='t-user-').count(), 3)
+        self.assertEqual(GovernmentAgency.objects.count(), 2)
+        self.assertEqual(Service.objects.count(), 4)
+        self.assertEqual(ServiceRequest.objects.count(), 30)
+        self.assertEqual(TrafficFine.objects.count(), 10)
+        self.assertEqual(AppointmentSlot.objects.count(), 12)
+        # Timestamps are spread out rather than all set to "now".
+        self.assertGreater(ServiceRequest.objects.values('created_at').distinct().count(), 1)
+        self.assertTrue(User.objects.get(username='t-user-0').check_password('seedpass123'))
+
+    def test_benchmark_routes_reports_every_route(self):
+        self.seed()
+        user = benchmarking.pick_user()
+        jobs.enqueue('pay_fines', user=user)  # for the job status route
+        booking.book(user, AppointmentSlot.objects.order_by('starts_at').first().pk)  # for the appointment route
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'report.json')
+            call_command('benchmark_routes', iterations=2, output=output, stdout=StringIO(), stderr=StringIO())
+            with open(output) as fh:
+                report = json.load(fh)
+        self.assertEqual(set(report['routes']), {p.name for p in urlpatterns})
+        for name, result in report['routes'].items():
+            with self.subTest(route=name):
+                self.assertEqual(result['samples'], 2)
+                self.assertIsNotNone(result['queries'])
+                self.assertGreater(result['bytes'], 0)
+        self.assertEqual(report['routes']['service-request-list']['status'], 200)
+        # Writes are rolled back.
+        self.assertEqual(ServiceRequest.objects.count(), 30)
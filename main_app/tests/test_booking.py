@@ -0,0 +1,196 @@
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import booking
+from main_app.models import Appointment, AppointmentSlot, GovernmentAgency, Service
+
+User = get_user_model()
+
+
+class AppointmentSlotTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name='Ministry of Health')
+        self.service = Service.objects.create(agency=agency, name='Vaccination', fee=0)
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def add_slot(self, hours=0, capacity=2, booked=0, location='Riyadh'):
+        starts_at = self.start + timedelta(hours=hours)
+        return AppointmentSlot.objects.create(
+            service=self.service, location=location, starts_at=starts_at,
+            ends_at=starts_at + timedelta(minutes=30), capacity=capacity, booked=booked,
+        )
+
+    def test_availability_skips_full_and_past_slots(self):
+        self.add_slot(hours=-48)
+        full = self.add_slot(hours=1, capacity=1, booked=1)
+        later = self.add_slot(hours=3)
+        sooner = self.add_slot(hours=2, capacity=5, booked=4)
+        response = self.client.get(reverse('service-slots', args=[self.service.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([slot['id'] for slot in response.data], [sooner.id, later.id])
+        self.assertEqual(response.data[0]['available'], 1)
+        self.assertNotIn(full.id, [slot['id'] for slot in response.data])
+
+        response = self.client.get(reverse('service-slots', args=[self.service.pk]), {'limit': 1})
+        self.assertEqual([slot['id'] for slot in response.data], [sooner.id])
+
+    def test_booking_takes_a_place_with_a_conditional_update(self):
+        slot = self.add_slot(capacity=1)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('slot-book', args=[slot.pk]))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['slot'], slot.pk)
+        self.assertEqual(response.data['service']['name'], 'Vaccination')
+        update = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE'))
+        self.assertIn('"booked" < ', update)
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 1)
+
+        response = self.client.post(reverse('slot-book', args=[slot.pk]))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_started_slots_cannot_be_booked(self):
+        slot = self.add_slot(hours=-25)
+        response = self.client.post(reverse('slot-book', args=[slot.pk]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 0)
+        self.assertFalse(Appointment.objects.exists())
+
+    def test_invalid_after_is_400(self):
+        for value in ('tomorrow', '2025-13-01T00:00'):
+            with self.subTest(value=value):
+                response = self.client.get(reverse('service-slots', args=[self.service.pk]), {'after': value})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('after', response.data)
+
+    def test_unknown_slot_is_404(self):
+        response = self.client.post(reverse('slot-book', args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_returns_the_place(self):
+        slot = self.add_slot(capacity=1)
+        appointment = booking.book(self.user, slot.pk)
+        self.assertTrue(booking.cancel(appointment))
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 0)
+        self.assertFalse(booking.cancel(appointment))
+
+    def test_capacity_is_enforced_by_the_database(self):
+        with self.assertRaises(IntegrityError):
+            self.add_slot(capacity=1, booked=2)
+
+
+class AppointmentApiTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name='Ministry of Health')
+        self.service = Service.objects.create(agency=agency, name='Vaccination', fee=0)
+        self.day = timezone.localdate() + timedelta(days=7)
+
+    def add(self, days=0, at='09:00', user=None):
+        return Appointment.objects.create(
+            user=user or self.user, service=self.service, location='Riyadh',
+            date=self.day + timedelta(days=days), time=at,
+        )
+
+    def create(self, date, at):
+        return self.client.post(reverse('appointment-list'), {
+            'service_id': self.service.pk, 'date': date.isoformat(), 'time': at, 'location': 'Riyadh',
+        }, format='json')
+
+    def test_list_filters_by_date_range_in_calendar_order(self):
+        late, early, outside = self.add(days=1, at='08:00'), self.add(days=0, at='10:00'), self.add(days=5)
+        self.add(user=User.objects.create_user(username='other'))
+
+        response = self.client.get(reverse('appointment-list'), {
+            'from': self.day.isoformat(), 'to': (self.day + timedelta(days=1)).isoformat(),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([a['id'] for a in response.data], [early.id, late.id])
+        self.assertNotIn(outside.id, [a['id'] for a in response.data])
+        self.assertEqual(self.client.get(reverse('appointment-list'), {'from': 'soon'}).status_code, 400)
+
+    def test_create_rejects_overlaps_in_sql(self):
+        existing = self.add(at='09:00')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.create(self.day, '09:20')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['conflict'], existing.id)
+        check = next(q['sql'] for q in ctx.captured_queries if '"main_app_appointment"' in q['sql'])
+        self.assertIn('LIMIT 1', check)
+
+        self.assertEqual(self.create(self.day, '09:30').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.create(self.day - timedelta(days=1), '23:45').status_code, status.HTTP_201_CREATED)
+        # 23:45 the day before overlaps 00:10.
+        self.assertEqual(self.create(self.day, '00:10').status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.create(timezone.localdate() - timedelta(days=1), '09:00').status_code, 400)
+
+    def test_slot_booking_checks_overlaps(self):
+        starts_at = timezone.make_aware(datetime.combine(self.day, time(9)))
+        slot = AppointmentSlot.objects.create(
+            service=self.service, location='Riyadh', starts_at=starts_at,
+            ends_at=starts_at + timedelta(minutes=30), capacity=2,
+        )
+        self.add(at='09:15')
+
+        response = self.client.post(reverse('slot-book', args=[slot.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 0)
+
+    def test_cancel_frees_the_slot(self):
+        starts_at = timezone.make_aware(datetime.combine(self.day, time(9)))
+        slot = AppointmentSlot.objects.create(
+            service=self.service, location='Riyadh', starts_at=starts_at,
+            ends_at=starts_at + timedelta(minutes=30), capacity=1,
+        )
+        appointment = booking.book(self.user, slot.pk)
+        other = self.add(user=User.objects.create_user(username='other'))
+
+        self.assertEqual(self.client.delete(reverse('appointment-detail', args=[other.pk])).status_code, 404)
+        response = self.client.delete(reverse('appointment-detail', args=[appointment.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Appointment.objects.filter(pk=appointment.pk).exists())
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 0)
+
+    def test_calendar_buckets_in_one_query(self):
+        first = date(2031, 1, 6)  # a Monday
+        for days in (0, 1, 8, 31):
+            Appointment.objects.create(
+                user=self.user, service=self.service, location='Riyadh', date=first + timedelta(days=days), time='09:00',
+            )
+        params = {'from': '2031-01-01', 'to': '2031-03-01'}
+
+        with self.assertNumQueries(1):
+            weeks = self.client.get(reverse('appointment-calendar'), {**params, 'period': 'week'})
+        months = self.client.get(reverse('appointment-calendar'), params)
+
+        self.assertEqual(
+            [(b['start'], b['count']) for b in weeks.data['buckets']],
+            [(date(2031, 1, 6), 2), (date(2031, 1, 13), 1), (date(2031, 2, 3), 1)],
+        )
+        self.assertEqual(
+            [(b['start'], b['count']) for b in months.data['buckets']],
+            [(date(2031, 1, 1), 3), (date(2031, 2, 1), 1)],
+        )
+        self.assertEqual(
+            self.client.get(reverse('appointment-calendar'), {'from': '2031-01-01', 'to': '2033-01-01'}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
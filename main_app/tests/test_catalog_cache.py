@@ -0,0 +1,80 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import catalog_cache
+from main_app.models import GovernmentAgency, Service
+
+User = get_user_model()
+
+
+class CatalogCacheTests(APITestCase):
+    def setUp(self):
+        catalog_cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.agency = GovernmentAgency.objects.create(name='Ministry of Health')
+        self.service = Service.objects.create(agency=self.agency, name='Vaccination', fee=0)
+
+    def test_repeat_requests_are_served_without_queries(self):
+        first = self.client.get(reverse('service-list'))
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(reverse('service-list'))
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(json.loads(second.content)[0]['agency']['name'], 'Ministry of Health')
+
+    def test_if_none_match_returns_304(self):
+        for url in [reverse('agency-list'), reverse('service-list'),
+                    reverse('service-detail', args=[self.service.pk])]:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_saving_catalog_models_invalidates(self):
+        etag = self.client.get(reverse('service-list'))['ETag']
+        self.agency.name = 'Ministry of Health Services'
+        version = catalog_cache.current_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.agency.save()
+            # Not until the write commits.
+            self.assertEqual(catalog_cache.current_version(), version)
+        response = self.client.get(reverse('service-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)[0]['agency']['name'], 'Ministry of Health Services')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.delete()
+        response = self.client.get(reverse('service-list'))
+        self.assertEqual(json.loads(response.content), [])
+
+    def test_missing_service_is_404(self):
+        response = self.client.get(reverse('service-detail', args=[self.service.pk + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(
+        CATALOG_CACHE_ALIAS='catalog',
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'catalog': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'catalog'},
+        },
+    )
+    def test_shared_cache_backend(self):
+        catalog_cache.clear()
+        first = self.client.get(reverse('agency-list'))
+        version = catalog_cache.current_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(agency=self.agency, name='Hospital Registration', fee=250)
+        self.assertNotEqual(catalog_cache.current_version(), version)
+        response = self.client.get(reverse('agency-list'), HTTP_IF_NONE_MATCH=first['ETag'])
+        # The agency list is re-rendered for the new version but its bytes are unchanged.
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
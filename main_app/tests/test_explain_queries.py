@@ -0,0 +1,27 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from main_app.management.commands.explain_queries import Command
+from main_app.models import ServiceRequest
+
+User = get_user_model()
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def test_per_user_queries_use_indexes(self):
+        User.objects.create_user(username='testuser', password='testpass123')
+        out = StringIO()
+        call_command('explain_queries', '--strict', user='testuser', stdout=out)
+        output = out.getvalue()
+        for name in ['service-request-list', 'my-fines', 'my-bank-account']:
+            self.assertIn(name, output)
+        self.assertNotIn('FULL SCAN', output)
+
+    def test_default_user_has_the_most_requests(self):
+        busy = User.objects.create_user(username='busy', password='testpass123')
+        ServiceRequest.objects.create(user=busy)
+        User.objects.create_user(username='newest', password='testpass123')
+        self.assertEqual(Command().get_user(None), busy)
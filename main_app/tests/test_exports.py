@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+
+User = get_user_model()
+
+
+class HistoryExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        service = Service.objects.create(agency=agency, name='Passport Renewal', fee=300)
+        self.requests = [
+            ServiceRequest.objects.create(user=self.user, service=service, payload={'city': 'الرياض'}),
+            ServiceRequest.objects.create(user=self.user, service=None, payload={'fine_number': 'F-1'}),
+        ]
+        other = User.objects.create_user(username='other', password='testpass123')
+        ServiceRequest.objects.create(user=other, service=service)
+        TrafficFine.objects.create(user=self.user, fine_number='F-1', amount=Decimal('150.00'), status=TrafficFine.PAID)
+        TrafficFine.objects.create(user=other, fine_number='F-2', amount=Decimal('90.00'))
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_only_own_rows(self):
+        response = self.client.get(reverse('history-export', args=['service-requests']))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual({row['id'] for row in rows}, {r.id for r in self.requests})
+        by_id = {row['id']: row for row in rows}
+        self.assertEqual(by_id[self.requests[0].id]['agency_name'], 'Ministry of Interior')
+        self.assertEqual(by_id[self.requests[0].id]['payload'], {'city': 'الرياض'})
+        self.assertIsNone(by_id[self.requests[1].id]['service_name'])
+
+    def test_csv_export_includes_paid_fines(self):
+        response = self.client.get(
+            reverse('history-export', args=['traffic-fines']), {'output': 'csv'}
+        )
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="traffic-fines.csv"', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['fine_number'], 'F-1')
+        self.assertEqual(rows[0]['amount'], '150.00')
+        self.assertEqual(rows[0]['status'], 'PAID')
+
+    def test_unknown_kind_and_output(self):
+        response = self.client.get(reverse('history-export', args=['appointments']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('history-export', args=['traffic-fines']), {'output': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
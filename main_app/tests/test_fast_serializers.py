@@ -0,0 +1,115 @@
+from datetime import date, time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from main_app.fast_serializers import compile_plan
+from main_app.models import Appointment, GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.renderers import FastJSONRenderer
+from main_app.serializers import (
+    AppointmentSerializer,
+    AppointmentSlotSerializer,
+    GovernmentAgencySerializer,
+    ServiceRequestSerializer,
+    ServiceSerializer,
+    TrafficFineSerializer,
+)
+
+User = get_user_model()
+
+
+def drf_bytes(queryset, serializer_class):
+    data = serializers.ListSerializer(list(queryset), child=serializer_class()).data
+    return JSONRenderer().render(data)
+
+
+def fast_bytes(queryset, serializer_class):
+    return FastJSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+class FastSerializerTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="testuser", password="testpass123")
+        agency = GovernmentAgency.objects.create(name="وزارة الداخلية", description="line\u2028break")
+        service = Service.objects.create(agency=agency, name="Passport Renewal", fee=Decimal("300.5"))
+        ServiceRequest.objects.create(
+            user=cls.user, service=service, payload={"name": "محمد", "copies": 2, "ratio": 0.5, "nested": [None]}
+        )
+        ServiceRequest.objects.create(user=cls.user, service=service, status="APPROVED")
+        TrafficFine.objects.create(user=cls.user, fine_number="F-1", amount=Decimal("150"), issued_at=date(2025, 1, 2))
+        TrafficFine.objects.create(user=cls.user, fine_number="F-2", amount=Decimal("0.01"), notes="\"quoted\"\n")
+        Appointment.objects.create(user=cls.user, service=service, date=date(2030, 5, 1), time=time(9, 30))
+        Appointment.objects.create(user=cls.user, service=service, date=date(2030, 5, 2), time=time(10, 0))
+
+    def assertSameBytes(self, queryset, serializer_class):
+        expected = drf_bytes(queryset, serializer_class)
+        self.assertEqual(fast_bytes(queryset, serializer_class), expected)
+        return expected
+
+    def test_list_serializers_compile(self):
+        for serializer_class in (
+            GovernmentAgencySerializer, ServiceSerializer, ServiceRequestSerializer,
+            AppointmentSerializer, TrafficFineSerializer,
+        ):
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertIsNotNone(compile_plan(serializer_class))
+        # "available" is an annotation, not a model field.
+        self.assertIsNone(compile_plan(AppointmentSlotSerializer))
+
+    def test_output_matches_drf_byte_for_byte(self):
+        cases = [
+            (GovernmentAgency.objects.order_by("id"), GovernmentAgencySerializer),
+            (Service.objects.order_by("id"), ServiceSerializer),
+            (ServiceRequest.objects.order_by("id"), ServiceRequestSerializer),
+            (TrafficFine.objects.order_by("id"), TrafficFineSerializer),
+            (Appointment.objects.order_by("id"), AppointmentSerializer),  # NULL slots
+        ]
+        for queryset, serializer_class in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertSameBytes(queryset, serializer_class)
+
+    def test_datetimes_use_the_active_timezone(self):
+        with timezone.override("Asia/Riyadh"):
+            output = self.assertSameBytes(ServiceRequest.objects.all(), ServiceRequestSerializer)
+        self.assertIn(b"+03:00", output)
+
+    def test_instances_still_go_through_drf(self):
+        fines = list(TrafficFine.objects.order_by("id"))
+        data = TrafficFineSerializer(fines, many=True).data
+        self.assertEqual(data, serializers.ListSerializer(fines, child=TrafficFineSerializer()).data)
+        self.assertEqual(data[0]["amount"], "150.00")
+
+    def test_list_endpoint_reads_values_rows(self):
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(2):  # the ETag aggregate and the page
+            response = self.client.get(reverse("my-fines"), {"page_size": 1})
+        # issued_at sorts descending with NULL first.
+        self.assertEqual([fine["fine_number"] for fine in response.json()["fines"]], ["F-2"])
+        response = self.client.get(response.json()["next"])
+        self.assertEqual([fine["fine_number"] for fine in response.json()["fines"]], ["F-1"])
+
+
+class FastJSONRendererTests(TestCase):
+    def assertRendersLikeDRF(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_json_renderer(self):
+        for data in (
+            {"text": "عربي \u2028\u2029 \x00 \"q\"", "n": [1, -2, 0.1, 1.5, True, None]},
+            [{"big": 2**70}, {"tiny": 1e-7}, {"huge": 1e20}],
+            {"amount": Decimal("1.10"), "when": date(2025, 1, 2)},
+            [],
+        ):
+            with self.subTest(data=data):
+                self.assertRendersLikeDRF(data)
+
+    def test_indent_uses_the_stdlib_encoder(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
@@ -0,0 +1,113 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main_app import catalog_cache
+from main_app.fieldsets import parse_fieldsets
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.query_plan import plan_queryset
+from main_app.serializers import ServiceRequestSerializer, ServiceSerializer
+
+User = get_user_model()
+
+
+def spec(query, serializer_class=ServiceRequestSerializer):
+    return parse_fieldsets(Request(APIRequestFactory().get("/", query)), serializer_class)
+
+
+class ParseFieldsetsTests(SimpleTestCase):
+    def test_no_parameters_means_full_output(self):
+        self.assertIsNone(spec({}))
+        self.assertIsNone(spec({"fields": ""}))
+
+    def test_fields_keep_serializer_order_and_collapse_relations(self):
+        self.assertEqual(spec({"fields": "service,status,id"}), (("id", None), ("status", None), ("service", None)))
+
+    def test_dotted_paths_and_expand(self):
+        self.assertEqual(spec({"fields": "id,service.name"}), (("id", None), ("service", (("name", None),))))
+        self.assertEqual(
+            spec({"fields": "service", "expand": "service"}),
+            (("service", (("id", None), ("name", None), ("description", None), ("fee", None), ("agency", None))),),
+        )
+        self.assertEqual(
+            spec({"fields": "agency", "expand": "agency"}, ServiceSerializer),
+            (("agency", (("id", None), ("name", None), ("description", None))),),
+        )
+
+    def test_expand_alone_selects_every_field(self):
+        names = [name for name, _ in spec({"expand": "service.agency"})]
+        self.assertEqual(names, ["id", "created_at", "status", "payload", "service", "user"])
+
+    def test_invalid_parameters(self):
+        for query in ({"fields": "nope"}, {"fields": "status.x"}, {"fields": "service_id"}, {"expand": "status"}):
+            with self.subTest(query=query), self.assertRaises(ValidationError):
+                spec(query)
+
+
+class SparseListTests(APITestCase):
+    def setUp(self):
+        catalog_cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name="Ministry of Interior")
+        self.service = Service.objects.create(agency=agency, name="Passport Renewal", fee=300)
+        self.request = ServiceRequest.objects.create(user=self.user, service=self.service, payload={"blob": "x" * 1000})
+        TrafficFine.objects.create(user=self.user, fine_number="F-1", amount=Decimal("150.00"))
+
+    def get(self, name, query):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name), query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response, ctx.captured_queries[-1]["sql"]
+
+    def test_narrow_request_skips_payload_and_agency_join(self):
+        response, sql = self.get("service-request-list", {"fields": "id,status,service.name"})
+        self.assertEqual(
+            response.json(), [{"id": self.request.pk, "status": "PENDING", "service": {"name": "Passport Renewal"}}]
+        )
+        self.assertNotIn("payload", sql)
+        self.assertNotIn("main_app_governmentagency", sql)
+
+    def test_collapsed_relation_is_its_id_without_a_join(self):
+        response, sql = self.get("service-request-list", {"fields": "id,service"})
+        self.assertEqual(response.json(), [{"id": self.request.pk, "service": self.service.pk}])
+        self.assertNotIn("JOIN", sql)
+
+    def test_fines_and_catalog(self):
+        response, _ = self.get("my-fines", {"fields": "fine_number,amount"})
+        self.assertEqual(response.json()["fines"], [{"fine_number": "F-1", "amount": "150.00"}])
+
+        full, _ = self.get("service-list", {})
+        narrow, _ = self.get("service-list", {"fields": "name"})
+        self.assertEqual(narrow.json(), [{"name": "Passport Renewal"}])
+        self.assertEqual(full.json()[0]["agency"]["name"], "Ministry of Interior")
+
+    def test_async_views_match(self):
+        for name, query in (("service-request-list", "?fields=id,service.name"), ("service-list", "?fields=id,agency")):
+            with self.subTest(name=name):
+                sync = self.client.get(reverse(name) + query)
+                token = RefreshToken.for_user(self.user).access_token
+                async_ = self.client.get(reverse(f"async-{name}") + query, headers={"Authorization": f"Bearer {token}"})
+                self.assertEqual(async_.json(), sync.json())
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse("my-fines"), {"fields": "payload"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.json())
+
+    def test_instances_are_narrowed_with_only(self):
+        fields = spec({"fields": "id,service.name"})
+        queryset = plan_queryset(ServiceRequest.objects.all(), ServiceRequestSerializer, fields)
+        with self.assertNumQueries(1):
+            data = ServiceRequestSerializer(list(queryset), many=True, fields=fields).data
+        self.assertEqual(data, [{"id": self.request.pk, "service": {"name": "Passport Renewal"}}])
+        self.assertNotIn("payload", str(queryset.query))
@@ -0,0 +1,124 @@
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app.fine_ingest import ingest
+from main_app.models import TrafficFine
+
+User = get_user_model()
+
+CSV = (
+    "fine_number,username,amount,violation_type,issued_at,due_date,status\n"
+    "F-1,alice,150,Speeding,2025-01-02,2025-02-02,\n"
+    "F-2,bob,90.5,Parking,2025-01-03,,PENDING\n"
+    "F-1,alice,175,Speeding,2025-01-02,2025-02-02,\n"
+    "F-3,nobody,10,Parking,,,\n"
+    "F-4,bob,abc,Parking,,,\n"
+    "F-5,bob,20,Parking,2025-13-40,,\n"
+)
+
+
+class FineIngestTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice")
+        self.bob = User.objects.create_user(username="bob")
+
+    def test_csv_upserts_dedupes_and_reports_bad_rows(self):
+        report = ingest(io.StringIO(CSV), "csv")
+
+        self.assertEqual((report.read, report.upserted, report.duplicates, report.rejected), (6, 2, 1, 3))
+        self.assertEqual(sorted(error["line"] for error in report.errors), [5, 6, 7])
+        fines = {fine.fine_number: fine for fine in TrafficFine.objects.all()}
+        self.assertEqual(set(fines), {"F-1", "F-2"})
+        self.assertEqual(fines["F-1"].amount, Decimal("175.00"))  # last row in the batch wins
+        self.assertEqual(fines["F-1"].user, self.alice)
+        self.assertEqual(fines["F-2"].amount, Decimal("90.50"))
+
+    def test_resend_updates_without_unpaying(self):
+        TrafficFine.objects.create(user=self.alice, fine_number="F-1", amount=Decimal("150.00"), status=TrafficFine.PAID)
+        rows = '{"fine_number": "F-1", "username": "alice", "amount": "160", "notes": "corrected"}\n\n'
+
+        report = ingest(io.StringIO(rows), "ndjson")
+
+        self.assertEqual(report.upserted, 1)
+        fine = TrafficFine.objects.get(fine_number="F-1")
+        self.assertEqual((fine.amount, fine.notes, fine.status), (Decimal("160.00"), "corrected", TrafficFine.PAID))
+
+    def test_over_long_fine_numbers_are_rejected_not_truncated(self):
+        prefix = "F" * 60
+        rows = "".join(
+            json.dumps({"fine_number": prefix + suffix, "username": "alice", "amount": "10"}) + "\n"
+            for suffix in ("A", "B")
+        )
+
+        report = ingest(io.StringIO(rows), "ndjson")
+
+        self.assertEqual((report.upserted, report.rejected), (0, 2))
+        self.assertIn("fine_number", report.errors[0]["error"])
+        self.assertFalse(TrafficFine.objects.exists())
+
+    def test_queries_per_batch_do_not_grow_with_rows(self):
+        rows = "".join(
+            json.dumps({"fine_number": f"F-{i}", "username": "alice" if i % 2 else "bob", "amount": i}) + "\n"
+            for i in range(250)
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            report = ingest(io.StringIO(rows), "ndjson", batch_size=50)
+
+        self.assertEqual((report.upserted, report.batches), (250, 5))
+        inserts = [query for query in ctx.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 5)
+        # Users are resolved once; later batches hit the cache.
+        user_lookups = [query for query in ctx.captured_queries if "auth_user" in query["sql"]]
+        self.assertEqual(len(user_lookups), 1)
+
+    def test_command_reads_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write(CSV)
+        self.addCleanup(os.remove, handle.name)
+        out = io.StringIO()
+
+        call_command("ingest_fines", handle.name, stdout=out, stderr=io.StringIO())
+
+        self.assertIn("6 rows read, 2 upserted, 1 duplicates, 3 rejected", out.getvalue())
+        self.assertEqual(TrafficFine.objects.count(), 2)
+
+
+class FineImportViewTests(APITestCase):
+    def setUp(self):
+        User.objects.create_user(username="alice")
+        User.objects.create_user(username="bob")
+        self.url = reverse("fine-import")
+
+    def upload(self, name="fines.csv", content=CSV):
+        return self.client.post(self.url, {"file": SimpleUploadedFile(name, content.encode())}, format="multipart")
+
+    def test_staff_upload_returns_report(self):
+        self.client.force_authenticate(User.objects.create_user(username="staff", is_staff=True))
+
+        response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["upserted"], 2)
+        self.assertEqual(response.data["rejected"], 3)
+        self.assertIn("rows_per_second", response.data)
+
+    def test_rejects_unknown_format_and_non_staff(self):
+        self.client.force_authenticate(User.objects.create_user(username="staff", is_staff=True))
+        self.assertEqual(self.upload(name="fines.xlsx").status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(User.objects.get(username="alice"))
+        self.assertEqual(self.upload().status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(TrafficFine.objects.exists())
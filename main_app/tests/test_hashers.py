@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import backends, throttling
+from main_app.hashers import needs_rehash
+
+User = get_user_model()
+
+# Cheap parameters so the tests do not spend seconds hashing.
+FAST_PARAMS = {
+    "pbkdf2": {"iterations": 1000},
+    "scrypt": {"work_factor": 2**10, "block_size": 8, "parallelism": 1},
+}
+SCRYPT = ["main_app.hashers.ScryptPasswordHasher", "main_app.hashers.PBKDF2PasswordHasher"]
+PBKDF2 = ["main_app.hashers.PBKDF2PasswordHasher", "main_app.hashers.ScryptPasswordHasher"]
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, func, *args):
+        self.calls.append(args)
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT, PASSWORD_HASHER_PARAMS=FAST_PARAMS)
+class HasherProfileTests(TestCase):
+    def test_profile_parameters_are_used(self):
+        encoded = make_password("s3cret")
+        self.assertTrue(encoded.startswith("scrypt$1024$"))
+        self.assertTrue(check_password("s3cret", encoded))
+        self.assertFalse(needs_rehash(encoded))
+
+    def test_other_hasher_or_parameters_need_rehash(self):
+        with self.settings(PASSWORD_HASHERS=PBKDF2):
+            old = make_password("s3cret")
+        self.assertTrue(old.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(needs_rehash(old))
+        with self.settings(PASSWORD_HASHER_PARAMS={**FAST_PARAMS, "scrypt": {"work_factor": 2**11}}):
+            self.assertFalse(needs_rehash(make_password("s3cret")))
+            self.assertTrue(needs_rehash(old))
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT, PASSWORD_HASHER_PARAMS=FAST_PARAMS, THROTTLE_RATES={})
+class RehashOnLoginTests(APITestCase):
+    def setUp(self):
+        throttling.get_store().clear()
+        with self.settings(PASSWORD_HASHERS=PBKDF2):
+            self.user = User.objects.create_user(username="alice", password="s3cret-pass")
+        self.executor = RecordingExecutor()
+        patcher = mock.patch.object(backends, "get_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self, password="s3cret-pass"):
+        return self.client.post(reverse("login"), {"username": "alice", "password": password}, format="json")
+
+    def test_login_defers_rehash(self):
+        old = self.user.password
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        # The login itself left the old hash in place ...
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, old)
+        self.assertEqual(self.executor.calls, [(self.user.pk, old, "s3cret-pass")])
+        # ... and the background task upgrades it.
+        self.assertTrue(backends.rehash(*self.executor.calls[0]))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("s3cret-pass"))
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.executor.calls), 1)
+
+    def test_rehash_skips_password_changed_meanwhile(self):
+        old = self.user.password
+        self.user.set_password("new-pass-123")
+        self.user.save()
+
+        self.assertFalse(backends.rehash(self.user.pk, old, "s3cret-pass"))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-pass-123"))
+
+    def test_wrong_password_schedules_nothing(self):
+        self.assertEqual(self.login("wrong").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.executor.calls, [])
@@ -0,0 +1,144 @@
+import gzip
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main_app import catalog_cache, compression
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.payments import pay_fines
+
+User = get_user_model()
+
+
+class NegotiationTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(compression.CODECS, {"br": lambda data, level: data, "zstd": lambda data, level: data})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            compression.parse_accept_encoding("gzip, br;q=0.5 , *;q=0, zstd;q=x"),
+            {"gzip": 1.0, "br": 0.5, "*": 0.0, "zstd": 0.0},
+        )
+
+    def test_client_q_values_then_server_preference(self):
+        self.assertEqual(compression.negotiate("gzip, br, zstd"), "zstd")
+        self.assertEqual(compression.negotiate("gzip, br;q=0.9"), "gzip")
+        self.assertEqual(compression.negotiate("*"), "zstd")
+        self.assertEqual(compression.negotiate("*, zstd;q=0"), "br")
+
+    def test_nothing_acceptable(self):
+        self.assertIsNone(compression.negotiate(""))
+        self.assertIsNone(compression.negotiate("identity, deflate"))
+        self.assertIsNone(compression.negotiate("gzip;q=0"))
+
+    @override_settings(COMPRESSION_ENCODINGS=["gzip"])
+    def test_only_configured_codings(self):
+        self.assertEqual(compression.negotiate("zstd, br, gzip;q=0.1"), "gzip")
+
+
+class HttpCachingTests(APITestCase):
+    def setUp(self):
+        catalog_cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.auth = f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+        agency = GovernmentAgency.objects.create(name="Ministry of Interior")
+        self.services = [
+            Service.objects.create(agency=agency, name=f"Service {i}", description="x" * 100, fee=10) for i in range(20)
+        ]
+        self.request = ServiceRequest.objects.create(user=self.user, service=self.services[0])
+        ServiceRequest.objects.create(user=self.user, service=self.services[1])
+        for i in range(3):
+            TrafficFine.objects.create(user=self.user, fine_number=f"F-{i}", amount=Decimal("100.00"))
+
+    def get(self, name, **headers):
+        return self.client.get(reverse(name), headers=headers)
+
+    def test_large_responses_are_compressed(self):
+        plain = self.get("service-list")
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        response = self.get("service-list", accept_encoding="br;q=0, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+        # The weakened ETag still validates.
+        self.assertEqual(self.get("service-list", if_none_match=response["ETag"]).status_code, 304)
+
+    @override_settings(COMPRESSION_MIN_BYTES=10**6)
+    def test_small_responses_are_left_alone(self):
+        response = self.get("service-list", accept_encoding="gzip")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertNotIn("Accept-Encoding", response.get("Vary", ""))
+
+    def test_service_request_list_revalidates_with_one_query(self):
+        response = self.get("service-request-list")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            response = self.get("service-request-list", if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        # A different page is a different representation.
+        response = self.client.get(reverse("service-request-list"), {"page_size": 1}, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_service_request_list_etag_tracks_writes(self):
+        etag = self.get("service-request-list")["ETag"]
+
+        def changed():
+            nonlocal etag
+            response = self.get("service-request-list", if_none_match=etag)
+            etag = response.get("ETag")
+            return response.status_code == status.HTTP_200_OK
+
+        self.client.put(
+            reverse("service-request-detail", args=[self.request.pk]), {"payload": {"a": 1}}, format="json"
+        )
+        self.assertTrue(changed())
+        self.assertFalse(changed())
+        ServiceRequest.objects.filter(pk=self.request.pk).delete()
+        self.assertTrue(changed())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.services[1].save()  # catalog change, nested in the rows
+        self.assertTrue(changed())
+
+    def test_fines_revalidate_by_etag_only(self):
+        response = self.get("my-fines")
+        self.assertNotIn("Last-Modified", response)
+        since = http_date(time.time() + 60)
+        self.assertEqual(self.get("my-fines", if_none_match=response["ETag"]).status_code, 304)
+
+        # The paid fine drops out of the list without moving MAX(updated_at).
+        pay_fines(self.user, fine_ids=[TrafficFine.objects.first().pk])
+        self.assertEqual(self.get("my-fines", if_none_match=response["ETag"]).status_code, 200)
+        response = self.get("my-fines", if_modified_since=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["fines"]), 2)
+
+    async def test_async_lists_revalidate(self):
+        for name in ("async-service-request-list", "async-my-fines"):
+            with self.subTest(name=name):
+                headers = {"Authorization": self.auth}
+                response = await self.async_client.get(reverse(name), headers=headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                response = await self.async_client.get(
+                    reverse(name), headers={**headers, "If-None-Match": response["ETag"]}
+                )
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
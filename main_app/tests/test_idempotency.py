@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import status_policy
+from main_app.models import GovernmentAgency, IdempotencyKey, Service, ServiceRequest, ServiceStatusRule
+
+User = get_user_model()
+
+
+class IdempotentServiceRequestTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        self.service = Service.objects.create(agency=agency, name='Passport Renewal', fee=300)
+        ServiceStatusRule.objects.create(service=self.service, initial_status='APPROVED')
+        status_policy.initial_status(self.service)  # compile the rule table up front
+        self.url = reverse('service-request-list')
+
+    def post(self, data, key=None):
+        headers = {'Idempotency-Key': key} if key else None
+        return self.client.post(self.url, data, format='json', headers=headers)
+
+    def test_create_is_one_lookup_and_one_insert(self):
+        with self.assertNumQueries(2):
+            response = self.post({'service_id': self.service.pk, 'payload': {'a': 1}})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], 'APPROVED')
+        self.assertEqual(response.data['service']['agency']['name'], 'Ministry of Interior')
+        self.assertEqual(ServiceRequest.objects.get().status, 'APPROVED')
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.post({'service_id': self.service.pk}, key='abc')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with self.assertNumQueries(1):
+            retry = self.post({'service_id': self.service.pk}, key='abc')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(ServiceRequest.objects.count(), 1)
+
+    def test_key_reused_with_different_body(self):
+        self.post({'service_id': self.service.pk}, key='abc')
+        response = self.post({'service_id': self.service.pk, 'payload': {'b': 2}}, key='abc')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(ServiceRequest.objects.count(), 1)
+
+    def test_failed_validation_is_not_stored(self):
+        response = self.post({'service_id': self.service.pk + 100}, key='abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        response = self.post({'service_id': self.service.pk}, key='abc')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_keys_are_per_user(self):
+        self.post({'service_id': self.service.pk}, key='abc')
+        other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client.force_authenticate(other)
+        response = self.post({'service_id': self.service.pk}, key='abc')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(ServiceRequest.objects.count(), 2)
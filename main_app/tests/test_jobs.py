@@ -0,0 +1,120 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import jobs
+from main_app.models import CreditCard, GovernmentAgency, Job, Service, ServiceRequest
+
+User = get_user_model()
+
+
+class JobQueueTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.calls = []
+        self.failures = 0
+        patcher = mock.patch.dict(jobs.HANDLERS, {'record': self.record})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, job):
+        self.calls.append(job.args)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('boom')
+        return {'ok': True}
+
+    def test_claimed_jobs_are_not_handed_out_twice(self):
+        for i in range(3):
+            jobs.enqueue('record', n=i)
+        first = jobs.claim('worker-a', limit=2)
+        second = jobs.claim('worker-b', limit=2)
+        self.assertEqual([job.args['n'] for job in first], [0, 1])
+        self.assertEqual([job.args['n'] for job in second], [2])
+        self.assertEqual(jobs.claim('worker-c', limit=2), [])
+        self.assertTrue(all(job.status == Job.RUNNING and job.attempts == 1 for job in first))
+
+    def test_failed_jobs_are_retried_with_backoff(self):
+        self.failures = 1
+        job = jobs.enqueue('record')
+        with self.assertLogs('main_app.jobs', 'WARNING'):
+            self.assertEqual(jobs.work(once=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn('RuntimeError', job.last_error)
+        self.assertGreaterEqual(job.run_at, timezone.now() + timedelta(seconds=jobs.BACKOFF_BASE - 1))
+        self.assertEqual(jobs.claim('worker'), [])
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        jobs.work(once=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result), (Job.DONE, 2, {'ok': True}))
+
+    def test_jobs_fail_after_max_attempts(self):
+        self.failures = 10
+        job = jobs.enqueue('record')
+        Job.objects.filter(pk=job.pk).update(max_attempts=1)
+        with self.assertLogs('main_app.jobs', 'WARNING'):
+            jobs.work(once=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = jobs.enqueue('record')
+        jobs.claim('worker-a')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=jobs.LEASE_SECONDS + 1))
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertEqual(len(jobs.claim('worker-b')), 1)
+
+    def test_service_request_payment_is_queued(self):
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        service = Service.objects.create(agency=agency, name='Residence Permit', fee=100)
+        service_request = ServiceRequest.objects.create(user=self.user, service=service)
+        url = reverse('service-request-pay', args=[service_request.pk])
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        CreditCard.objects.create(user=self.user, credit_card_number='4111111111111111',
+                                  expiration_date='1230', security_code=123)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        service_request.refresh_from_db()
+        self.assertEqual(service_request.status, ServiceRequest.PROCESSING)
+
+        # A repeat POST while the job is queued gets that job, not a second one.
+        again = self.client.post(url)
+        self.assertEqual(again.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(again['Location'], response['Location'])
+        self.assertEqual(Job.objects.count(), 1)
+
+        jobs.work(once=True)
+        service_request.refresh_from_db()
+        self.assertEqual(service_request.status, ServiceRequest.APPROVED)
+        self.assertEqual(self.client.get(response['Location']).data['status'], Job.DONE)
+
+    def test_payment_is_queued_again_after_its_job_failed(self):
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        service = Service.objects.create(agency=agency, name='Residence Permit', fee=100)
+        service_request = ServiceRequest.objects.create(user=self.user, service=service)
+        CreditCard.objects.create(user=self.user, credit_card_number='4111111111111111',
+                                  expiration_date='1230', security_code=123)
+        url = reverse('service-request-pay', args=[service_request.pk])
+        first = self.client.post(url)
+        Job.objects.update(status=Job.FAILED)
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(response['Location'], first['Location'])
+        self.assertEqual(Job.objects.filter(status=Job.QUEUED).count(), 1)
+
+    def test_job_status_is_private(self):
+        job = jobs.enqueue('record', user=User.objects.create_user(username='other', password='testpass123'))
+        response = self.client.get(reverse('job-detail', args=[job.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
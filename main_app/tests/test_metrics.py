@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app.metrics import registry
+from main_app.middleware import PerformanceMiddleware
+from main_app.models import GovernmentAgency
+
+User = get_user_model()
+
+
+class PerformanceMiddlewareTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('service-request-list'))
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries, 0 duplicates"$')
+
+    def test_metrics_are_labelled_by_url_name(self):
+        self.client.get(reverse('service-request-list'))
+        self.client.get(reverse('service-request-list'))
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'http_requests_total{route="service-request-list",method="GET",status="200"} 2', body
+        )
+        self.assertIn('http_request_queries_count{route="service-request-list",method="GET"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="service-request-list",method="GET",le="+Inf"} 2', body)
+
+    def test_duplicate_queries_are_counted(self):
+        def view(request):
+            GovernmentAgency.objects.filter(pk=1).exists()
+            GovernmentAgency.objects.filter(pk=1).exists()
+            GovernmentAgency.objects.filter(pk=2).exists()
+            return HttpResponse('ok')
+
+        request = RequestFactory().get('/')
+        request.resolver_match = None
+        response = PerformanceMiddleware(view)(request)
+        self.assertIn('3 queries, 1 duplicates', response['Server-Timing'])
+        self.assertIn(
+            'http_request_duplicate_queries_sum{route="<unmatched>",method="GET"} 1', registry.render()
+        )
+
+    @override_settings(PERF_SLOW_TRACES=2)
+    def test_slowest_requests_keep_query_traces(self):
+        for _ in range(3):
+            self.client.get(reverse('my-fines'))
+        self.user.is_staff = True
+        self.user.save()
+        traces = self.client.get(reverse('metrics-slow')).data['requests']
+        self.assertEqual(len(traces), 2)
+        self.assertGreaterEqual(traces[0]['duration_ms'], traces[1]['duration_ms'])
+        self.assertEqual(traces[0]['route'], 'my-fines')
+        self.assertTrue(traces[0]['queries'][0]['sql'].startswith('SELECT'))
+
+    def test_slow_traces_are_staff_only(self):
+        response = self.client.get(reverse('metrics-slow'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse('metrics'), headers={'Authorization': 'Bearer s3cret'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,104 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.pagination import KeysetPagination
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        self.service = Service.objects.create(agency=agency, name='Passport Renewal', fee=300)
+
+    def walk(self, url, extract):
+        seen, next_url = [], f'{url}?page_size=2'
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            rows, next_url = extract(response)
+            self.assertLessEqual(len(rows), 2)
+            seen.extend(row['id'] for row in rows)
+        return seen
+
+    def test_service_requests_are_paged_by_created_at_then_id(self):
+        # Same-timestamp rows exercise the id tie-breaker.
+        requests = ServiceRequest.objects.bulk_create(
+            [ServiceRequest(user=self.user, service=self.service) for _ in range(5)]
+        )
+        ServiceRequest.objects.filter(pk__in=[r.pk for r in requests[:3]]).update(
+            created_at=requests[0].created_at
+        )
+        expected = list(
+            ServiceRequest.objects.filter(user=self.user)
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+        def extract(response):
+            link = response.headers.get('Link')
+            return response.data, link and link[1:link.index('>')]
+
+        self.assertEqual(self.walk(reverse('service-request-list'), extract), expected)
+
+    def test_fines_are_paged_with_null_issue_dates(self):
+        issued = [date(2025, 1, 1), None, date(2025, 3, 1), date(2025, 1, 1), None, date(2024, 12, 1)]
+        for i, issued_at in enumerate(issued):
+            TrafficFine.objects.create(
+                user=self.user, fine_number=f'F-{i}', amount=Decimal('100.00'), issued_at=issued_at
+            )
+        TrafficFine.objects.create(
+            user=self.user, fine_number='F-paid', amount=Decimal('100.00'), status=TrafficFine.PAID
+        )
+        fines = TrafficFine.objects.filter(user=self.user).exclude(status=TrafficFine.PAID)
+        # NULL sorts as the largest issue date, so undated fines come first.
+        expected = [
+            f.id for f in sorted(
+                fines,
+                key=lambda f: (f.issued_at or date.max, f.created_at, f.id),
+                reverse=True,
+            )
+        ]
+
+        def extract(response):
+            return response.data['fines'], response.data['next']
+
+        self.assertEqual(self.walk(reverse('my-fines'), extract), expected)
+
+    def test_page_size_is_capped(self):
+        ServiceRequest.objects.bulk_create(
+            [ServiceRequest(user=self.user, service=self.service) for _ in range(3)]
+        )
+        paginator = KeysetPagination(ordering=('-created_at', '-id'))
+        paginator.max_page_size = 2
+        request = Request(APIRequestFactory().get('/service-requests/', {'page_size': 1000}))
+        page = paginator.paginate_queryset(ServiceRequest.objects.all(), request)
+        self.assertEqual(len(page), 2)
+        self.assertIsNotNone(paginator.get_next_cursor())
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('service-request-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('my-fines'), {'cursor': 'WyJ4Il0'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_later_pages_use_keyset_predicate_not_offset(self):
+        ServiceRequest.objects.bulk_create(
+            [ServiceRequest(user=self.user, service=self.service) for _ in range(3)]
+        )
+        first = self.client.get(reverse('service-request-list'), {'page_size': 1})
+        next_url = first.headers['Link'][1:first.headers['Link'].index('>')]
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(next_url)
+        sql = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertNotIn('OFFSET', sql)
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.payload_keys import filter_payload
+from main_app.payments import pay_fines
+
+User = get_user_model()
+
+
+class PayloadFilterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.client.force_authenticate(self.user)
+        fines = [TrafficFine.objects.create(user=self.user, fine_number=f"F-{i}", amount=Decimal("100.00")) for i in range(3)]
+        pay_fines(self.user, fine_ids=[fine.pk for fine in fines])
+        agency = GovernmentAgency.objects.create(name="Ministry of Interior")
+        service = Service.objects.create(agency=agency, name="Passport Renewal", fee=300)
+        # Same key on a regular request: not indexed there, so not matched.
+        ServiceRequest.objects.create(user=self.user, service=service, payload={"fine_number": "F-1"})
+        other = User.objects.create_user(username="other", password="testpass123")
+        ServiceRequest.objects.create(user=other, payload={"fine_number": "F-1"})
+
+    def test_filters_fine_payments_by_fine_number(self):
+        response = self.client.get(reverse("service-request-list"), {"payload.fine_number": "F-1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["payload"]["fine_number"] for row in response.json()], ["F-1"])
+        self.assertIsNone(response.json()[0]["service"])
+
+        response = self.client.get(reverse("service-request-list"), {"payload.fine_number": "F-9"})
+        self.assertEqual(response.json(), [])
+
+    def test_undeclared_key_is_rejected(self):
+        for name in ("service-request-list", "async-service-request-list"):
+            with self.subTest(name=name):
+                token = RefreshToken.for_user(self.user).access_token
+                response = self.client.get(
+                    reverse(name), {"payload.amount": "100.00"}, headers={"Authorization": f"Bearer {token}"}
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("payload.amount", response.content.decode())
+
+    def test_async_view_matches(self):
+        token = RefreshToken.for_user(self.user).access_token
+        query = {"payload.fine_number": "F-2"}
+        sync = self.client.get(reverse("service-request-list"), query)
+        async_ = self.client.get(
+            reverse("async-service-request-list"), query, headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(async_.json(), sync.json())
+        self.assertEqual(len(sync.json()), 1)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_lookup_uses_the_index(self):
+        queryset = filter_payload(ServiceRequest.objects.filter(user=self.user), {"payload.fine_number": "F-1"})
+        self.assertIn("sr_fine_payment_fine_number", queryset.explain())
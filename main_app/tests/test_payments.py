@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import jobs
+from main_app.models import Job, ServiceRequest, TrafficFine
+from main_app.payments import pay_fines
+from .query_counts import QueryCountAssertionsMixin
+
+User = get_user_model()
+
+
+class PayFinesTests(APITestCase, QueryCountAssertionsMixin):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.count = 0
+
+    def add_fines(self, count, user=None):
+        fines = []
+        for _ in range(count):
+            self.count += 1
+            fines.append(TrafficFine(
+                user=user or self.user, fine_number=f'F-{self.count}', amount=Decimal('150.00')
+            ))
+        return TrafficFine.objects.bulk_create(fines)
+
+    def test_pay_selected_fines_logs_ledger_entries(self):
+        fines = self.add_fines(3)
+        response = self.client.post(
+            reverse('pay-fines'), {'fine_ids': [fines[0].id, fines[1].id]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(jobs.work(once=True), 1)
+        response = self.client.get(reverse('my-fines'))
+        self.assertEqual([f['id'] for f in response.data['fines']], [fines[2].id])
+        self.assertEqual(
+            TrafficFine.objects.filter(status=TrafficFine.PAID).count(), 2
+        )
+        ledger = ServiceRequest.objects.filter(user=self.user, service=None)
+        self.assertEqual(
+            sorted(r.payload['fine_number'] for r in ledger),
+            sorted([fines[0].fine_number, fines[1].fine_number]),
+        )
+        self.assertTrue(all(r.status == ServiceRequest.APPROVED for r in ledger))
+
+    def test_pay_all_only_touches_own_unpaid_fines(self):
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.add_fines(2)
+        self.add_fines(1, user=other)
+        response = self.client.post(reverse('pay-fines'), {'pay_all': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        jobs.work(once=True)
+        job = self.client.get(response['Location'])
+        self.assertEqual(job.data['status'], Job.DONE)
+        self.assertEqual(len(job.data['result']['paid']), 2)
+        self.assertFalse(TrafficFine.objects.filter(user=other, status=TrafficFine.PAID).exists())
+
+        response = self.client.post(reverse('pay-fines'), {'pay_all': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ServiceRequest.objects.filter(user=self.user).count(), 2)
+
+    def test_fine_ids_required(self):
+        response = self.client.post(reverse('pay-fines'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_depend_on_fine_count(self):
+        self.add_fines(1)
+        single, _ = self.count_queries(lambda: pay_fines(self.user))
+        self.add_fines(100)
+        many, _ = self.count_queries(lambda: pay_fines(self.user))
+        self.assertEqual(single, many)
@@ -0,0 +1,79 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from main_app.models import GovernmentAgency, Service, ServiceRequest, TrafficFine
+from main_app.query_plan import relations_for
+from main_app.serializers import ServiceRequestSerializer, ServiceSerializer, TrafficFineSerializer
+from .query_counts import QueryCountAssertionsMixin
+
+User = get_user_model()
+
+
+class QueryPlanTests(APITestCase, QueryCountAssertionsMixin):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.rows = 0
+
+    def add_services(self, count):
+        for _ in range(count):
+            self.rows += 1
+            agency = GovernmentAgency.objects.create(name=f'Agency {self.rows}')
+            Service.objects.create(agency=agency, name=f'Service {self.rows}', fee=10)
+
+    def add_requests(self, count):
+        self.add_services(count)
+        for service in Service.objects.order_by('-id')[:count]:
+            ServiceRequest.objects.create(user=self.user, service=service)
+
+    def add_fines(self, count):
+        for _ in range(count):
+            self.rows += 1
+            TrafficFine.objects.create(
+                user=self.user,
+                fine_number=f'F-{self.rows}',
+                amount=Decimal('150.00'),
+                issued_at=date(2025, 1, 1),
+            )
+
+    def test_relations_follow_nested_serializers(self):
+        self.assertEqual(relations_for(ServiceRequestSerializer), (('service__agency',), ()))
+        self.assertEqual(relations_for(ServiceSerializer), (('agency',), ()))
+        self.assertEqual(relations_for(TrafficFineSerializer), ((), ()))
+
+    def test_service_list_query_count_is_constant(self):
+        self.add_services(1)
+        self.assertQueryCountIndependentOfRows(
+            lambda: self.client.get(reverse('service-list')), self.add_services
+        )
+
+    def test_service_request_list_query_count_is_constant(self):
+        self.add_requests(1)
+        self.assertQueryCountIndependentOfRows(
+            lambda: self.client.get(reverse('service-request-list')), self.add_requests
+        )
+
+    def test_my_fines_query_count_is_constant(self):
+        self.add_fines(1)
+        self.assertQueryCountIndependentOfRows(
+            lambda: self.client.get(reverse('my-fines')), self.add_fines
+        )
+
+    def test_admin_changelists_query_count_is_constant(self):
+        admin_user = User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.force_login(admin_user)
+        self.add_requests(1)
+        self.add_fines(1)
+        for url_name, add_rows in [
+            ('admin:main_app_service_changelist', self.add_services),
+            ('admin:main_app_servicerequest_changelist', self.add_requests),
+            ('admin:main_app_trafficfine_changelist', self.add_fines),
+        ]:
+            with self.subTest(url_name=url_name):
+                self.assertQueryCountIndependentOfRows(
+                    lambda: self.client.get(reverse(url_name)), add_rows
+                )
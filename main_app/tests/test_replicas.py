@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import catalog_cache, routers, status_policy
+from main_app.authentication import issue_tokens
+from main_app.models import GovernmentAgency, Service, ServiceRequest, ServiceStatusRule, TrafficFine
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+
+    def test_reads_outside_a_request_use_the_primary(self):
+        self.assertIsNone(self.router.db_for_read(Service))
+        self.assertEqual(self.router.db_for_write(Service), "default")
+
+    def test_reads_use_replica_until_the_request_writes(self):
+        state, token = routers.activate("client")
+        self.addCleanup(routers.deactivate, token)
+        self.assertIsNone(self.router.db_for_read(Service))
+
+        state.replica_allowed = True
+        self.assertEqual(self.router.db_for_read(Service), "replica")
+
+        self.router.db_for_write(ServiceRequest)
+        self.assertTrue(state.wrote)
+        self.assertIsNone(self.router.db_for_read(Service))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "main_app"))
+        self.assertIsNone(self.router.allow_migrate("default", "main_app"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingMiddlewareTests(APITestCase):
+    """The "replica" alias shares the default test connection, so routing is
+    observed through the aliases the router hands out."""
+
+    def setUp(self):
+        connections["replica"] = connections["default"]
+        self.addCleanup(connections.__delitem__, "replica")
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_tokens(self.user)['access']}")
+        agency = GovernmentAgency.objects.create(name="Ministry of Interior")
+        self.service = Service.objects.create(agency=agency, name="Passport Renewal", fee=300)
+        ServiceStatusRule.objects.create(service=self.service, initial_status="APPROVED")
+        status_policy.initial_status(self.service)
+        ServiceRequest.objects.create(user=self.user, service=self.service)
+        TrafficFine.objects.create(user=self.user, fine_number="F-1", amount=150)
+
+        self.routed = []
+        original = routers.ReplicaRouter.db_for_read
+
+        def recording(router, model, **hints):
+            alias = original(router, model, **hints)
+            self.routed.append(alias or "default")
+            return alias
+
+        routers.ReplicaRouter.db_for_read = recording
+        self.addCleanup(setattr, routers.ReplicaRouter, "db_for_read", original)
+
+    def get(self, name):
+        self.routed = []
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_opted_in_lists_read_from_replica(self):
+        self.assertEqual(len(self.get("service-request-list").data), 1)
+        self.assertEqual(set(self.routed), {"replica"})
+        self.assertEqual(len(self.get("my-fines").data["fines"]), 1)
+        self.assertEqual(set(self.routed), {"replica"})
+
+    def test_other_views_read_from_primary(self):
+        self.get("my-summary")
+        self.assertEqual(set(self.routed), {"default"})
+
+    def test_catalog_cache_fills_read_from_primary(self):
+        for name in ("agency-list", "service-list", "async-agency-list", "async-service-list"):
+            with self.subTest(name=name):
+                catalog_cache.clear()
+                self.get(name)
+                self.assertEqual(set(self.routed), {"default"})
+
+    def test_writer_is_pinned_to_primary(self):
+        response = self.client.post(reverse("service-request-list"), {"service_id": self.service.pk}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.get("service-request-list")
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(set(self.routed), {"default"})
+
+        # Other clients are not pinned.
+        other = User.objects.create_user(username="other", password="testpass123")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_tokens(other)['access']}")
+        self.get("service-request-list")
+        self.assertEqual(set(self.routed), {"replica"})
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_from_primary(self):
+        self.get("service-request-list")
+        self.assertEqual(set(self.routed), {"default"})
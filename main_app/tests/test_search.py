@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import catalog_cache, search
+from main_app.models import GovernmentAgency, Service
+
+User = get_user_model()
+
+
+class ServiceSearchTests(APITestCase):
+    def setUp(self):
+        catalog_cache.clear()
+        search.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.interior = GovernmentAgency.objects.create(name='Ministry of Interior', description='الأحوال المدنية')
+        self.health = GovernmentAgency.objects.create(name='Ministry of Health')
+        self.passport = Service.objects.create(
+            agency=self.interior, name='Passport Renewal', description='تجديد جواز السفر', fee=300
+        )
+        self.id_card = Service.objects.create(agency=self.interior, name='National ID Issuance', fee=100)
+        self.vaccine = Service.objects.create(
+            agency=self.health, name='Vaccination', description='Book a vaccination at a clinic', fee=0
+        )
+
+    def ids(self, query):
+        response = self.client.get(reverse('service-search'), {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result['id'] for result in response.data]
+
+    def test_exact_prefix_and_fuzzy_matches(self):
+        self.assertEqual(self.ids('passport')[0], self.passport.pk)
+        self.assertEqual(self.ids('pass')[0], self.passport.pk)
+        self.assertEqual(self.ids('pasport')[0], self.passport.pk)
+        self.assertEqual(self.ids('vacination'), [self.vaccine.pk])
+
+    def test_name_hits_outrank_agency_hits(self):
+        self.assertEqual(self.ids('national interior'), [self.id_card.pk, self.passport.pk])
+
+    def test_arabic_letter_variants_match(self):
+        self.assertEqual(self.ids('جواز')[0], self.passport.pk)
+        # Alef with hamza and teh marbuta in the text, plain alef and heh in the query.
+        self.assertIn(self.passport.pk, self.ids('الاحوال المدنيه'))
+
+    def test_results_are_served_from_memory(self):
+        self.ids('passport')
+        with self.assertNumQueries(0):
+            results = search.search('passport')
+        self.assertEqual(results[0][1]['agency']['name'], 'Ministry of Interior')
+
+    def test_saves_update_the_index_incrementally(self):
+        self.ids('passport')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.passport.name = 'Travel Document Renewal'
+            self.passport.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(search.search('travel')[0][1]['id'], self.passport.pk)
+            self.assertNotIn(self.passport.pk, [doc['id'] for _, doc in search.search('passport')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.health.name = 'Ministry of Public Health'
+            self.health.save()
+        self.assertEqual(search.search('public')[0][1]['id'], self.vaccine.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vaccine.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(search.search('vaccination'), [])
+
+    def test_query_required(self):
+        response = self.client.get(reverse('service-search'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
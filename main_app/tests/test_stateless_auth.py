@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from main_app.authentication import forget_user, get_full_user, issue_tokens
+from main_app.models import GovernmentAgency, Service, ServiceRequest
+
+User = get_user_model()
+
+
+class StatelessAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        self.service = Service.objects.create(agency=agency, name='Passport Renewal', fee=300)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_tokens(self.user)['access']}")
+
+    def user_queries(self, ctx):
+        return [q['sql'] for q in ctx.captured_queries if 'auth_user' in q['sql']]
+
+    def test_authenticated_calls_do_not_load_the_user(self):
+        ServiceRequest.objects.create(user=self.user, service=self.service)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('service-request-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(self.user_queries(ctx), [])
+
+    def test_writes_use_the_token_user_id(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('service-request-list'), {'service_id': self.service.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ServiceRequest.objects.get().user, self.user)
+        self.assertEqual(self.user_queries(ctx), [])
+
+    def test_token_refresh_reads_the_current_row(self):
+        response = self.client.get(reverse('token_refresh'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['email'], 'test@example.com')
+
+        self.user.email = 'changed@example.com'
+        self.user.save()
+        response = self.client.get(reverse('token_refresh'))
+        self.assertEqual(response.data['user']['email'], 'changed@example.com')
+
+    def test_deactivated_and_deleted_users_cannot_refresh(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('token_refresh')).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.delete()
+        self.assertEqual(self.client.get(reverse('token_refresh')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_full_user_rejects_deactivated_users(self):
+        token_user = JWTStatelessUserAuthentication().get_user(AccessToken(issue_tokens(self.user)['access']))
+        self.assertEqual(get_full_user(token_user), self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_user(self.user.pk)
+        with self.assertRaises(AuthenticationFailed):
+            get_full_user(token_user)
+
+    def test_staff_endpoints_check_the_current_row(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_tokens(self.user)['access']}")
+        self.assertEqual(self.client.get(reverse('metrics-slow')).status_code, status.HTTP_200_OK)
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('metrics-slow')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_change_password_reads_the_current_row(self):
+        response = self.client.get(reverse('token_refresh'))  # warm the cache
+        response = self.client.post(
+            reverse('change-password'), {'old_password': 'testpass123', 'new_password': 'newpass456'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            reverse('change-password'), {'old_password': 'newpass456', 'new_password': 'other789'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('other789'))
@@ -0,0 +1,43 @@
+from django.test import TestCase
+
+from main_app import status_policy
+from main_app.models import GovernmentAgency, Service, ServiceStatusRule
+
+
+class StatusPolicyTests(TestCase):
+    def setUp(self):
+        status_policy.clear()
+        ServiceStatusRule.objects.all().delete()  # the keyword rules seeded by migration 0020
+        self.health = GovernmentAgency.objects.create(name='Ministry of Health')
+        self.interior = GovernmentAgency.objects.create(name='Ministry of Interior')
+        self.vaccination = Service.objects.create(agency=self.health, name='Vaccination', fee=0)
+        self.passport = Service.objects.create(agency=self.interior, name='Passport Renewal', fee=300)
+        self.other = Service.objects.create(agency=self.interior, name='Residence Permit', fee=100)
+        ServiceStatusRule.objects.create(name_contains='Vaccination', initial_status='UPCOMING', priority=20)
+        ServiceStatusRule.objects.create(agency=self.interior, initial_status='PROCESSING', priority=0)
+        ServiceStatusRule.objects.create(service=self.passport, initial_status='APPROVED', priority=10)
+
+    def test_highest_priority_match_wins(self):
+        self.assertEqual(status_policy.initial_status(self.vaccination), 'UPCOMING')
+        self.assertEqual(status_policy.initial_status(self.passport), 'APPROVED')
+        self.assertEqual(status_policy.initial_status(self.other), 'PROCESSING')
+
+    def test_unmatched_services_are_pending(self):
+        service = Service.objects.create(agency=self.health, name='Hospital Registration', fee=0)
+        self.assertEqual(status_policy.initial_status(service), 'PENDING')
+
+    def test_lookups_are_served_from_memory(self):
+        status_policy.initial_status(self.passport)
+        with self.assertNumQueries(0):
+            for service in (self.vaccination, self.passport, self.other):
+                status_policy.initial_status(service)
+
+    def test_rule_changes_take_effect_without_restart(self):
+        self.assertEqual(status_policy.initial_status(self.other), 'PROCESSING')
+        with self.captureOnCommitCallbacks(execute=True):
+            ServiceStatusRule.objects.create(service=self.other, initial_status='REJECTED', priority=50)
+        self.assertEqual(status_policy.initial_status(self.other), 'REJECTED')
+        with self.captureOnCommitCallbacks(execute=True):
+            ServiceStatusRule.objects.filter(agency=self.interior).delete()
+            ServiceStatusRule.objects.filter(service=self.other).delete()
+        self.assertEqual(status_policy.initial_status(self.other), 'PENDING')
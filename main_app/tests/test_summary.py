@@ -0,0 +1,73 @@
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app.models import Appointment, CreditCard, GovernmentAgency, Service, ServiceRequest, TrafficFine
+from .query_counts import QueryCountAssertionsMixin
+
+User = get_user_model()
+
+
+class MySummaryTests(APITestCase, QueryCountAssertionsMixin):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(self.user)
+        agency = GovernmentAgency.objects.create(name='Ministry of Interior')
+        self.service = Service.objects.create(agency=agency, name='Passport Renewal', fee=300)
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.rows = 0
+
+    def add_rows(self, count):
+        today = timezone.localdate()
+        for _ in range(count):
+            self.rows += 1
+            ServiceRequest.objects.create(user=self.user, service=self.service, status=ServiceRequest.APPROVED)
+            TrafficFine.objects.create(user=self.user, fine_number=f'F-{self.rows}', amount=Decimal('10.00'))
+            Appointment.objects.create(
+                user=self.user, service=self.service, location='Riyadh',
+                date=today + timedelta(days=10 + self.rows), time=time(9),
+            )
+
+    def test_empty_summary(self):
+        response = self.client.get(reverse('my-summary'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['requests']['total'], 0)
+        self.assertEqual(set(response.data['requests']['by_status']), {s for s, _ in ServiceRequest.STATUS_CHOICES})
+        self.assertEqual(response.data['unpaid_fines'], {'count': 0, 'total': Decimal('0.00')})
+        self.assertIsNone(response.data['next_appointment'])
+        self.assertFalse(response.data['has_card'])
+
+    def test_summary_counts_only_own_rows(self):
+        today = timezone.localdate()
+        ServiceRequest.objects.create(user=self.user, service=self.service)
+        ServiceRequest.objects.create(user=self.user, service=self.service, status=ServiceRequest.REJECTED)
+        ServiceRequest.objects.create(user=self.other, service=self.service)
+        TrafficFine.objects.create(user=self.user, fine_number='A', amount=Decimal('150.00'))
+        TrafficFine.objects.create(user=self.user, fine_number='B', amount=Decimal('25.50'))
+        TrafficFine.objects.create(user=self.user, fine_number='C', amount=Decimal('99.00'), status=TrafficFine.PAID)
+        TrafficFine.objects.create(user=self.other, fine_number='D', amount=Decimal('99.00'))
+        Appointment.objects.create(user=self.user, service=self.service, location='Old', date=today - timedelta(days=1), time=time(9))
+        soon = Appointment.objects.create(user=self.user, service=self.service, location='Soon', date=today + timedelta(days=1), time=time(8))
+        Appointment.objects.create(user=self.user, service=self.service, location='Later', date=today + timedelta(days=1), time=time(15))
+        CreditCard.objects.create(user=self.user, credit_card_number='4111111111111111', expiration_date='1230', security_code=123)
+
+        data = self.client.get(reverse('my-summary')).data
+
+        self.assertEqual(data['requests']['total'], 2)
+        self.assertEqual(data['requests']['by_status'][ServiceRequest.PENDING], 1)
+        self.assertEqual(data['requests']['by_status'][ServiceRequest.REJECTED], 1)
+        self.assertEqual(data['requests']['by_status'][ServiceRequest.APPROVED], 0)
+        self.assertEqual(data['unpaid_fines'], {'count': 2, 'total': Decimal('175.50')})
+        self.assertEqual(data['next_appointment']['id'], soon.id)
+        self.assertEqual(data['next_appointment']['service']['agency']['name'], 'Ministry of Interior')
+        self.assertTrue(data['has_card'])
+
+    def test_query_count_is_constant(self):
+        self.add_rows(1)
+        self.assertQueryCountIndependentOfRows(lambda: self.client.get(reverse('my-summary')), self.add_rows)
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from main_app import throttling
+from main_app.metrics import registry
+from main_app.throttling import CacheBucketStore, LocalBucketStore, drain, parse_rate
+
+User = get_user_model()
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "throttle-tests"}}
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("5/min"), (5, 5 / 60))
+        self.assertEqual(parse_rate("20/hour"), (20, 20 / 3600))
+
+    def test_bucket_allows_burst_then_refills(self):
+        state = None
+        for _ in range(3):
+            state, wait = drain(state, 3, 1.0, now=100.0)
+            self.assertEqual(wait, 0)
+        state, wait = drain(state, 3, 1.0, now=100.0)
+        self.assertAlmostEqual(wait, 1.0)
+        state, wait = drain(state, 3, 1.0, now=100.5)
+        self.assertAlmostEqual(wait, 0.5)
+        _, wait = drain(state, 3, 1.0, now=101.0)
+        self.assertEqual(wait, 0)
+
+    def test_local_store_evicts_oldest_bucket(self):
+        store = LocalBucketStore(max_buckets=2)
+        store.take("a", 1, 0.001)
+        store.take("b", 1, 0.001)
+        store.take("c", 1, 0.001)
+        self.assertEqual(store.take("a", 1, 0.001), 0)  # "a" was evicted, so it is full again
+        self.assertGreater(store.take("c", 1, 0.001), 0)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_cache_store_shares_buckets(self):
+        caches["default"].clear()
+        first, second = CacheBucketStore("default"), CacheBucketStore("default")
+        self.assertEqual(first.take("k", 1, 0.001), 0)
+        self.assertGreater(second.take("k", 1, 0.001), 0)
+
+
+@override_settings(THROTTLE_RATES={"login-ip": "4/min", "login-username": "2/min", "signup-ip": "1/hour"})
+class LoginThrottleTests(APITestCase):
+    def setUp(self):
+        throttling.get_store().clear()
+        registry.reset()
+        User.objects.create_user(username="alice", password="testpass123")
+        self.url = reverse("login")
+
+    def login(self, username, password="wrong", ip="10.0.0.1"):
+        return self.client.post(self.url, {"username": username, "password": password}, REMOTE_ADDR=ip, format="json")
+
+    def test_username_bucket_spans_addresses(self):
+        self.assertEqual(self.login("alice", ip="10.0.0.1").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login("ALICE", ip="10.0.0.2").status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.login("alice", password="testpass123", ip="10.0.0.3")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        self.assertIn('throttled_requests_total{scope="login-username"} 1', registry.render())
+
+    def test_ip_bucket_spans_usernames(self):
+        for name in ("a", "b", "c", "d"):
+            self.assertEqual(self.login(name).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login("alice", password="testpass123").status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login("alice", password="testpass123", ip="10.0.0.9").status_code, status.HTTP_200_OK)
+
+    def test_forwarded_for_does_not_reset_the_ip_bucket(self):
+        for i, name in enumerate(("a", "b", "c", "d", "e")):
+            response = self.client.post(
+                self.url, {"username": name, "password": "wrong"}, REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=f"203.0.113.{i}", format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forwarded_for_is_used_behind_configured_proxies(self):
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            for i, name in enumerate(("a", "b", "c", "d", "e")):
+                response = self.client.post(
+                    self.url, {"username": name, "password": "wrong"}, REMOTE_ADDR="10.0.0.1",
+                    HTTP_X_FORWARDED_FOR=f"198.51.100.7, 203.0.113.{i}", format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_signup_is_throttled_by_address(self):
+        url = reverse("signup")
+        data = {"username": "new1", "email": "new@example.com", "password": "newpass123"}
+        self.assertEqual(self.client.post(url, data, format="json").status_code, status.HTTP_201_CREATED)
+        data["username"] = "new2"
+        self.assertEqual(self.client.post(url, data, format="json").status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(User.objects.filter(username="new2").exists())
+
+    @override_settings(THROTTLE_RATES={})
+    def test_unconfigured_scope_is_not_throttled(self):
+        for _ in range(5):
+            self.assertEqual(self.login("alice").status_code, status.HTTP_401_UNAUTHORIZED)
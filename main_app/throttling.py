@@ -0,0 +1,148 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+from .metrics import registry
+
+metrics.register("throttled_requests_total", "counter", "Requests rejected by a throttle, by scope.")
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+# Buckets the local store keeps before evicting the least recently used.
+LOCAL_MAX_BUCKETS = 100_000
+
+
+def parse_rate(rate):
+    """``"5/min"`` -> ``(capacity 5, refill 5/60 tokens per second)``."""
+    count, period = rate.split("/")
+    count = int(count)
+    return count, count / PERIODS[period[0]]
+
+
+def drain(state, capacity, refill, now):
+    """Take a token from the bucket ``state`` (``(tokens, stamp)`` or None = full).
+
+    Returns ``(new state, seconds to wait)``; a wait of 0 means the token was taken.
+    """
+    tokens, stamp = state if state else (capacity, now)
+    tokens = min(capacity, tokens + (now - stamp) * refill)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / refill
+
+
+def time_to_full(state, capacity, refill):
+    return math.ceil((capacity - state[0]) / refill) + 1
+
+
+class LocalBucketStore:
+    """Buckets in this process's memory: exact, but each worker counts separately."""
+
+    def __init__(self, max_buckets=LOCAL_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take(self, key, capacity, refill):
+        with self._lock:
+            state, wait = drain(self._buckets.pop(key, None), capacity, refill, time.monotonic())
+            self._buckets[key] = state
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Buckets in a Django cache shared by all workers.
+
+    The read-modify-write is not atomic, so simultaneous requests on one key
+    can each take the same token; bursts overshoot by at most the number of
+    concurrent workers.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def take(self, key, capacity, refill):
+        cache = caches[self.alias]
+        key = f"throttle:{key}"
+        state, wait = drain(cache.get(key), capacity, refill, time.time())
+        cache.set(key, state, time_to_full(state, capacity, refill))
+        return wait
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+_local = LocalBucketStore()
+
+
+def get_store():
+    alias = getattr(settings, "THROTTLE_CACHE_ALIAS", None)
+    return CacheBucketStore(alias) if alias else _local
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Token bucket per ``get_key(request)``, sized from ``THROTTLE_RATES[scope]``.
+
+    A rate of ``"N/period"`` allows a burst of N and refills N per period. A
+    scope missing from the settings (or set to None) is not throttled.
+    """
+
+    scope = None
+
+    def get_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        rate = getattr(settings, "THROTTLE_RATES", {}).get(self.scope)
+        key = self.get_key(request)
+        if not rate or key is None:
+            return True
+        capacity, refill = parse_rate(rate)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        wait = get_store().take(f"{self.scope}:{digest}", capacity, refill)
+        if wait:
+            self.wait_seconds = wait
+            registry.inc("throttled_requests_total", (("scope", self.scope),))
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_key(self, request):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    """Keyed by the submitted username, so one account is protected however many IPs are used."""
+
+    def get_key(self, request):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        return str(username).strip().casefold() if username else None
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login-ip"
+
+
+class LoginUsernameThrottle(UsernameThrottle):
+    scope = "login-username"
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = "signup-ip"
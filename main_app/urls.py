@@ -13,22 +13,63 @@ from .views import (
     MyBankAccountView,
     ChangePasswordView,
     MyFinesView,
+    MySummaryView,
     PayFinesView,
+    FineImportView,
+    HistoryExportView,
+    JobDetailView,
+    ServiceSearchView,
+    ServiceSlotsView,
+    BookSlotView,
+    AppointmentList,
+    AppointmentDetail,
+    AppointmentCalendarView,
+    MetricsView,
+    SlowRequestsView,
 )
+from .async_views import (
+    AsyncAgencyList,
+    AsyncServiceList,
+    AsyncServiceDetail,
+    AsyncServiceRequestList,
+    AsyncMyFinesView,
+)
+from .throttling import LoginIPThrottle, LoginUsernameThrottle, SignupIPThrottle
 
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     path('agencies/', AgencyList.as_view(), name='agency-list'),
     path('services/', ServiceList.as_view(), name='service-list'),
+    path('services/search/', ServiceSearchView.as_view(), name='service-search'),
     path('services/<int:pk>/', ServiceDetail.as_view(), name='service-detail'),
+    path('services/<int:pk>/slots/', ServiceSlotsView.as_view(), name='service-slots'),
+    path('slots/<int:pk>/book/', BookSlotView.as_view(), name='slot-book'),
+    path('appointments/', AppointmentList.as_view(), name='appointment-list'),
+    path('appointments/calendar/', AppointmentCalendarView.as_view(), name='appointment-calendar'),
+    path('appointments/<int:pk>/', AppointmentDetail.as_view(), name='appointment-detail'),
     path('service-requests/', ServiceRequestList.as_view(), name='service-request-list'),
     path('service-requests/<int:pk>/', ServiceRequestDetail.as_view(), name='service-request-detail'),
     path('service-requests/<int:pk>/pay/', PayServiceRequestView.as_view(), name='service-request-pay'),
-    path('users/signup/', CreateUserView.as_view(), name='signup'),
-    path('users/login/', LoginView.as_view(), name='login'),
+    path('users/signup/', CreateUserView.as_view(throttle_classes=[SignupIPThrottle]), name='signup'),
+    path(
+        'users/login/',
+        LoginView.as_view(throttle_classes=[LoginIPThrottle, LoginUsernameThrottle]),
+        name='login',
+    ),
     path('users/token/refresh/', VerifyUserView.as_view(), name='token_refresh'),
     path('bank-account/', MyBankAccountView.as_view(), name='my-bank-account'),
     path('users/change-password/', ChangePasswordView.as_view(), name='change-password'),
+    path('me/summary/', MySummaryView.as_view(), name='my-summary'),
     path('my-fines/', MyFinesView.as_view(), name='my-fines'),
     path('pay-fines/', PayFinesView.as_view(), name='pay-fines'),
+    path('fines/import/', FineImportView.as_view(), name='fine-import'),
+    path('jobs/<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('metrics/slow/', SlowRequestsView.as_view(), name='metrics-slow'),
+    path('export/<str:kind>/', HistoryExportView.as_view(), name='history-export'),
+    path('async/agencies/', AsyncAgencyList.as_view(), name='async-agency-list'),
+    path('async/services/', AsyncServiceList.as_view(), name='async-service-list'),
+    path('async/services/<int:pk>/', AsyncServiceDetail.as_view(), name='async-service-detail'),
+    path('async/service-requests/', AsyncServiceRequestList.as_view(), name='async-service-request-list'),
+    path('async/my-fines/', AsyncMyFinesView.as_view(), name='async-my-fines'),
 ]
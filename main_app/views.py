@@ -1,21 +1,51 @@
 from rest_framework import status, permissions, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db.models import Count
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.urls import reverse
 from django.contrib.auth.models import User
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from .models import GovernmentAgency, Service, ServiceRequest, Appointment, CreditCard, TrafficFine
+from .models import GovernmentAgency, Service, ServiceRequest, Appointment, AppointmentSlot, CreditCard, TrafficFine, Job
 from .serializers import (
     GovernmentAgencySerializer,
     ServiceSerializer,
     ServiceRequestSerializer,
     AppointmentSerializer,
+    AppointmentSlotSerializer,
     UserSerializer,
     TrafficFineSerializer,
-    CreditCardSerializer
+    CreditCardSerializer,
+    JobSerializer,
 )
+from . import booking, jobs, search
+from .authentication import get_full_user, issue_tokens
+from .catalog_cache import catalog_response, current_version
+from .conditional import ListValidators
+from .exports import EXPORTS, csv_lines, export_rows, ndjson_lines
+from .fast_serializers import project
+from .fieldsets import cache_suffix, parse_fieldsets
+from .fine_ingest import ingest
+from .idempotency import respond_once
+from .metrics import registry
+from .pagination import KeysetPagination
+from .payload_keys import filter_payload
+from .query_plan import plan_queryset
+from .renderers import FastJSONRenderer
+from .status_policy import initial_status
+from .summary import user_summary
+import io
 import uuid
+from datetime import datetime, timedelta
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 
@@ -27,40 +57,238 @@ class HomeView(APIView):
 
 
 class AgencyList(APIView):
+    # No use_read_replica on the cached catalog views: a lagging replica would let
+    # a render after a version bump store stale rows under the new version.
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        agencies = GovernmentAgency.objects.all()
-        serializer = GovernmentAgencySerializer(agencies, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def render():
+            agencies = GovernmentAgency.objects.all()
+            serializer = GovernmentAgencySerializer(agencies, many=True)
+            return FastJSONRenderer().render(serializer.data)
+
+        return catalog_response(request, "agencies", render)
 
 
 class ServiceList(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        services = Service.objects.all().order_by("id")
-        serializer = ServiceSerializer(services, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields = parse_fieldsets(request, ServiceSerializer)
+
+        def render():
+            services = plan_queryset(Service.objects.all().order_by("id"), ServiceSerializer, fields)
+            serializer = ServiceSerializer(services, many=True, fields=fields)
+            return FastJSONRenderer().render(serializer.data)
+
+        name = f"services:{cache_suffix(fields)}" if fields else "services"
+        return catalog_response(request, name, render)
 
 
 class ServiceDetail(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
-        service = get_object_or_404(Service, pk=pk)
-        serializer = ServiceSerializer(service)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def render():
+            service = get_object_or_404(plan_queryset(Service.objects.all(), ServiceSerializer), pk=pk)
+            serializer = ServiceSerializer(service)
+            return FastJSONRenderer().render(serializer.data)
+
+        return catalog_response(request, f"service:{pk}", render)
 
 
-class ServiceRequestList(APIView):
+class ServiceSearchView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_limit = 50
 
     def get(self, request):
-        qs = ServiceRequest.objects.filter(user=request.user).order_by("-created_at")
-        serializer = ServiceRequestSerializer(qs, many=True)
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"q": "A search query is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 20)), self.max_limit))
+        except ValueError:
+            return Response({"limit": "Expected an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        results = [{**service, "score": score} for score, service in search.search(query, limit)]
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class ServiceSlotsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        after = None
+        if request.query_params.get("after"):
+            try:
+                after = parse_datetime(request.query_params["after"])
+            except ValueError:  # well formed but out of range, e.g. month 13
+                after = None
+            if after is None:
+                return Response({"after": "Expected an ISO 8601 datetime."}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(after):
+                after = timezone.make_aware(after)
+        try:
+            limit = int(request.query_params.get("limit", booking.DEFAULT_SLOT_LIMIT))
+        except ValueError:
+            return Response({"limit": "Expected an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, booking.MAX_SLOT_LIMIT))
+
+        slots = booking.free_slots(pk, after=after, location=request.query_params.get("location"), limit=limit)
+        serializer = AppointmentSlotSerializer(slots, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+
+class BookSlotView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        try:
+            appointment = booking.book(request.user, pk)
+        except booking.SlotStarted:
+            return Response({"detail": "This slot has already started."}, status=status.HTTP_400_BAD_REQUEST)
+        except booking.SlotUnavailable:
+            get_object_or_404(AppointmentSlot, pk=pk)
+            return Response({"detail": "This slot is fully booked."}, status=status.HTTP_409_CONFLICT)
+        except booking.AppointmentConflict as conflict:
+            return Response(
+                {"detail": "This overlaps another of your appointments.", "conflict": conflict.appointment_id},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(AppointmentSerializer(appointment).data, status=status.HTTP_201_CREATED)
+
+
+def parse_date_param(request, name):
+    """``?name=YYYY-MM-DD`` as a date, None when absent; raises ValidationError when malformed."""
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Expected a YYYY-MM-DD date."})
+    return parsed
+
+
+class AppointmentList(APIView):
+    """The user's appointments, optionally within ``?from=`` .. ``?to=`` (inclusive)."""
+
+    permission_classes = [IsAuthenticated]
+    pagination_ordering = ("date", "time", "id")
+
+    def get(self, request):
+        appointments = Appointment.objects.filter(user_id=request.user.id)
+        start, end = parse_date_param(request, "from"), parse_date_param(request, "to")
+        if start:
+            appointments = appointments.filter(date__gte=start)
+        if end:
+            appointments = appointments.filter(date__lte=end)
+        paginator = KeysetPagination(ordering=self.pagination_ordering)
+        appointments = plan_queryset(appointments, AppointmentSerializer)
+        page = paginator.paginate_queryset(
+            project(appointments, AppointmentSerializer, self.pagination_ordering), request
+        )
+        serializer = AppointmentSerializer(page, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers=paginator.get_headers())
+
+    def post(self, request):
+        serializer = AppointmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        starts_at = timezone.make_aware(datetime.combine(data["date"], data["time"]))
+        if starts_at < timezone.now():
+            return Response({"date": "Appointments cannot be in the past."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            appointment = booking.create_appointment(
+                request.user.id, data["service"], data["date"], data["time"], data["location"]
+            )
+        except booking.AppointmentConflict as conflict:
+            return Response(
+                {"detail": "This overlaps another of your appointments.", "conflict": conflict.appointment_id},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(AppointmentSerializer(appointment).data, status=status.HTTP_201_CREATED)
+
+
+class AppointmentDetail(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self, pk):
+        queryset = plan_queryset(Appointment.objects.filter(user_id=self.request.user.id), AppointmentSerializer)
+        return get_object_or_404(queryset, pk=pk)
+
+    def get(self, request, pk):
+        return Response(AppointmentSerializer(self.get_object(pk)).data, status=status.HTTP_200_OK)
+
+    def delete(self, request, pk):
+        booking.cancel(self.get_object(pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AppointmentCalendarView(APIView):
+    """Appointment counts per week or month over ``?from=`` .. ``?to=``, in one grouped query."""
+
+    permission_classes = [IsAuthenticated]
+    periods = {"week": TruncWeek, "month": TruncMonth}
+    max_days = 366
+
+    def get(self, request):
+        period = request.query_params.get("period", "month")
+        if period not in self.periods:
+            return Response({"period": "Expected 'week' or 'month'."}, status=status.HTTP_400_BAD_REQUEST)
+        start = parse_date_param(request, "from") or timezone.localdate()
+        end = parse_date_param(request, "to") or start + timedelta(days=self.max_days - 1)
+        if end < start or (end - start).days >= self.max_days:
+            return Response(
+                {"to": f"Expected a range of 1 to {self.max_days} days."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        buckets = (
+            Appointment.objects.filter(user_id=request.user.id, date__range=(start, end))
+            .annotate(start=self.periods[period]("date"))
+            .values("start")
+            .annotate(count=Count("id"))
+            .order_by("start")
+        )
+        return Response(
+            {"period": period, "from": start, "to": end, "buckets": list(buckets)}, status=status.HTTP_200_OK
+        )
+
+
+class ServiceRequestQueryMixin:
+    pagination_ordering = ("-created_at", "-id")
+    # GETs may read from a replica (main_app.middleware.ReplicaRoutingMiddleware).
+    use_read_replica = True
+
+    # Rows embed their service and agency, so the catalog version is part of the
+    # ETag. Neither that nor deletions move MAX(updated_at): no Last-Modified.
+    send_last_modified = False
+
+    def get_queryset(self, fields=None):
+        qs = ServiceRequest.objects.filter(user_id=self.request.user.id)
+        qs = filter_payload(qs, self.request.query_params)
+        return plan_queryset(qs, ServiceRequestSerializer, fields)
+
+
+class ServiceRequestList(ServiceRequestQueryMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        fields = parse_fieldsets(request, ServiceRequestSerializer)
+        validators = ListValidators.for_queryset(
+            request, self.get_queryset(), (current_version(), request.accepted_media_type), self.send_last_modified
+        )
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        paginator = KeysetPagination(ordering=self.pagination_ordering)
+        queryset = project(self.get_queryset(fields), ServiceRequestSerializer, self.pagination_ordering, fields)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = ServiceRequestSerializer(page, many=True, fields=fields)
+        return validators.apply(
+            Response(serializer.data, status=status.HTTP_200_OK, headers=paginator.get_headers())
+        )
+
     def post(self, request):
         try:
 
@@ -83,40 +311,33 @@ class ServiceRequestList(APIView):
                     payload = {}
 
             data["payload"] = payload
-            data["user"] = request.user.id
-
-            serializer = ServiceRequestSerializer(data=data)
-            if serializer.is_valid():
-                service = Service.objects.get(id=data["service_id"])
-                instance = serializer.save(user=request.user)
-
-                if "Appointment" in service.name or "Vaccination" in service.name or "Hospital" in service.name:
-                    instance.status = "UPCOMING"
-                elif "Fee" in service.name or "Passport" in service.name or "License" in service.name or "National ID" in service.name:
-                    instance.status = "APPROVED"
-                else:
-                    instance.status = "PENDING"
-
-                instance.save()
-                serializer = ServiceRequestSerializer(instance)
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return respond_once(request, data, lambda: self.create(request, data))
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def create(self, request, data):
+        serializer = ServiceRequestSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # The service was loaded (with its agency) by validation; decide the
+        # status up front so the request is written with a single INSERT.
+        service = serializer.validated_data["service"]
+        serializer.save(user_id=request.user.id, status=initial_status(service))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 class ServiceRequestDetail(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
-        instance = get_object_or_404(ServiceRequest, pk=pk, user=request.user)
+        qs = plan_queryset(ServiceRequest.objects.all(), ServiceRequestSerializer)
+        instance = get_object_or_404(qs, pk=pk, user_id=request.user.id)
         serializer = ServiceRequestSerializer(instance)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
-        instance = get_object_or_404(ServiceRequest, pk=pk, user=request.user)
+        instance = get_object_or_404(ServiceRequest, pk=pk, user_id=request.user.id)
         serializer = ServiceRequestSerializer(instance, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -125,7 +346,7 @@ class ServiceRequestDetail(APIView):
 
     def delete(self, request, pk):
         print("this is the function we are testing")
-        instance = get_object_or_404(ServiceRequest, pk=pk, user=request.user)
+        instance = get_object_or_404(ServiceRequest, pk=pk, user_id=request.user.id)
         instance.delete()
         return Response({ "success": True }, status=status.HTTP_200_OK)
 
@@ -140,10 +361,8 @@ class CreateUserView(generics.CreateAPIView):
             serializer.is_valid(raise_exception=True)
             user = serializer.save()
 
-            refresh = RefreshToken.for_user(user)
             data = {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
+                **issue_tokens(user),
                 'user': UserSerializer(user).data
             }
             return Response(data, status=status.HTTP_201_CREATED)
@@ -158,51 +377,85 @@ class LoginView(APIView):
         password = request.data.get('password')
         user = authenticate(username=username, password=password)
         if user:
-            refresh = RefreshToken.for_user(user)
             return Response({
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
+                **issue_tokens(user),
                 'user': UserSerializer(user).data
             }, status=status.HTTP_200_OK)
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
 class VerifyUserView(APIView):
+    # Loads the user row, unlike the stateless default, so deleted and deactivated
+    # users cannot mint new tokens.
+    authentication_classes = [JWTAuthentication]
 
     def get(self, request):
-        user = User.objects.get(username=request.user.username)
-        refresh = RefreshToken.for_user(user)
+        user = get_full_user(request.user)
         return Response({
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            **issue_tokens(user),
             'user': UserSerializer(user).data
         }, status=status.HTTP_200_OK)
 
 
+def job_accepted(request, job, detail):
+    url = reverse("job-detail", kwargs={"pk": job.pk})
+    return Response(
+        {"detail": detail, "job": JobSerializer(job).data, "status_url": request.build_absolute_uri(url)},
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": url},
+    )
+
+
 class PayServiceRequestView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, pk):
         try:
-            card = CreditCard.objects.filter(user=request.user).first()
-            if card:
-                service_request = get_object_or_404(ServiceRequest, pk=pk, user=request.user)
-                service_request.is_paid = True
-                service_request.status = "APPROVED"
-                service_request.save()
-                return Response({"message": "Payment successful (infinite balance)."}, status=status.HTTP_200_OK)
+            if not CreditCard.objects.filter(user_id=request.user.id).exists():
+                return Response({"error": "Add a credit card before paying."}, status=status.HTTP_400_BAD_REQUEST)
+            with transaction.atomic():
+                updated = ServiceRequest.objects.filter(pk=pk, user_id=request.user.id).exclude(
+                    status__in=[ServiceRequest.APPROVED, ServiceRequest.PROCESSING]
+                ).update(status=ServiceRequest.PROCESSING, updated_at=timezone.now())
+                if not updated:
+                    service_request = get_object_or_404(
+                        ServiceRequest.objects.select_for_update(), pk=pk, user_id=request.user.id
+                    )
+                    if service_request.status == ServiceRequest.APPROVED:
+                        return Response({"error": "This request is already paid."}, status=status.HTTP_400_BAD_REQUEST)
+                    # PROCESSING: answer with the payment already queued. Only if
+                    # that job failed for good is a new one queued.
+                    job = jobs.pending("pay_service_request", user=request.user, service_request_id=pk)
+                    if job is not None:
+                        return job_accepted(request, job, "Payment already queued.")
+                job = jobs.enqueue("pay_service_request", user=request.user, service_request_id=pk)
+            return job_accepted(request, job, "Payment queued (infinite balance).")
+        except Http404:
+            raise
         except Exception as err:
             print(str(err))
             return Response({'error': str(err)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class MySummaryView(APIView):
+    """Request counts, unpaid fines, next appointment and card presence for the home screen."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(user_summary(request.user.id), status=status.HTTP_200_OK)
+
+
 class MyBankAccountView(APIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CreditCardSerializer
 
+    def get_queryset(self):
+        return CreditCard.objects.filter(user_id=self.request.user.id)
+
     def get(self, request):
         try:
-            card = CreditCard.objects.filter(user=request.user).first()
+            card = self.get_queryset().first()
 
             if card:
                 serializer = self.serializer_class(card)
@@ -214,7 +467,7 @@ class MyBankAccountView(APIView):
 
     def put(self, request):
         try:
-            card = CreditCard.objects.filter(user=request.user).first()
+            card = self.get_queryset().first()
             serializer = self.serializer_class(card, data=request.data)
             if serializer.is_valid():
                 serializer.save()
@@ -226,7 +479,7 @@ class MyBankAccountView(APIView):
     def delete(self, request):
         try:
 
-            existing_creditcard = CreditCard.objects.filter(user=request.user)
+            existing_creditcard = CreditCard.objects.filter(user_id=request.user.id)
             if existing_creditcard:
                 existing_creditcard.delete()
                 return Response({"ok": "Bank account deleted successfully."}, status=status.HTTP_200_OK)
@@ -239,13 +492,13 @@ class MyBankAccountView(APIView):
     def post(self, request):
         try:
             
-            existing_creditcard = CreditCard.objects.filter(user=request.user)
+            existing_creditcard = CreditCard.objects.filter(user_id=request.user.id)
             if existing_creditcard:
                 existing_creditcard.delete()
 
             serializer = self.serializer_class(data=request.data)
             if serializer.is_valid():
-                serializer.save(user=request.user)
+                serializer.save(user_id=request.user.id)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as err:
@@ -261,25 +514,47 @@ class ChangePasswordView(APIView):
         new_password = request.data.get("new_password")
         if not old_password or not new_password:
             return Response({"error": "old_password and new_password are required"}, status=status.HTTP_400_BAD_REQUEST)
-        user = request.user
+        # Read the row itself: the cached copy may hold a stale password hash.
+        user = User.objects.get(pk=request.user.id)
         if not user.check_password(old_password):
             return Response({"error": "Invalid old password"}, status=status.HTTP_400_BAD_REQUEST)
         user.set_password(new_password)
         user.save()
-        refresh = RefreshToken.for_user(user)
-        return Response({
-            "refresh": str(refresh),
-            "access": str(refresh.access_token)
-        }, status=status.HTTP_200_OK)
+        return Response(issue_tokens(user), status=status.HTTP_200_OK)
+
 
+class MyFinesQueryMixin:
+    pagination_ordering = ("-issued_at", "-created_at", "-id")
+    use_read_replica = True
+    # Paid fines and fines ingest moves to another user leave the list without
+    # moving MAX(updated_at): ETag only.
+    send_last_modified = False
 
-class MyFinesView(APIView):
+    def get_queryset(self, fields=None):
+        fines = TrafficFine.objects.filter(user_id=self.request.user.id).exclude(status=TrafficFine.PAID)
+        return plan_queryset(fines, TrafficFineSerializer, fields)
+
+
+class MyFinesView(MyFinesQueryMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        fines = TrafficFine.objects.filter(user=request.user).exclude(status=TrafficFine.PAID).order_by("-issued_at", "-created_at")
-        serializer = TrafficFineSerializer(fines, many=True)
-        return Response({"fines": serializer.data}, status=status.HTTP_200_OK)
+        fields = parse_fieldsets(request, TrafficFineSerializer)
+        validators = ListValidators.for_queryset(
+            request, self.get_queryset(), (request.accepted_media_type,), self.send_last_modified
+        )
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        paginator = KeysetPagination(ordering=self.pagination_ordering)
+        queryset = project(self.get_queryset(fields), TrafficFineSerializer, self.pagination_ordering, fields)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = TrafficFineSerializer(page, many=True, fields=fields)
+        return validators.apply(Response(
+            {"fines": serializer.data, "next": paginator.get_next_link()},
+            status=status.HTTP_200_OK,
+            headers=paginator.get_headers(),
+        ))
 
 
 class PayFinesView(APIView):
@@ -289,38 +564,88 @@ class PayFinesView(APIView):
         user = request.user
         data = request.data
 
-        with transaction.atomic():
-            pay_all = data.get("pay_all") or data.get("payAll")
-            fine_ids = data.get("fine_ids") or data.get("fineIds")
+        pay_all = data.get("pay_all") or data.get("payAll")
+        fine_ids = data.get("fine_ids") or data.get("fineIds")
 
-            if pay_all:
-                fines_qs = TrafficFine.objects.filter(user=user).exclude(status=TrafficFine.PAID)
-            else:
-                if not isinstance(fine_ids, list) or not fine_ids:
-                    return Response({"detail": "fine_ids required"}, status=status.HTTP_400_BAD_REQUEST)
-                fines_qs = TrafficFine.objects.filter(user=user, id__in=fine_ids).exclude(status=TrafficFine.PAID)
-
-            if not fines_qs.exists():
-                return Response({"detail": "No matching unpaid fines found."}, status=status.HTTP_400_BAD_REQUEST)
-
-            updated_count = fines_qs.update(status=TrafficFine.PAID)
-
-            for fine in fines_qs:
-                ServiceRequest.objects.create(
-                    user=user,
-                    service=None,
-                    payload={
-                        "fine_number": fine.fine_number,
-                        "amount": str(fine.amount),
-                        "violation_type": fine.violation_type,
-                    },
-                    status="APPROVED",
-                    is_paid=True
-                )
-
-        fines = TrafficFine.objects.filter(user=user).exclude(status=TrafficFine.PAID).order_by("-issued_at", "-created_at")
-        serializer = TrafficFineSerializer(fines, many=True)
-        return Response(
-            {"detail": f"{updated_count} fine(s) marked as PAID and logged to My Requests.", "fines": serializer.data},
-            status=status.HTTP_200_OK
-        )
+        if not pay_all and (not isinstance(fine_ids, list) or not fine_ids):
+            return Response({"detail": "fine_ids required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fines = TrafficFine.objects.filter(user_id=user.id).exclude(status=TrafficFine.PAID)
+        if not pay_all:
+            fines = fines.filter(id__in=fine_ids)
+        if not fines.exists():
+            return Response({"detail": "No matching unpaid fines found."}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = jobs.enqueue("pay_fines", user=user, fine_ids=None if pay_all else fine_ids)
+        return job_accepted(request, job, "Payment queued; paid fines will be logged to My Requests.")
+
+
+class FineImportView(APIView):
+    """Upsert traffic fines from an uploaded CSV or NDJSON feed file (staff only)."""
+
+    # The row's is_staff, not the token's claim, which outlives a demotion.
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "file required"}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.query_params.get("format") or upload.name.rsplit(".", 1)[-1].lower()
+        fmt = {"jsonl": "ndjson"}.get(fmt, fmt)
+        if fmt not in ("csv", "ndjson"):
+            return Response({"detail": "format must be 'csv' or 'ndjson'."}, status=status.HTTP_400_BAD_REQUEST)
+        stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        try:
+            report = ingest(stream, fmt)
+        except UnicodeDecodeError:
+            return Response({"detail": "file must be UTF-8."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+
+class JobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_object_or_404(Job, pk=pk, user_id=request.user.id)
+        return Response(JobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+class HistoryExportView(APIView):
+    permission_classes = [IsAuthenticated]
+    content_types = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    def get(self, request, kind):
+        if kind not in EXPORTS:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        output = request.query_params.get("output", "ndjson")
+        if output not in self.content_types:
+            return Response({"detail": "output must be 'ndjson' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = export_rows(kind, request.user)
+        lines = csv_lines(kind, rows) if output == "csv" else ndjson_lines(rows)
+        response = StreamingHttpResponse(lines, content_type=self.content_types[output])
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{output}"'
+        return response
+
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint, optionally guarded by ``METRICS_TOKEN``."""
+
+    authentication_classes = []
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return Response({"detail": "Invalid metrics token."}, status=status.HTTP_403_FORBIDDEN)
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4")
+
+
+class SlowRequestsView(APIView):
+    # The row's is_staff, not the token's claim, which outlives a demotion.
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({"requests": registry.slow_traces()}, status=status.HTTP_200_OK)